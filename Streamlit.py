@@ -1,18 +1,110 @@
+import hashlib
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 
-from src.io_bam import import_bam_curve
-from src.dates import parse_date_flexible, get_base_date, calc_maturite
-from src.interpolation import interpolate_rate
-from src.bootstrap import taux_actuariel, bootstrap_zc
-from src.Forward import taux_forward  # <-- Ajout du module de taux forwards
+from src.io_bam import import_bam_curve, read_bam_csv, taux_en_decimal
+from src.dates import parse_date_flexible, get_base_date, calc_maturites
+from src.interpolation import CurveInterpolator
+from src.bootstrap import taux_actuariel_array, bootstrap_zc_array
+from src.Forward import taux_forward, exporter_forwards  # <-- Ajout du module de taux forwards
+from src.exports import FORMATS, exporter
 
 st.set_page_config(page_title="💼 Taux Quant", layout="wide")
 st.title("📈 Calcul de taux actuariels, zéro-coupon & forwards")
 
+# ------------------ PIPELINE MÉMOÏSÉ ------------------
+# Streamlit réexécute le script à chaque interaction : chaque étape est mise en cache et
+# indexée par la clé de la source ("csv:<sha256 du fichier>" ou "bam:<date>"). Les arguments
+# préfixés par "_" ne sont pas hachés par Streamlit, la clé suffit à identifier la courbe.
+
+@st.cache_data(show_spinner=False)
+def charger_csv(cle, _contenu):
+    return read_bam_csv(_contenu)
+
+
+@st.cache_data(show_spinner=False)
+def charger_bam(date_pub):
+    return import_bam_curve(date_pub)
+
+
+@st.cache_data(show_spinner=False)
+def pretraiter(cle, _df):
+    df = _df.rename(columns={
+        "Date échéance": "Echeance",
+        "Date d'échéance": "Echeance",
+        "Taux moyen": "Taux moyen pondéré"
+    }, errors='ignore')
+
+    if "Echeance" not in df.columns or "Taux moyen pondéré" not in df.columns:
+        raise ValueError("Colonnes manquantes : 'Echeance' et/ou 'Taux moyen pondéré'")
+
+    date_base = get_base_date(df, col_name="Echeance")
+    df["maturite_jours"] = calc_maturites(df["Echeance"], date_base)
+    df = df.dropna(subset=["maturite_jours"])
+    df["maturite_annees"] = df["maturite_jours"].astype(float) / 365
+    df["Taux_decimal"] = taux_en_decimal(df["Taux moyen pondéré"])
+    df = df.sort_values(by="maturite_annees").reset_index(drop=True)
+    return df, date_base
+
+
+@st.cache_data(show_spinner=False)
+def calculer_taux(cle, _df):
+    df = _df.copy()
+    df["Taux_actuariel"] = taux_actuariel_array(df["maturite_annees"], df["Taux_decimal"])
+    df["Taux_actuariel (%)"] = df["Taux_actuariel"] * 100
+    df["Taux_zero_coupon"] = bootstrap_zc_array(df["maturite_annees"], df["Taux_decimal"])
+    df["Taux_zero_coupon (%)"] = df["Taux_zero_coupon"] * 100
+    return df
+
+
+@st.cache_resource(show_spinner=False)
+def interpolateurs(cle, _df):
+    # Objets partagés (non copiés) entre les réexécutions : ils ne sont jamais modifiés
+    return (CurveInterpolator(_df["maturite_annees"], _df["Taux_zero_coupon"]),
+            CurveInterpolator(_df["maturite_annees"], _df["Taux_actuariel"]))
+
+
+@st.cache_data(show_spinner=False)
+def courbes_interpolees(cle, _df):
+    courbe_zc, courbe_act = interpolateurs(cle, _df)
+    mats = np.linspace(_df["maturite_annees"].min(), _df["maturite_annees"].max(), 100)
+    return pd.DataFrame({
+        "Maturité (années)": mats,
+        "Taux ZC (%)": courbe_zc(mats) * 100,
+        "Taux Actuariel (%)": courbe_act(mats) * 100
+    }).set_index("Maturité (années)")
+
+
+@st.cache_data(show_spinner=False)
+def calculer_forwards(cle, _df):
+    mats_start, mats_end, forwards = taux_forward(_df["maturite_annees"].to_numpy(),
+                                                  _df["Taux_zero_coupon"].to_numpy())
+    return pd.DataFrame({
+        "De (années)": mats_start,
+        "À (années)": mats_end,
+        "Taux Forward (%)": forwards * 100
+    })
+
+
+@st.cache_data(show_spinner=False)
+def exporter_fichier(cle, nom, format, _df):
+    if format == "json":
+        return exporter_forwards(_df, "json").encode("utf-8")
+    return exporter(_df, format)
+
+
+def charger_source(cle, df):
+    """Nouvelle source : les taux sont à recalculer seulement si la clé change."""
+    if st.session_state.cle != cle:
+        st.session_state.cle = cle
+        st.session_state.df = df
+        st.session_state.taux_calcules = False
+
+
 # ------------------ INIT STATE ------------------
-for var in ["df", "taux_calcules", "date_base"]:
+for var in ["df", "cle", "taux_calcules"]:
     if var not in st.session_state:
         st.session_state[var] = None
 
@@ -24,9 +116,9 @@ if mode == "Upload CSV":
     uploaded_file = st.sidebar.file_uploader("📁 Fichier CSV", type="csv")
     if uploaded_file:
         try:
-            df = pd.read_csv(uploaded_file, sep=';', skiprows=2, skipfooter=1, engine='python', dtype=str)
-            st.session_state.df = df
-            st.session_state.taux_calcules = False
+            contenu = uploaded_file.getvalue()
+            cle = "csv:" + hashlib.sha256(contenu).hexdigest()
+            charger_source(cle, charger_csv(cle, contenu))
             st.sidebar.success("✅ Fichier chargé")
         except Exception as e:
             st.sidebar.error(f"❌ Erreur de lecture : {e}")
@@ -35,9 +127,8 @@ else:
     if st.sidebar.button("📡 Import BAM"):
         try:
             with st.spinner("Importation en cours..."):
-                df = import_bam_curve(date_pub)
-            st.session_state.df = df
-            st.session_state.taux_calcules = False
+                df = charger_bam(date_pub)
+            charger_source(f"bam:{date_pub.isoformat()}", df)
             st.sidebar.success("✅ Import réussi")
         except Exception as e:
             st.sidebar.error(f"❌ Erreur import BAM : {e}")
@@ -47,115 +138,79 @@ if st.session_state.df is None:
     st.info("📄 Veuillez charger ou importer une base de données pour continuer.")
     st.stop()
 
-df = st.session_state.df.copy()
+cle = st.session_state.cle
 
 st.header("1️⃣ Données brutes")
-st.dataframe(df, use_container_width=True)
+st.dataframe(st.session_state.df, use_container_width=True)
 
 # ------------------ PRÉ-TRAITEMENT ------------------
-df.rename(columns={
-    "Date échéance": "Echeance",
-    "Date d'échéance": "Echeance",
-    "Taux moyen": "Taux moyen pondéré"
-}, inplace=True, errors='ignore')
-
-if "Echeance" not in df.columns or "Taux moyen pondéré" not in df.columns:
-    st.error("❌ Colonnes manquantes : 'Echeance' et/ou 'Taux moyen pondéré'")
+try:
+    df, date_base = pretraiter(cle, st.session_state.df)
+except ValueError as e:
+    st.error(f"❌ {e}")
     st.stop()
 
-date_base = get_base_date(df, col_name="Echeance")
-st.session_state.date_base = date_base
-
-df["maturite_jours"] = df["Echeance"].apply(lambda s: calc_maturite(s, date_base))
-df = df.dropna(subset=["maturite_jours"])
-df["maturite_annees"] = df["maturite_jours"].astype(float) / 365
-df["Taux_decimal"] = df["Taux moyen pondéré"].astype(str).str.replace('%', '', regex=False).str.replace(',', '.', regex=False).astype(float) / 100
-df = df.sort_values(by="maturite_annees").reset_index(drop=True)
-
 # ------------------ CALCUL TAUX ------------------
 if st.button("🧮 Calculer les taux"):
     try:
-        df["Taux_actuariel"] = df.apply(lambda r: taux_actuariel(r["maturite_annees"], r["Taux_decimal"]), axis=1)
-        df["Taux_actuariel (%)"] = df["Taux_actuariel"] * 100
-        df["Taux_zero_coupon"] = bootstrap_zc(df)
-        df["Taux_zero_coupon (%)"] = df["Taux_zero_coupon"] * 100
-
-        st.session_state.df = df
+        calculer_taux(cle, df)
         st.session_state.taux_calcules = True
-
     except Exception as e:
         st.error(f"Erreur lors du calcul : {e}")
         st.stop()
 
 # ------------------ RÉSULTATS ------------------
 if st.session_state.taux_calcules:
-    df = st.session_state.df
+    df = calculer_taux(cle, df)
+    courbe_zc, courbe_act = interpolateurs(cle, df)
     st.header("2️⃣ Résultats calculés")
     st.dataframe(df[["Echeance", "maturite_annees", "Taux_actuariel (%)", "Taux_zero_coupon (%)"]])
 
     # Courbes
     st.subheader("📊 Courbes interpolées")
-    mats = np.linspace(df["maturite_annees"].min(), df["maturite_annees"].max(), 100)
-
-    zc_interp = interpolate_rate(df["maturite_annees"], df["Taux_zero_coupon"], mats)
-    actuarial_interp = interpolate_rate(df["maturite_annees"], df["Taux_actuariel"], mats)
-
-    chart_df = pd.DataFrame({
-        "Maturité (années)": mats,
-        "Taux ZC (%)": zc_interp * 100,
-        "Taux Actuariel (%)": actuarial_interp * 100
-    }).set_index("Maturité (années)")
-
-    st.line_chart(chart_df)
+    st.line_chart(courbes_interpolees(cle, df))
 
+    format_export = st.selectbox("Format d'export", list(FORMATS), key="format_export",
+                                 help="csv : ';' et virgule décimale ; csv.gz, parquet et arrow pour les gros volumes")
     st.download_button(
-        label="📥 Télécharger les résultats (CSV)",
-        data=df.to_csv(index=False, sep=';', decimal=',').encode("utf-8-sig"),
-        file_name="resultats_taux.csv"
+        label=f"📥 Télécharger les résultats ({format_export})",
+        data=exporter_fichier(cle, "resultats", format_export, df),
+        file_name=f"resultats_taux{FORMATS[format_export][1]}",
+        mime=FORMATS[format_export][0]
     )
 
 # ------------------ INTERPOLATION PERSONNALISÉE ------------------
-if st.session_state.taux_calcules and "Taux_zero_coupon" in st.session_state.df.columns:
+if st.session_state.taux_calcules:
     st.header("3️⃣ Taux interpolé à une échéance personnalisée")
 
     mode = st.radio("Mode de saisie", ["📅 Sélection de date", "⌨️ Saisie manuelle (jj/mm/aaaa)"], key="mode_saisie")
 
     date_ech = None
     if mode == "📅 Sélection de date":
-        date_ech = st.date_input("Date d’échéance", min_value=st.session_state.date_base)
+        date_ech = st.date_input("Date d’échéance", min_value=date_base)
     else:
         saisie = st.text_input("Entrez une date (ex: 15/08/2030)")
         if saisie:
             try:
                 date_ech = parse_date_flexible(saisie).date()
-                if date_ech <= st.session_state.date_base:
+                if date_ech <= date_base:
                     st.warning("⚠️ La date doit être postérieure à la date de base.")
                     date_ech = None
             except Exception:
                 st.error("❌ Format de date invalide. Utilisez jj/mm/aaaa.")
 
     if date_ech:
-        mat_user = (date_ech - st.session_state.date_base).days / 365
-        df = st.session_state.df
-        taux_interp = interpolate_rate(df["maturite_annees"], df["Taux_zero_coupon"], np.array([mat_user]))[0]
+        mat_user = (date_ech - date_base).days / 365
+        taux_interp = float(courbe_zc(mat_user))
         st.success(f"📅 Échéance : {date_ech.strftime('%d/%m/%Y')} (maturité : {mat_user:.3f} ans)")
         st.metric("Taux Zéro-Coupon interpolé", f"{taux_interp*100:.4f} %")
 
 # ------------------ TAUX FORWARDS ------------------
-if st.session_state.taux_calcules and "Taux_zero_coupon" in st.session_state.df.columns:
+if st.session_state.taux_calcules:
     st.header("4️⃣ Taux Forwards implicites")
 
-    df = st.session_state.df
-    mats = df["maturite_annees"].to_numpy()
-    zc = df["Taux_zero_coupon"].to_numpy()
-
     try:
-        mats_start, mats_end, forwards = taux_forward(mats, zc)
-        df_fw = pd.DataFrame({
-            "De (années)": mats_start,
-            "À (années)": mats_end,
-            "Taux Forward (%)": forwards * 100
-        })
+        df_fw = calculer_forwards(cle, df)
 
         st.dataframe(df_fw, use_container_width=True)
 
@@ -163,13 +218,18 @@ if st.session_state.taux_calcules and "Taux_zero_coupon" in st.session_state.df.
         st.subheader("📈 Courbe des Taux Forwards")
         st.line_chart(
             pd.DataFrame({
-                "Forward (%)": forwards * 100
-            }, index=mats_end)
+                "Forward (%)": df_fw["Taux Forward (%)"].to_numpy()
+            }, index=df_fw["À (années)"].to_numpy())
         )
 
         # Téléchargement
-        csv_fw = df_fw.to_csv(index=False, sep=';', decimal=',').encode("utf-8-sig")
-        st.download_button("📥 Télécharger les taux forwards (CSV)", data=csv_fw, file_name="taux_forwards.csv")
+        format_export = st.session_state.get("format_export", "csv")
+        fichier_fw = exporter_fichier(cle, "forwards", format_export, df_fw)
+        st.download_button(f"📥 Télécharger les taux forwards ({format_export})", data=fichier_fw,
+                           file_name=f"taux_forwards{FORMATS[format_export][1]}", mime=FORMATS[format_export][0])
+        st.download_button("📥 Télécharger les taux forwards (json)",
+                           data=exporter_fichier(cle, "forwards", "json", df_fw),
+                           file_name="taux_forwards.json", mime="application/json")
 
     except Exception as e:
         st.error(f"Erreur lors du calcul des forwards : {e}")
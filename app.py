@@ -1,28 +1,49 @@
 # mon_app_flask/app.py
-from flask import Flask, render_template, request, send_file
+from flask import Flask, Response, abort, render_template, request, session
 import pandas as pd
-import numpy as np
-import io
-from services.taux_processor import process_dataframe, interpolate_user_date
+import uuid
+from services.taux_processor import process_dataframe, interpolate_user_date, table_journaliere
+from services.rate_query import creer_api, courbe_bam
+from src.Forward import exporter_forwards
+from src.io_bam import read_bam_csv
+from src.exports import FORMATS, reponse_export
+from src.metrics import etape, instrumenter
+from src.session_cache import cache_sessions_par_defaut
 
 app = Flask(__name__)
 app.secret_key = "super-secret-key"
+instrumenter(app)
 
-df_resultats = None
-df_forwards = None
-date_base = None
+# Courbes calculées par session (plus de variables globales partagées entre utilisateurs)
+COURBES = cache_sessions_par_defaut()
+
+def session_id():
+    if "sid" not in session:
+        session["sid"] = uuid.uuid4().hex
+    return session["sid"]
+
+def calculer_courbe(df):
+    """Courbe et objets liés déposés avec elle dans le cache (import, API et courbes BAM)."""
+    df, df_fw, date_base = process_dataframe(df)
+    return df, {"df_forwards": df_fw, "date_base": date_base}
+
+def resoudre_courbe(date_courbe):
+    if date_courbe:
+        return courbe_bam(COURBES, date_courbe, calculer_courbe)
+    return COURBES.lire(session_id())
+
+app.register_blueprint(creer_api(resoudre_courbe, jours_par_an=365))
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    global df_resultats, df_forwards, date_base
-
     message, taux_interp, interp_date = "", None, None
+    entree = COURBES.lire(session_id())
 
     if request.method == "POST":
         if "upload" in request.files and request.files["upload"].filename != "":
             try:
                 file = request.files["upload"]
-                df = pd.read_csv(file, sep=';', skiprows=2, skipfooter=1, engine='python', dtype=str)
+                df = read_bam_csv(file)
                 message = "✅ CSV chargé"
             except Exception as e:
                 return render_template("index.html", message=f"❌ Erreur : {e}")
@@ -40,81 +61,49 @@ def index():
             df = None
 
         try:
-            df, df_forwards, date_base = process_dataframe(df)
-            df_resultats = df
+            df, extras = calculer_courbe(df)
+            entree = COURBES.deposer(session_id(), df, **extras)
         except Exception as e:
             return render_template("index.html", message=f"❌ Erreur traitement : {e}")
 
     if request.method == "GET" and "date_interp" in request.args:
         saisie = request.args["date_interp"]
-        if df_resultats is not None:
+        if entree is not None:
             try:
-                taux_interp, interp_date = interpolate_user_date(saisie, df_resultats, date_base)
+                table = entree.derive("table_journaliere",
+                                      lambda: table_journaliere(entree.df, entree["date_base"]))
+                taux_interp, interp_date = interpolate_user_date(saisie, entree.df, entree["date_base"],
+                                                                 entree.interpolateur, table)
             except Exception as e:
                 message = f"⚠️ Interpolation : {e}"
 
-    return render_template("index.html",
-                           df=df_resultats,
-                           df_forwards=df_forwards,
-                           taux_interp=taux_interp,
-                           interp_date=interp_date,
-                           message=message)
+    with etape("rendu_html"):
+        return render_template("index.html",
+                               df=entree.df if entree else None,
+                               df_forwards=entree["df_forwards"] if entree else None,
+                               taux_interp=taux_interp,
+                               interp_date=interp_date,
+                               message=message)
+
+def format_export():
+    format = request.args.get("format", "csv")
+    if format not in FORMATS:
+        abort(400, f"Format d'export inconnu : {format} (attendu : {', '.join(FORMATS)})")
+    return format
 
 @app.route("/download")
 def download():
-    if df_resultats is not None:
-        csv = df_resultats.to_csv(index=False, sep=';', decimal=',').encode("utf-8-sig")
-        return send_file(io.BytesIO(csv), as_attachment=True, download_name="resultats_taux.csv", mimetype="text/csv")
+    entree = COURBES.lire(session_id())
+    if entree is not None:
+        return reponse_export(entree.df, "resultats_taux", format_export())
     return "Aucun résultat disponible"
 
 @app.route("/download_fw")
 def download_fw():
-    if df_forwards is not None:
-        csv = df_forwards.to_csv(index=False, sep=';', decimal=',').encode("utf-8-sig")
-        return send_file(io.BytesIO(csv), as_attachment=True, download_name="taux_forwards.csv", mimetype="text/csv")
+    entree = COURBES.lire(session_id())
+    if entree is not None:
+        if request.args.get("format") == "json":
+            return Response(exporter_forwards(entree["df_forwards"], "json"), mimetype="application/json",
+                            headers={"Content-Disposition": 'attachment; filename="taux_forwards.json"'})
+        return reponse_export(entree["df_forwards"], "taux_forwards", format_export())
     return "Aucun forward disponible"
-
-# mon_app_flask/services/taux_processor.py
-import pandas as pd
-import numpy as np
-from src.dates import get_base_date, calc_maturite, parse_date_flexible
-from src.bootstrap import taux_actuariel, bootstrap_zc
-from src.interpolation import interpolate_rate
-from src.Forward import taux_forward
-
-def process_dataframe(df):
-    df.rename(columns={
-        "Date échéance": "Echeance",
-        "Date d'échéance": "Echeance",
-        "Taux moyen": "Taux moyen pondéré"
-    }, inplace=True, errors='ignore')
-
-    if "Echeance" not in df.columns or "Taux moyen pondéré" not in df.columns:
-        raise Exception("Colonnes manquantes")
-
-    base_date = get_base_date(df, "Echeance")
-    df["maturite_jours"] = df["Echeance"].apply(lambda s: calc_maturite(s, base_date))
-    df = df.dropna(subset=["maturite_jours"])
-    df["maturite_annees"] = df["maturite_jours"].astype(float) / 365
-    df["Taux_decimal"] = df["Taux moyen pondéré"].str.replace('%', '').str.replace(',', '.').astype(float) / 100
-    df = df.sort_values(by="maturite_annees").reset_index(drop=True)
-
-    df["Taux_actuariel"] = df.apply(lambda r: taux_actuariel(r["maturite_annees"], r["Taux_decimal"]), axis=1)
-    df["Taux_zero_coupon"] = bootstrap_zc(df)
-
-    mats_start, mats_end, forwards = taux_forward(df["maturite_annees"], df["Taux_zero_coupon"])
-    df_fw = pd.DataFrame({
-        "De (années)": mats_start,
-        "À (années)": mats_end,
-        "Taux Forward (%)": forwards * 100
-    })
-
-    return df, df_fw, base_date
-
-def interpolate_user_date(date_str, df, base_date):
-    d = parse_date_flexible(date_str).date()
-    if d <= base_date:
-        raise Exception("La date doit être postérieure à la date de base.")
-    maturite = (d - base_date).days / 365
-    taux = interpolate_rate(df["maturite_annees"], df["Taux_zero_coupon"], np.array([maturite]))[0]
-    return taux, d
@@ -1,18 +1,48 @@
-from flask import Flask, render_template, request, session, redirect, url_for
+from flask import Flask, Response, render_template, request, session, redirect, url_for
 import pandas as pd
 import os
-import io
+import threading
+import uuid
 from datetime import date
-from src.dates import get_base_date, calc_maturite
-from src.io_bam import import_bam_curve
-from src.bootstrap import taux_actuariel, bootstrap_zc
-from src.Forward import taux_forward
-from src.plotting import create_yield_curve_chart, create_forward_curve_chart
-from src.interpolation import interpolate_rate
+from src.dates import get_base_date, calc_maturite, calc_maturites
+from src.io_bam import import_bam_curve, read_bam_csv, taux_en_decimal
+from src.bam_cache import cache_par_defaut
+from src.bootstrap import taux_actuariel_array, bootstrap_zc_array
+from src.Forward import taux_forward, formater_forwards
+from src.plotting import create_yield_curve_chart, create_forward_curve_chart, create_history_chart
+from src.curve_store import CurveStore
+from src.metrics import etape, instrumenter
+from src.session_cache import cache_sessions_par_defaut
+from services.rate_query import creer_api, courbe_bam
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('FLASK_SECRET_KEY', 'a_very_strong_dev_secret_key_901')
-PICKLE_FILE = 'tmp_df.pkl'
+instrumenter(app)
+COURBES = cache_sessions_par_defaut()
+_prechargement = set()  # dates en cours de téléchargement
+_verrou_prechargement = threading.Lock()
+
+def precharger_bam(date_obj):
+    """
+    Télécharge en arrière-plan la courbe du jour dans le cache disque, un seul téléchargement
+    à la fois par date : le premier GET ne bloque pas sur BAM, les requêtes suivantes la
+    trouvent en cache. En cas d'échec, nouvel essai à la prochaine visite.
+    """
+    with _verrou_prechargement:
+        if date_obj in _prechargement:
+            return
+        _prechargement.add(date_obj)
+
+    def telecharger():
+        try:
+            import_bam_curve(date_obj)
+        except Exception:
+            pass
+        finally:
+            with _verrou_prechargement:
+                _prechargement.discard(date_obj)
+
+    threading.Thread(target=telecharger, daemon=True).start()
 
 def perform_calculations(df):
     df.rename(columns={
@@ -23,19 +53,48 @@ def perform_calculations(df):
     if "Echeance" not in df.columns or "Taux moyen pondéré" not in df.columns:
         raise ValueError("Colonnes 'Echeance' et/ou 'Taux moyen pondéré' introuvables.")
 
-    date_base = get_base_date(df, col_name="Echeance")
-    df["maturite_jours"] = df["Echeance"].apply(lambda s: calc_maturite(s, date_base))
-    df.dropna(subset=["maturite_jours"], inplace=True)
-    df["maturite_annees"] = df["maturite_jours"].astype(float) / 365.25
-    df["Taux_decimal"] = df["Taux moyen pondéré"].astype(str).str.replace('%', '', regex=False).str.replace(',', '.', regex=False).astype(float) / 100
-    df.sort_values(by="maturite_annees", inplace=True)
-    df["Taux_actuariel"] = df.apply(lambda r: taux_actuariel(r["maturite_annees"], r["Taux_decimal"]), axis=1)
-    df["Taux_zero_coupon"] = bootstrap_zc(df)
+    with etape("dates"):
+        date_base = get_base_date(df, col_name="Echeance")
+        df["maturite_jours"] = calc_maturites(df["Echeance"], date_base)
+        df.dropna(subset=["maturite_jours"], inplace=True)
+        df["maturite_annees"] = df["maturite_jours"].astype(float) / 365.25
+    with etape("taux"):
+        df["Taux_decimal"] = taux_en_decimal(df["Taux moyen pondéré"])
+        df.sort_values(by="maturite_annees", inplace=True)
+        df["Taux_actuariel"] = taux_actuariel_array(df["maturite_annees"], df["Taux_decimal"])
+    with etape("bootstrap"):
+        df["Taux_zero_coupon"] = bootstrap_zc_array(df["maturite_annees"], df["Taux_decimal"])
     return df
 
+def _session_id():
+    if 'sid' not in session:
+        session['sid'] = uuid.uuid4().hex
+    return session['sid']
+
+def _courbe_session():
+    """
+    Courbe calculée de la session. Une courbe BAM absente du cache (évincée, ou calculée par
+    un autre processus) est recalculée à partir du cache disque des courbes BAM.
+    """
+    entree = COURBES.lire(_session_id())
+    if entree is None and session.get('last_mode') == 'bam':
+        date_str = session.get('last_date')
+        date_pub = pd.to_datetime(date_str).date() if date_str else date.today()
+        entree = COURBES.deposer(_session_id(), perform_calculations(import_bam_curve(date_pub)))
+    return entree
+
+def _resoudre_courbe(date_courbe):
+    """Courbe interrogée par l'API JSON : courbe BAM de `date_courbe`, sinon celle de la session."""
+    if date_courbe:
+        return courbe_bam(COURBES, date_courbe, perform_calculations)
+    return _courbe_session() if session.get('has_data') else None
+
+app.register_blueprint(creer_api(_resoudre_courbe, jours_par_an=365.25))
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     df, df_fw = None, None
+    entree = None
     error = None
     forward_mode = False
     zc_chart, forward_chart = None, None
@@ -46,32 +105,39 @@ def index():
     if request.method == 'GET' and not session.get('has_data'):
         try:
             today_str = date.today().isoformat()
-            df = import_bam_curve(date.today())
-            df = perform_calculations(df)
-            zc_chart = create_yield_curve_chart(df)
-            df.to_pickle(PICKLE_FILE)
-            session['has_data'] = True
-            session['last_mode'] = 'bam'
-            session['last_date'] = today_str
+            # Chargement automatique depuis le cache disque uniquement, sans appel réseau
+            with etape("lecture_cache"):
+                df = cache_par_defaut().lire(date.today())
+            if df is None:
+                precharger_bam(date.today())
+            else:
+                entree = COURBES.deposer(_session_id(), perform_calculations(df))
+                df = entree.df
+                session['has_data'] = True
+                session['last_mode'] = 'bam'
+                session['last_date'] = today_str
         except Exception as e:
             error = f"❌ Erreur lors du chargement automatique : {e}"
             session.clear()
-    elif session.get('has_data') and os.path.exists(PICKLE_FILE):
+    elif session.get('has_data'):
         try:
-            df = pd.read_pickle(PICKLE_FILE)
-            if request.method == 'GET':
-                zc_chart = create_yield_curve_chart(df)
-        except (FileNotFoundError, EOFError):
+            with etape("cache_session"):
+                entree = _courbe_session()
+            if entree is None:
+                session.clear()
+                error = "❌ Session expirée : veuillez réimporter la courbe."
+            else:
+                df = entree.df
+        except Exception as e:
             session.clear()
-            error = "❌ Erreur de chargement des données de session."
+            error = f"❌ Erreur de chargement des données de session : {e}"
 
     if request.method == 'POST':
         action = request.form.get('action')
 
         if action == 'reset':
+            COURBES.oublier(session.get('sid'))
             session.clear()
-            if os.path.exists(PICKLE_FILE):
-                os.remove(PICKLE_FILE)
             return redirect(url_for('index'))
 
         elif action == 'calculate_curves':
@@ -87,16 +153,14 @@ def index():
                 elif mode == "upload":
                     file = request.files.get('csv')
                     if file and file.filename:
-                        csv_data = io.StringIO(file.stream.read().decode("UTF-8"))
-                        raw_df = pd.read_csv(csv_data, sep=';', skiprows=2, skipfooter=1, engine='python', dtype=str)
+                        raw_df = read_bam_csv(file.stream)
                         session['last_mode'] = 'upload'
                         session['last_filename'] = file.filename
                     else:
                         error = "❌ Aucun fichier CSV sélectionné."
                 if raw_df is not None:
-                    df = perform_calculations(raw_df)
-                    zc_chart = create_yield_curve_chart(df)
-                    df.to_pickle(PICKLE_FILE)
+                    entree = COURBES.deposer(_session_id(), perform_calculations(raw_df))
+                    df = entree.df
                     session['has_data'] = True
                     error = None
                 elif not error:
@@ -108,16 +172,11 @@ def index():
         elif action == 'calculate_forwards':
             forward_mode = True
             if df is not None and 'Taux_zero_coupon' in df.columns:
-                zc_chart = create_yield_curve_chart(df)
                 if len(df) > 1:
                     mats = df["maturite_annees"].to_numpy()
                     zc = df["Taux_zero_coupon"].to_numpy()
                     mats_start, mats_end, forwards = taux_forward(mats, zc)
-                    df_fw = pd.DataFrame({
-                        "De (années)": [f"{x:.2f}" for x in mats_start], 
-                        "À (années)": [f"{x:.2f}" for x in mats_end], 
-                        "Taux Forward (%)": [f"{x*100:.2f}" for x in forwards]
-                    })
+                    df_fw = formater_forwards(mats_start, mats_end, forwards)
                     forward_chart = create_forward_curve_chart(mats_end, forwards)
                 else:
                     error = "❌ Données insuffisantes pour calculer les taux forwards."
@@ -132,18 +191,20 @@ def index():
                     base_date = get_base_date(df)
                     jours = calc_maturite(date_cible.isoformat(), base_date)
                     maturity = jours / 365.25
-                    mats = df["maturite_annees"].to_numpy()
-                    zc = df["Taux_zero_coupon"].to_numpy()
-                    interpolated = interpolate_rate(mats, zc, maturity)
+                    interpolated = entree.interpolateur(maturity)
                     interpolated_rate = f"{interpolated * 100:.4f}"
                     interpolated_target = date_cible.strftime("%d/%m/%Y")
                     interpolated_maturity = f"{maturity:.2f}"
-                    zc_chart = create_yield_curve_chart(df)
                 except Exception as e:
                     error = f"❌ Erreur lors de l'interpolation par date : {e}"
             else:
                 error = "❌ Date invalide ou données manquantes pour l’interpolation."
 
+    if df is not None and 'Taux_zero_coupon' in df.columns:
+        # Figure sérialisée une seule fois par version de courbe (cache de src.plotting)
+        with etape("graphique"):
+            zc_chart = create_yield_curve_chart(df)
+
     df_display = None
     if df is not None:
         df_display = df.copy()
@@ -153,10 +214,14 @@ def index():
         if 'maturite_annees' in df_display.columns:
             df_display['maturite_annees'] = df_display['maturite_annees'].apply(lambda x: f"{x:.2f}")
 
+    with etape("rendu_html"):
+        df_table = df_display.to_html(classes='table table-striped', index=False) if df_display is not None else None
+        df_fw_table = df_fw.to_html(classes='table table-striped', index=False) if df_fw is not None else None
+
     return render_template(
         "layout.html",
-        df_table=df_display.to_html(classes='table table-striped', index=False) if df_display is not None else None,
-        df_fw_table=df_fw.to_html(classes='table table-striped', index=False) if df_fw is not None else None,
+        df_table=df_table,
+        df_fw_table=df_fw_table,
         forward_mode=forward_mode,
         error=error,
         zc_chart=zc_chart,
@@ -169,6 +234,26 @@ def index():
         interpolated_maturity=interpolated_maturity
     )
 
+@app.route('/historique')
+def historique():
+    """
+    Historique des taux ZC aux ténors demandés (?tenors=2,5,10&debut=...&fin=...), lu dans le
+    CurveStore du dossier CURVE_STORE_DIR. Les séries longues sont réduites par LTTB.
+    """
+    dossier = os.environ.get('CURVE_STORE_DIR')
+    if not dossier or not os.path.exists(os.path.join(dossier, 'meta.json')):
+        return "Aucun historique disponible (CURVE_STORE_DIR non configuré).", 404
+    store = CurveStore(dossier)
+    try:
+        tenors = [float(t) for t in request.args.get('tenors', '2,5,10').split(',')]
+        debut, fin = request.args.get('debut') or None, request.args.get('fin') or None
+        with etape("historique"):
+            series = pd.concat([store.serie(t, debut, fin) for t in tenors], axis=1)
+    except ValueError as e:
+        return f"Paramètres invalides : {e}", 400
+    with etape("graphique"):
+        return Response(create_history_chart(series), mimetype='text/html')
+
 if __name__ == '__main__':
     app.run(debug=True)
 
@@ -0,0 +1,90 @@
+"""
+Benchmark de l'API JSON de taux (POST /api/taux, services/rate_query.py).
+
+Usage :
+    python -m benchmarks.bench_api
+    python -m benchmarks.bench_api --tailles 1000 10000 100000 --objectif 200000
+
+Pour chaque taille, une courbe synthétique est chargée dans la session d'un client de test
+Flask, puis on mesure la latence d'une requête de N dates hors cache (contenu nouveau à
+chaque répétition) et depuis le cache de réponses (même requête répétée). `--objectif`
+(points/s hors cache à 10 000 dates ou à la plus grande taille demandée en dessous) fait
+échouer le benchmark s'il n'est pas atteint.
+"""
+import argparse
+import io
+import json
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import generer_csv_bam
+
+
+def _client():
+    from app import app
+
+    client = app.test_client()
+    # La page d'accueil de app.py n'a pas de template versionné : on dépose la courbe via
+    # le même chemin que l'upload, en ignorant le rendu
+    import jinja2
+    app.jinja_loader = jinja2.DictLoader({"index.html": ""})
+    client.post("/", data={"upload": (io.BytesIO(generer_csv_bam(200)), "courbe.csv")},
+                content_type="multipart/form-data")
+    return client
+
+
+def _requete(base: np.datetime64, n: int, decalage: int) -> dict:
+    jours = np.arange(n) % (30 * 365) + 1 + decalage
+    return {"dates": (base + jours).astype(str).tolist()}
+
+
+def mesurer(client, n: int, repetitions: int = 5) -> dict:
+    base = np.datetime64(client.post("/api/taux", json={"maturites": [1]}).get_json()["date_base"], "D")
+    froid, chaud = [], []
+    for i in range(repetitions):
+        requete = _requete(base, n, decalage=i)
+        debut = time.perf_counter()
+        reponse = client.post("/api/taux", json=requete)
+        froid.append(time.perf_counter() - debut)
+        if reponse.status_code != 200:
+            raise RuntimeError(f"/api/taux a répondu {reponse.status_code} : {reponse.get_data(as_text=True)[:200]}")
+        debut = time.perf_counter()
+        client.post("/api/taux", json=requete)
+        chaud.append(time.perf_counter() - debut)
+    p50_froid, p50_chaud = float(np.median(froid)), float(np.median(chaud))
+    return {"n": n, "froid_s": p50_froid, "cache_s": p50_chaud, "points_par_s": n / p50_froid}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Latence et débit de l'API JSON de taux")
+    parser.add_argument("--tailles", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--objectif", type=float, help="débit minimal hors cache (points/s)")
+    parser.add_argument("--sortie", help="fichier JSON des résultats")
+    args = parser.parse_args(argv)
+
+    client = _client()
+    resultats = []
+    for n in args.tailles:
+        r = mesurer(client, n, args.repetitions)
+        resultats.append(r)
+        print(f"{n:>8} dates  hors cache={r['froid_s'] * 1e3:8.1f} ms  "
+              f"cache={r['cache_s'] * 1e3:7.2f} ms  {r['points_par_s']:>12,.0f} points/s")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "resultats": resultats}, f, indent=2)
+
+    if args.objectif is not None:
+        candidats = [r for r in resultats if r["n"] <= 10_000] or resultats
+        reference = max(candidats, key=lambda r: r["n"])
+        if reference["points_par_s"] < args.objectif:
+            print(f"❌ {reference['points_par_s']:,.0f} points/s à {reference['n']} dates "
+                  f"(objectif : {args.objectif:,.0f})", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Benchmark de la courbe incrémentale (src/incremental.py).
+
+Usage : python -m benchmarks.bench_incremental [nb_piliers ...]
+Compare la latence d'une correction de pilier (en fin, au milieu et en tête de courbe)
+au recalcul complet : bootstrap_zc_array + taux_forward sur toute la courbe.
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.bootstrap import bootstrap_zc_array
+from src.Forward import taux_forward
+from src.incremental import IncrementalCurve
+
+
+def courbe_synthetique(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    maturites = np.sort(rng.uniform(0.01, 30, n))
+    taux = 0.022 + 0.02 * (1 - np.exp(-maturites / 8)) + rng.normal(0, 5e-4, n)
+    return maturites, taux
+
+
+def mediane_us(f, repetitions=50):
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        f()
+        temps.append(time.perf_counter() - debut)
+    return np.median(temps) * 1e6
+
+
+def main(tailles):
+    print(f"{'piliers':>8} {'complet (µs)':>13} {'maj fin (µs)':>13} {'maj milieu (µs)':>16} {'maj tête (µs)':>14}")
+    for n in tailles:
+        maturites, taux = courbe_synthetique(n)
+
+        def complet():
+            zc = bootstrap_zc_array(maturites, taux)
+            taux_forward(maturites, zc)
+
+        courbe = IncrementalCurve(maturites, taux)
+        courbe.forwards()
+        resultats = []
+        for rang in (n - 1, n // 2, 0):
+            maturite = maturites[rang]
+
+            def maj():
+                courbe.mettre_a_jour(maturite, taux[rang] + 1e-4)
+                courbe.forwards()
+
+            resultats.append(mediane_us(maj))
+        print(f"{n:>8} {mediane_us(complet):>13.1f} {resultats[0]:>13.1f} {resultats[1]:>16.1f} {resultats[2]:>14.1f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100, 1_000, 10_000, 100_000])
@@ -0,0 +1,66 @@
+"""
+Benchmark du moteur de valorisation de portefeuille (src/pricing.py).
+
+Usage : python -m benchmarks.bench_pricing [nb_obligations ...]
+Compare le moteur vectorisé à une boucle obligation par obligation sur
+`calcule_prix_dirty_corrected` (taux d'actualisation unique, échantillon extrapolé).
+"""
+import sys
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.dirty_Price import calcule_prix_dirty_corrected
+from src.interpolation import CurveInterpolator
+from src.pricing import price_portfolio
+
+DATE_VALO = date(2025, 10, 17)
+
+
+def portefeuille_synthetique(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    jours = rng.integers(30, 30 * 365, n)
+    return pd.DataFrame({
+        "Nominal": rng.choice([1e5, 1e6, 1e7], n),
+        "Taux_coupon": rng.uniform(0.015, 0.05, n).round(4),
+        "Echeance": pd.Timestamp(DATE_VALO) + pd.to_timedelta(jours, unit="D"),
+        "Frequence": rng.choice([1, 2], n, p=[0.8, 0.2]),
+    })
+
+
+def courbe_synthetique() -> CurveInterpolator:
+    mats = np.array([0.25, 0.5, 1, 2, 5, 10, 15, 20, 30])
+    return CurveInterpolator(mats, 0.022 + 0.02 * (1 - np.exp(-mats / 8)), method="log_df")
+
+
+def chrono(f, repetitions=5):
+    temps = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        f()
+        temps.append(time.perf_counter() - debut)
+    return min(temps)
+
+
+def main(tailles):
+    courbe = courbe_synthetique()
+    print(f"{'obligations':>12} {'vectorisé (s)':>14} {'µs/oblig.':>10} {'boucle (s, est.)':>17}")
+    for n in tailles:
+        ptf = portefeuille_synthetique(n)
+        t_vec = chrono(lambda: price_portfolio(ptf, courbe, DATE_VALO))
+
+        echantillon = ptf.head(min(n, 1000))
+        annees = ((echantillon["Echeance"] - pd.Timestamp(DATE_VALO)).dt.days / 365).to_numpy()
+
+        def boucle():
+            for nominal, cpn, T in zip(echantillon["Nominal"], echantillon["Taux_coupon"], annees):
+                calcule_prix_dirty_corrected(nominal, nominal * cpn, float(courbe(T)), max(int(np.ceil(T)), 1))
+
+        t_boucle = chrono(boucle, repetitions=1) * n / len(echantillon)
+        print(f"{n:>12} {t_vec:>14.4f} {t_vec / n * 1e6:>10.2f} {t_boucle:>17.4f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [1_000, 10_000, 50_000])
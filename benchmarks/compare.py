@@ -0,0 +1,46 @@
+"""
+Compare deux fichiers de résultats de `benchmarks.run` (ex : avant / après un commit).
+
+Usage : python -m benchmarks.compare avant.json apres.json [--seuil 1.2]
+Affiche le rapport des médianes (après / avant) et sort avec le code 1 si une fonction
+ralentit au-delà du seuil, pour bloquer une régression en intégration continue.
+"""
+import argparse
+import json
+import sys
+
+
+def charger(chemin: str) -> tuple:
+    """Rapport JSON d'une campagne et ses résultats indexés par (fonction, taille)."""
+    with open(chemin, encoding="utf-8") as f:
+        rapport = json.load(f)
+    return rapport, {(r["fonction"], r["taille"]): r for r in rapport["resultats"]}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Comparaison de deux campagnes de benchmarks")
+    parser.add_argument("avant")
+    parser.add_argument("apres")
+    parser.add_argument("--seuil", type=float, default=1.2,
+                        help="rapport de médianes au-delà duquel on signale une régression")
+    args = parser.parse_args(argv)
+
+    rapport_avant, avant = charger(args.avant)
+    rapport_apres, apres = charger(args.apres)
+    print(f"avant : {rapport_avant['commit']}  après : {rapport_apres['commit']}")
+    print(f"{'fonction':>22} {'taille':>8} {'avant p50 (ms)':>15} {'après p50 (ms)':>15} {'rapport':>8} {'mémoire':>8}")
+
+    regressions = 0
+    for cle in sorted(set(avant) & set(apres)):
+        a, b = avant[cle], apres[cle]
+        rapport = b["p50_s"] / a["p50_s"] if a["p50_s"] else float("inf")
+        memoire = b["pic_memoire_octets"] / a["pic_memoire_octets"] if a["pic_memoire_octets"] else float("inf")
+        alerte = "  <-- régression" if rapport > args.seuil else ""
+        regressions += bool(alerte)
+        print(f"{cle[0]:>22} {cle[1]:>8} {a['p50_s'] * 1e3:>15.3f} {b['p50_s'] * 1e3:>15.3f} "
+              f"{rapport:>8.2f} {memoire:>8.2f}{alerte}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Suite de benchmarks du pipeline de courbe.
+
+Usage :
+    python -m benchmarks.run --sortie resultats.json
+    python -m benchmarks.run --tailles 10 1000 --repetitions 20 --fonctions bootstrap_zc taux_forward
+    python -m benchmarks.compare avant.json apres.json
+
+Chaque fonction est mesurée sur des courbes synthétiques (benchmarks/synthetic.py) de
+10 à 100 000 piliers : temps répétés (min, p50, p90, p99) puis une exécution sous
+tracemalloc pour le pic mémoire. Les résultats JSON sont comparables entre deux commits.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import process_dataframe
+from src.bootstrap import bootstrap_zc, taux_actuariel, taux_actuariel_array
+from src.dates import calc_maturite, calc_maturites, get_base_date, parse_date_flexible, vider_cache_dates
+from src.Forward import taux_forward
+from src.interpolation import interpolate_rate
+from src.io_bam import read_bam_csv_safely
+
+TAILLES = (10, 100, 1_000, 10_000, 100_000)
+
+
+def _preparer(n: int) -> dict:
+    """Entrées partagées par les benchmarks pour une taille de courbe."""
+    csv = generer_csv_bam(n)
+    brut = read_bam_csv_safely(csv.decode("utf-8"))
+    df, _, base = process_dataframe(brut.copy())
+    return {"csv": csv.decode("utf-8"), "brut": brut, "df": df, "base": base}
+
+
+# nom -> (fonction à chronométrer construite à partir des entrées, taille maximale raisonnable)
+BENCHMARKS = {
+    "read_bam_csv_safely": (lambda e: lambda: read_bam_csv_safely(e["csv"]), None),
+    "process_dataframe": (lambda e: lambda: process_dataframe(e["brut"].copy()), None),
+    "parse_date_flexible": (lambda e: lambda: e["brut"]["Echeance"].map(parse_date_flexible), 10_000),
+    "calc_maturite": (lambda e: lambda: e["brut"]["Echeance"].apply(lambda s: calc_maturite(s, e["base"])), 10_000),
+    "calc_maturites": (lambda e: lambda: calc_maturites(e["brut"]["Echeance"], get_base_date(e["brut"])), None),
+    "taux_actuariel": (lambda e: lambda: [taux_actuariel(T, t) for T, t in
+                                          zip(e["df"]["maturite_annees"], e["df"]["Taux_decimal"])], None),
+    "taux_actuariel_array": (lambda e: lambda: taux_actuariel_array(e["df"]["maturite_annees"],
+                                                                    e["df"]["Taux_decimal"]), None),
+    "bootstrap_zc": (lambda e: lambda: bootstrap_zc(e["df"]), None),
+    "interpolate_rate": (lambda e: lambda: interpolate_rate(e["df"]["maturite_annees"], e["df"]["Taux_zero_coupon"],
+                                                            np.linspace(0.1, 30, 1_000)), None),
+    "taux_forward": (lambda e: lambda: taux_forward(e["df"]["maturite_annees"], e["df"]["Taux_zero_coupon"]), None),
+}
+
+
+def mesurer(f, repetitions: int) -> dict:
+    f()  # échauffement (imports paresseux)
+    temps = []
+    for _ in range(repetitions):
+        vider_cache_dates()  # sinon seules les lectures du mémo de parse_dates seraient mesurées
+        debut = time.perf_counter()
+        f()
+        temps.append(time.perf_counter() - debut)
+    vider_cache_dates()
+    tracemalloc.start()
+    f()
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    temps = np.array(temps)
+    return {
+        "repetitions": repetitions,
+        "min_s": float(temps.min()),
+        "p50_s": float(np.percentile(temps, 50)),
+        "p90_s": float(np.percentile(temps, 90)),
+        "p99_s": float(np.percentile(temps, 99)),
+        "pic_memoire_octets": int(pic),
+    }
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnu"
+
+
+def executer(tailles=TAILLES, repetitions: int = 10, fonctions=None) -> dict:
+    fonctions = fonctions or list(BENCHMARKS)
+    resultats = []
+    for n in tailles:
+        entrees = _preparer(n)
+        for nom in fonctions:
+            fabrique, taille_max = BENCHMARKS[nom]
+            if taille_max is not None and n > taille_max:
+                continue
+            mesure = mesurer(fabrique(entrees), repetitions)
+            resultats.append({"fonction": nom, "taille": n, **mesure})
+            print(f"{nom:>22} n={n:<7} p50={mesure['p50_s'] * 1e3:10.3f} ms  "
+                  f"p90={mesure['p90_s'] * 1e3:10.3f} ms  pic={mesure['pic_memoire_octets'] / 1e6:8.2f} Mo")
+    return {
+        "commit": _commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "resultats": resultats,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du pipeline de courbe BAM")
+    parser.add_argument("--tailles", type=int, nargs="+", default=list(TAILLES))
+    parser.add_argument("--repetitions", type=int, default=10)
+    parser.add_argument("--fonctions", nargs="+", choices=list(BENCHMARKS))
+    parser.add_argument("--sortie", help="fichier JSON des résultats")
+    args = parser.parse_args(argv)
+
+    rapport = executer(args.tailles, args.repetitions, args.fonctions)
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark du démarrage à froid des applications Flask.
+
+Usage :
+    python -m benchmarks.startup --sortie demarrage.json
+    python -m benchmarks.startup --repetitions 5 --max-import 1.5
+
+Chaque mesure est faite dans un interpréteur neuf : temps d'import du point d'entrée, modules
+lourds chargés à ce moment-là (scipy, requests, plotly...), puis latence de la première
+requête GET / et du premier calcul (upload d'un CSV synthétique). Le cache BAM pointe vers
+un dossier temporaire vide en mode hors ligne : aucune requête réseau n'est faite.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CIBLES = {
+    "app": os.path.join(RACINE, "app.py"),
+    "app_YC_flask": os.path.join(RACINE, "app_YC_flask", "app.py"),
+}
+MODULES_LOURDS = ("pandas", "scipy", "requests", "plotly", "dateutil")
+
+
+def _mesurer_enfant(cible: str) -> dict:
+    """Exécuté dans l'interpréteur neuf : import du point d'entrée puis premières requêtes."""
+    debut = time.perf_counter()
+    spec = importlib.util.spec_from_file_location(f"_demarrage_{cible}", CIBLES[cible])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    duree_import = time.perf_counter() - debut
+    charges = [m for m in MODULES_LOURDS if m in sys.modules]
+
+    import io
+    import jinja2
+    from benchmarks.synthetic import generer_csv_bam
+
+    app = module.app
+    # Les templates ne sont pas dans un dossier templates/ (et index.html de app.py n'est
+    # pas versionné) : on sert layout.html depuis le dossier de l'application, index.html vide
+    app.jinja_loader = jinja2.ChoiceLoader([
+        jinja2.FileSystemLoader(os.path.dirname(CIBLES[cible])),
+        jinja2.DictLoader({"index.html": "{{ message }}"}),
+    ])
+    client = app.test_client()
+
+    debut = time.perf_counter()
+    reponse_get = client.get("/")
+    duree_get = time.perf_counter() - debut
+
+    fichier = (io.BytesIO(generer_csv_bam(100)), "courbe.csv")
+    if cible == "app":
+        donnees = {"upload": fichier}
+    else:
+        donnees = {"action": "calculate_curves", "mode": "upload", "csv": fichier}
+    debut = time.perf_counter()
+    reponse_post = client.post("/", data=donnees, content_type="multipart/form-data")
+    duree_post = time.perf_counter() - debut
+
+    return {
+        "import_s": duree_import,
+        "premier_get_s": duree_get,
+        "premier_calcul_s": duree_post,
+        "statuts": [reponse_get.status_code, reponse_post.status_code],
+        "modules_lourds_a_l_import": charges,
+    }
+
+
+def mesurer(cible: str, repetitions: int = 3) -> dict:
+    """Lance `repetitions` interpréteurs neufs et agrège les mesures (médiane et maximum)."""
+    mesures = []
+    with tempfile.TemporaryDirectory() as dossier:
+        env = dict(os.environ, BAM_CACHE_DIR=dossier, BAM_HORS_LIGNE="1", PYTHONDONTWRITEBYTECODE="1")
+        for _ in range(repetitions):
+            sortie = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--enfant", cible],
+                                    cwd=dossier, env=dict(env, PYTHONPATH=RACINE),
+                                    capture_output=True, text=True, check=True).stdout
+            mesures.append(json.loads(sortie.strip().splitlines()[-1]))
+
+    resultat = {"cible": cible, "repetitions": repetitions,
+                "statuts": mesures[-1]["statuts"],
+                "modules_lourds_a_l_import": mesures[-1]["modules_lourds_a_l_import"]}
+    for cle in ("import_s", "premier_get_s", "premier_calcul_s"):
+        valeurs = np.array([m[cle] for m in mesures])
+        resultat[cle] = {"p50": float(np.median(valeurs)), "max": float(valeurs.max())}
+    return resultat
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Temps de démarrage à froid des applications")
+    parser.add_argument("--cibles", nargs="+", choices=list(CIBLES), default=list(CIBLES))
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--max-import", type=float, help="échec si l'import médian dépasse ce temps (s)")
+    parser.add_argument("--sortie", help="fichier JSON des résultats")
+    parser.add_argument("--enfant", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.enfant:
+        print(json.dumps(_mesurer_enfant(args.enfant)))
+        return 0
+
+    resultats = []
+    for cible in args.cibles:
+        r = mesurer(cible, args.repetitions)
+        resultats.append(r)
+        print(f"{cible:>14} import={r['import_s']['p50'] * 1e3:8.1f} ms  "
+              f"1er GET={r['premier_get_s']['p50'] * 1e3:8.1f} ms  "
+              f"1er calcul={r['premier_calcul_s']['p50'] * 1e3:8.1f} ms  "
+              f"statuts={r['statuts']}  lourds={','.join(r['modules_lourds_a_l_import']) or '-'}")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "resultats": resultats}, f, indent=2)
+
+    if args.max_import is not None and any(r["import_s"]["p50"] > args.max_import for r in resultats):
+        print(f"❌ Import plus lent que {args.max_import} s", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+Générateur de courbes BAM synthétiques au format CSV d'export (titres, en-tête, lignes, 'Total').
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+DATE_VALEUR = date(2025, 10, 17)
+HORIZON_JOURS = 30 * 365
+
+
+def generer_csv_bam(n_piliers: int, date_valeur: date = DATE_VALEUR, seed: int = 0) -> bytes:
+    """
+    CSV BAM de `n_piliers` lignes : échéances tirées sur 30 ans (avec répétitions au-delà
+    d'un pilier par jour), taux croissants bruités au format français ('2,268 %').
+    """
+    rng = np.random.default_rng(seed)
+    jours = np.sort(rng.integers(1, HORIZON_JOURS, n_piliers))
+    annees = jours / 365
+    taux = 2.2 + 2.0 * (1 - np.exp(-annees / 8)) + rng.normal(0, 0.02, n_piliers)
+
+    valeur = date_valeur.strftime("%d/%m/%Y")
+    lignes = [
+        '"Taux de référence des bons du trésor";;;',
+        f'"Date de la valeur : {valeur}";;;',
+        "Date d'échéance;Transaction;Taux moyen pondéré;Date de la valeur",
+    ]
+    for j, t in zip(jours.tolist(), taux.tolist()):
+        echeance = (date_valeur + timedelta(days=j)).strftime("%d/%m/%Y")
+        taux_fr = f"{t:.3f}".replace(".", ",")
+        lignes.append(f"{echeance};;{taux_fr} %;{valeur}")
+    lignes.append("Total;;;")
+    return ("\r\n".join(lignes) + "\r\n").encode("utf-8")
@@ -0,0 +1,157 @@
+"""
+Traitement en ligne de commande d'un dossier d'exports CSV BAM, sans interface web.
+
+Usage :
+    python -m services.batch_processor exports/ --sortie resultats/
+    python -m services.batch_processor "exports/2025-*.csv" --sortie resultats/ --workers 4 --format csv
+
+Chaque fichier passe par `process_dataframe` dans un pool de processus. Pour `courbe.csv`,
+on écrit `courbe.parquet` (maturités, taux actuariels et zéro-coupon) et
+`courbe_forwards.parquet`, dans la même arborescence relative que les entrées (à partir
+de leur dossier commun) : `a/courbe.csv` et `b/courbe.csv` ne s'écrasent pas. Un fichier
+dont les sorties sont plus récentes que lui est ignoré, sauf avec --force.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from services.taux_processor import process_dataframe
+from src.io_bam import read_bam_csv
+
+FORMATS = {"parquet": ".parquet", "csv": ".csv.gz"}
+
+
+def lister_fichiers(entrees) -> list:
+    """Fichiers CSV désignés par une liste de dossiers, de fichiers ou de motifs glob."""
+    fichiers = []
+    for entree in entrees:
+        if os.path.isdir(entree):
+            fichiers.extend(glob.glob(os.path.join(entree, "*.csv")))
+        else:
+            fichiers.extend(glob.glob(entree))
+    return sorted(set(os.path.abspath(f) for f in fichiers))
+
+
+def racine_commune(fichiers) -> str:
+    """Dossier commun des fichiers : les sorties reprennent les chemins relatifs à ce dossier."""
+    return os.path.commonpath([os.path.dirname(f) for f in fichiers]) if fichiers else ""
+
+
+def chemins_sortie(fichier: str, sortie: str, format: str = "parquet", racine=None):
+    """Sorties (courbe, forwards) d'un fichier ; sans `racine`, à plat dans `sortie`."""
+    relatif = os.path.relpath(fichier, racine) if racine else os.path.basename(fichier)
+    nom = os.path.splitext(relatif)[0]
+    extension = FORMATS[format]
+    return (os.path.join(sortie, nom + extension),
+            os.path.join(sortie, nom + "_forwards" + extension))
+
+
+def _verifier_collisions(fichiers, sortie: str, format: str, racine: str):
+    """Refuse d'emblée deux entrées qui écriraient le même fichier (ex : 'x.csv' et 'x_forwards.csv')."""
+    vus = {}
+    for fichier in fichiers:
+        for chemin in chemins_sortie(fichier, sortie, format, racine):
+            if chemin in vus:
+                raise ValueError(f"{fichier} et {vus[chemin]} produiraient tous deux {chemin}.")
+            vus[chemin] = fichier
+
+
+def a_jour(fichier: str, sorties) -> bool:
+    """Vrai si toutes les sorties existent et sont plus récentes que le fichier source."""
+    try:
+        source = os.path.getmtime(fichier)
+        return all(os.path.getmtime(s) >= source for s in sorties)
+    except OSError:
+        return False
+
+
+def _ecrire(df, chemin: str, format: str):
+    os.makedirs(os.path.dirname(chemin) or ".", exist_ok=True)
+    # Écriture atomique : un traitement interrompu ne laisse pas de sortie « à jour » tronquée
+    tmp = f"{chemin}.{os.getpid()}.tmp"
+    if format == "parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_csv(tmp, index=False, sep=";", decimal=",", compression="gzip")
+    os.replace(tmp, chemin)
+
+
+def traiter_fichier(fichier: str, sortie: str, format: str = "parquet", racine=None):
+    """Traite un export BAM et écrit ses résultats. Retourne (fichier, nombre de piliers)."""
+    with open(fichier, "rb") as f:
+        df = read_bam_csv(f.read())
+    df, df_fw, base_date = process_dataframe(df)
+    df["Date base"] = base_date
+    df["Echeance"] = df["Echeance"].astype(str)
+
+    chemin_courbe, chemin_fw = chemins_sortie(fichier, sortie, format, racine)
+    _ecrire(df, chemin_courbe, format)
+    _ecrire(df_fw, chemin_fw, format)
+    return fichier, len(df)
+
+
+def traiter_dossier(entrees, sortie: str, format: str = "parquet", max_workers=None,
+                    force: bool = False, progression=None) -> dict:
+    """
+    Traite tous les fichiers désignés par `entrees` dans un pool de processus.
+
+    `progression(fait, total, fichier, erreur)` est appelée après chaque fichier terminé.
+    Retourne un dictionnaire {'traites', 'ignores', 'erreurs': {fichier: message}}.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format inconnu : {format} (attendu : {', '.join(FORMATS)})")
+    os.makedirs(sortie, exist_ok=True)
+    fichiers = lister_fichiers(entrees)
+    racine = racine_commune(fichiers)
+    _verifier_collisions(fichiers, sortie, format, racine)
+    a_traiter = [f for f in fichiers if force or not a_jour(f, chemins_sortie(f, sortie, format, racine))]
+    bilan = {"traites": 0, "ignores": len(fichiers) - len(a_traiter), "erreurs": {}}
+    if not a_traiter:
+        return bilan
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(traiter_fichier, f, sortie, format, racine): f for f in a_traiter}
+        for fait, future in enumerate(as_completed(futures), start=1):
+            fichier, erreur = futures[future], None
+            try:
+                future.result()
+                bilan["traites"] += 1
+            except Exception as e:
+                erreur = str(e)
+                bilan["erreurs"][fichier] = erreur
+            if progression:
+                progression(fait, len(a_traiter), fichier, erreur)
+    return bilan
+
+
+def _afficher_progression(fait, total, fichier, erreur):
+    etat = f"❌ {erreur}" if erreur else "ok"
+    print(f"[{fait}/{total}] {os.path.relpath(fichier)} : {etat}", file=sys.stderr, flush=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Traitement par lot des exports CSV de la courbe BAM")
+    parser.add_argument("entrees", nargs="+", help="dossiers, fichiers ou motifs glob de CSV BAM")
+    parser.add_argument("--sortie", required=True, help="dossier des résultats")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--workers", type=int, default=None, help="processus (défaut : nombre de cœurs)")
+    parser.add_argument("--force", action="store_true", help="retraite aussi les fichiers déjà à jour")
+    args = parser.parse_args(argv)
+
+    debut = time.perf_counter()
+    try:
+        bilan = traiter_dossier(args.entrees, args.sortie, args.format, args.workers, args.force,
+                                progression=_afficher_progression)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    print(f"{bilan['traites']} fichier(s) traité(s), {bilan['ignores']} déjà à jour, "
+          f"{len(bilan['erreurs'])} erreur(s) en {time.perf_counter() - debut:.1f} s", file=sys.stderr)
+    return 1 if bilan["erreurs"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.dates import parse_dates
+from src.bootstrap import taux_actuariel_array, bootstrap_zc_array
+from src.io_bam import COLONNES_BAM, taux_en_decimal
+
+COL_DATE = "Date publication"
+
+
+def _normaliser_panel(courbes) -> pd.DataFrame:
+    """
+    Ramène l'entrée du panel à un DataFrame long (une ligne par pilier) avec les colonnes
+    'Date publication', 'Echeance' et 'Taux moyen pondéré'.
+
+    `courbes` peut être un dictionnaire {date de publication: DataFrame BAM brut}, chaque
+    courbe ayant ses propres échéances (panel irrégulier), ou un DataFrame long contenant
+    déjà la colonne 'Date publication'.
+    """
+    if isinstance(courbes, pd.DataFrame):
+        long = courbes.rename(columns=COLONNES_BAM)
+    else:
+        morceaux = []
+        for date_pub, df in courbes.items():
+            df = df.rename(columns=COLONNES_BAM)
+            if "Echeance" not in df.columns or "Taux moyen pondéré" not in df.columns:
+                raise ValueError(f"Colonnes manquantes pour la courbe du {date_pub}")
+            morceaux.append(df[["Echeance", "Taux moyen pondéré"]].assign(**{COL_DATE: date_pub}))
+        if not morceaux:
+            return pd.DataFrame(columns=[COL_DATE, "Echeance", "Taux moyen pondéré"])
+        long = pd.concat(morceaux, ignore_index=True)
+
+    if any(c not in long.columns for c in (COL_DATE, "Echeance", "Taux moyen pondéré")):
+        raise ValueError("Colonnes 'Date publication', 'Echeance' et/ou 'Taux moyen pondéré' introuvables.")
+    return long[[COL_DATE, "Echeance", "Taux moyen pondéré"]]
+
+
+def _traiter_lot(lot: pd.DataFrame):
+    """
+    Traite un lot de courbes en une seule passe : analyse des dates et des taux sur
+    toutes les lignes du lot, conversion actuarielle vectorisée, bootstrap courbe par
+    courbe puis forwards calculés sur les tableaux concaténés.
+    """
+    # Les mêmes échéances reviennent d'une publication à l'autre : une seule analyse par valeur
+    lot = lot.assign(_date=parse_dates(lot["Echeance"]).dt.normalize()).dropna(subset=["_date"])
+
+    base = lot.groupby(COL_DATE, sort=False)["_date"].transform("min")
+    jours = np.maximum((lot["_date"] - base).dt.days.to_numpy(), 1)
+    taux = taux_en_decimal(lot["Taux moyen pondéré"]).to_numpy()
+
+    res = pd.DataFrame({
+        COL_DATE: lot[COL_DATE].to_numpy(),
+        "Date base": base.dt.date.to_numpy(),
+        "Echeance": lot["Echeance"].to_numpy(),
+        "maturite_jours": jours,
+        "maturite_annees": jours / 365,
+        "Taux_decimal": taux,
+    })
+    codes = pd.factorize(res[COL_DATE], sort=True)[0]
+    ordre = np.lexsort((res["maturite_annees"].to_numpy(), codes))
+    res = res.iloc[ordre].reset_index(drop=True)
+    codes = codes[ordre]
+
+    T = res["maturite_annees"].to_numpy()
+    res["Taux_actuariel"] = taux_actuariel_array(T, res["Taux_decimal"])
+    taux = res["Taux_decimal"].to_numpy()
+    zc = np.empty(T.size)
+    bornes = np.flatnonzero(np.diff(codes)) + 1
+    for debut, fin in zip(np.r_[0, bornes], np.r_[bornes, T.size]):
+        zc[debut:fin] = bootstrap_zc_array(T[debut:fin], taux[debut:fin])
+    res["Taux_zero_coupon"] = zc
+
+    # Forwards entre piliers consécutifs d'une même courbe (même règle que taux_forward)
+    valide = (codes[1:] == codes[:-1]) & (np.diff(T) > 1e-6)
+    debut, fin = T[:-1][valide], T[1:][valide]
+    forwards = (zc[1:][valide] * fin - zc[:-1][valide] * debut) / (fin - debut)
+    df_fw = pd.DataFrame({
+        COL_DATE: res[COL_DATE].to_numpy()[:-1][valide],
+        "De (années)": debut,
+        "À (années)": fin,
+        "Taux Forward (%)": forwards * 100
+    })
+    return res, df_fw
+
+
+def process_panel(courbes, max_workers=None, courbes_par_lot=None):
+    """
+    Calcule en lot les taux actuariels, zéro-coupon et forwards d'un historique de courbes BAM.
+
+    Parameters
+    ----------
+    courbes : dict ou pd.DataFrame
+        {date de publication: DataFrame BAM brut} (échéances libres par date), ou DataFrame
+        long avec les colonnes 'Date publication', 'Echeance' et 'Taux moyen pondéré'.
+    max_workers : int, optional
+        Nombre de processus. Par défaut le nombre de cœurs ; 1 pour tout traiter sur place.
+    courbes_par_lot : int, optional
+        Nombre de courbes envoyées à chaque tâche. Par défaut, environ quatre lots par processus.
+
+    Returns
+    -------
+    df : pd.DataFrame
+        Résultats par pilier, triés par date de publication puis maturité.
+    df_fw : pd.DataFrame
+        Taux forwards entre piliers consécutifs, par date de publication.
+    """
+    long = _normaliser_panel(courbes)
+    dates = pd.unique(long[COL_DATE])
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(dates)))
+    if courbes_par_lot is None:
+        courbes_par_lot = max(1, -(-len(dates) // (max_workers * 4)))
+
+    groupes = long.groupby(COL_DATE, sort=True).indices
+    dates = sorted(groupes)
+    lots = [long.iloc[np.concatenate([groupes[d] for d in dates[i:i + courbes_par_lot]])]
+            for i in range(0, len(dates), courbes_par_lot)]
+
+    if max_workers == 1 or len(lots) <= 1:
+        resultats = [_traiter_lot(lot) for lot in lots]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            resultats = list(executor.map(_traiter_lot, lots))
+
+    if not resultats:
+        return _traiter_lot(long)
+    df = pd.concat([r[0] for r in resultats], ignore_index=True)
+    df_fw = pd.concat([r[1] for r in resultats], ignore_index=True)
+    return df, df_fw
@@ -1,9 +1,11 @@
 import pandas as pd
-import numpy as np
-from src.dates import get_base_date, calc_maturite, parse_date_flexible
-from src.bootstrap import taux_actuariel, bootstrap_zc
-from src.interpolation import interpolate_rate
+from src.dates import get_base_date, calc_maturites, parse_date_flexible
+from src.bootstrap import taux_actuariel_array, bootstrap_zc_array
+from src.interpolation import CurveInterpolator
+from src.daily_table import DailyCurveTable
 from src.Forward import taux_forward
+from src.io_bam import taux_en_decimal
+from src.metrics import etape
 
 def process_dataframe(df):
     df.rename(columns={
@@ -15,31 +17,51 @@ def process_dataframe(df):
     if "Echeance" not in df.columns or "Taux moyen pondéré" not in df.columns:
         raise Exception("Colonnes manquantes")
 
-    base_date = get_base_date(df, "Echeance")
-    df["maturite_jours"] = df["Echeance"].apply(lambda s: calc_maturite(s, base_date))
-    df = df.dropna(subset=["maturite_jours"])
-    df["maturite_annees"] = df["maturite_jours"].astype(float) / 365
-    df["Taux_decimal"] = df["Taux moyen pondéré"].str.replace('%', '').str.replace(',', '.').astype(float) / 100
-    df = df.sort_values(by="maturite_annees").reset_index(drop=True)
-
-    df["Taux_actuariel"] = df.apply(lambda r: taux_actuariel(r["maturite_annees"], r["Taux_decimal"]), axis=1)
-    df["Taux_zero_coupon"] = bootstrap_zc(df)
+    with etape("dates"):
+        base_date = get_base_date(df, "Echeance")
+        df["maturite_jours"] = calc_maturites(df["Echeance"], base_date)
+        df = df.dropna(subset=["maturite_jours"])
+        df["maturite_annees"] = df["maturite_jours"].astype(float) / 365
+    with etape("taux"):
+        df["Taux_decimal"] = taux_en_decimal(df["Taux moyen pondéré"])
+        df = df.sort_values(by="maturite_annees").reset_index(drop=True)
+        df["Taux_actuariel"] = taux_actuariel_array(df["maturite_annees"], df["Taux_decimal"])
+    with etape("bootstrap"):
+        df["Taux_zero_coupon"] = bootstrap_zc_array(df["maturite_annees"], df["Taux_decimal"])
 
     # Forwards
-    mats_start, mats_end, forwards = taux_forward(df["maturite_annees"], df["Taux_zero_coupon"])
-    df_fw = pd.DataFrame({
-        "De (années)": mats_start,
-        "À (années)": mats_end,
-        "Taux Forward (%)": forwards * 100
-    })
+    with etape("forwards"):
+        mats_start, mats_end, forwards = taux_forward(df["maturite_annees"], df["Taux_zero_coupon"])
+        df_fw = pd.DataFrame({
+            "De (années)": mats_start,
+            "À (années)": mats_end,
+            "Taux Forward (%)": forwards * 100
+        })
 
     return df, df_fw, base_date
 
 
-def interpolate_user_date(date_str, df, base_date):
+def courbe_zc(df):
+    """Interpolateur de la courbe zéro-coupon, à construire une fois par courbe calculée."""
+    return CurveInterpolator(df["maturite_annees"], df["Taux_zero_coupon"])
+
+
+def table_journaliere(df, base_date):
+    """
+    Table journalière (ZC, actualisation, forward à un jour) d'une courbe calculée par
+    `process_dataframe`, à construire une fois par courbe : une date n'est plus qu'un indice.
+    """
+    return DailyCurveTable.depuis_resultats(df, base_date)
+
+
+def interpolate_user_date(date_str, df, base_date, interpolateur=None, table=None):
     d = parse_date_flexible(date_str).date()
     if d <= base_date:
         raise Exception("La date doit être postérieure à la date de base.")
-    maturite = (d - base_date).days / 365
-    taux = interpolate_rate(df["maturite_annees"], df["Taux_zero_coupon"], np.array([maturite]))[0]
+    jours = (d - base_date).days
+    if table is not None and jours < len(table):
+        return float(table.zc[jours]), d
+    # Au-delà de la dernière échéance (ou sans table) : extrapolation par l'interpolateur
+    interpolateur = interpolateur or courbe_zc(df)
+    taux = float(interpolateur(jours / 365))
     return taux, d
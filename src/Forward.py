@@ -1,4 +1,9 @@
+import re
+
 import numpy as np
+import pandas as pd
+
+from src.interpolation import CurveInterpolator
 
 def taux_forward(maturites, taux_zc):
     """
@@ -37,3 +42,102 @@ def taux_forward(maturites, taux_zc):
 
     forwards = (zc_end * mats_end - zc_start * mats_start) / (mats_end - mats_start)
     return mats_start, mats_end, forwards
+
+
+def formater_forwards(mats_start, mats_end, forwards, decimales: int = 2) -> pd.DataFrame:
+    """
+    Tableau des forwards mis en forme pour l'affichage (texte, `decimales` chiffres),
+    formaté colonne par colonne plutôt que valeur par valeur.
+    """
+    fmt = f"%.{decimales}f"
+    return pd.DataFrame({
+        "De (années)": np.char.mod(fmt, np.asarray(mats_start, dtype=float)),
+        "À (années)": np.char.mod(fmt, np.asarray(mats_end, dtype=float)),
+        "Taux Forward (%)": np.char.mod(fmt, np.asarray(forwards, dtype=float) * 100),
+    })
+
+
+def exporter_forwards(df_fw: pd.DataFrame, format: str = "csv", decimales: int = 4) -> str:
+    """
+    Export CSV (format français : ';' et virgule décimale) ou JSON d'un tableau de forwards.
+    La mise en forme des nombres est faite par les écrivains de pandas, sans boucle Python.
+    """
+    if format == "csv":
+        return df_fw.to_csv(index=False, sep=";", decimal=",", float_format=f"%.{decimales}f")
+    if format == "json":
+        return df_fw.to_json(orient="records", double_precision=decimales, force_ascii=False)
+    raise ValueError(f"Format d'export inconnu : {format} (attendu : csv ou json)")
+
+
+class ForwardEngine:
+    """
+    Taux forwards entre deux maturités quelconques de la courbe zéro-coupon.
+
+    Les forwards sont déduits des facteurs d'actualisation : avec la convention "continu"
+    (DF = exp(-z t), celle de `taux_forward`), f = ln(DF(t1) / DF(t2)) / (t2 - t1) ;
+    avec la convention "actuariel" (DF = (1 + z)^-t), f = (DF(t1) / DF(t2))^(1 / (t2 - t1)) - 1.
+
+    `matrice` calcule toute une grille début × durée en une opération vectorisée ;
+    `paires` et `forward` n'évaluent que les couples demandés.
+    """
+
+    CONVENTIONS = ("continu", "actuariel")
+
+    def __init__(self, maturites, taux_zc, method: str = "linear", convention: str = "continu"):
+        if convention not in self.CONVENTIONS:
+            raise ValueError(f"Convention inconnue : {convention} (attendu : continu ou actuariel)")
+        self.courbe = CurveInterpolator(maturites, taux_zc, method=method)
+        self.convention = convention
+
+    def _log_df(self, t) -> np.ndarray:
+        """-ln DF(t) selon la convention ; vaut 0 en t = 0."""
+        t = np.asarray(t, dtype=float)
+        z = self.courbe(t)
+        return t * z if self.convention == "continu" else t * np.log1p(z)
+
+    def _depuis_log_df(self, g1, g2, t1, t2) -> np.ndarray:
+        duree = t2 - t1
+        if np.any(duree <= 0):
+            raise ValueError("La maturité de fin doit être strictement supérieure à celle de début.")
+        taux = (g2 - g1) / duree
+        return taux if self.convention == "continu" else np.expm1(taux)
+
+    def paires(self, debuts, fins) -> np.ndarray:
+        """Forwards des couples (début, fin) demandés, en années."""
+        t1 = np.asarray(debuts, dtype=float)
+        t2 = np.asarray(fins, dtype=float)
+        return self._depuis_log_df(self._log_df(t1), self._log_df(t2), t1, t2)
+
+    def matrice(self, debuts, durees) -> pd.DataFrame:
+        """
+        Grille des forwards : une ligne par date de début, une colonne par durée (en années).
+        Les facteurs d'actualisation ne sont évalués qu'une fois par maturité distincte.
+        """
+        t1 = np.asarray(debuts, dtype=float)
+        duree = np.asarray(durees, dtype=float)
+        t2 = t1[:, None] + duree[None, :]
+        points, inverse = np.unique(np.concatenate([t1, t2.ravel()]), return_inverse=True)
+        g = self._log_df(points)[inverse]
+        g1, g2 = g[:t1.size], g[t1.size:].reshape(t2.shape)
+        valeurs = self._depuis_log_df(g1[:, None], g2, t1[:, None], t2)
+        return pd.DataFrame(valeurs,
+                            index=pd.Index(t1, name="Début (années)"),
+                            columns=pd.Index(duree, name="Durée (années)"))
+
+    def forward(self, notations):
+        """
+        Forwards en notation de marché, ex : "1y1y", "2y5y", "5y5y" (début puis durée ;
+        suffixes y/a pour années, m pour mois). Accepte une notation ou une liste.
+        """
+        unique = isinstance(notations, str)
+        t1, t2 = [], []
+        for notation in [notations] if unique else notations:
+            morceaux = re.fullmatch(r"\s*(\d+(?:\.\d+)?)([yam])(\d+(?:\.\d+)?)([yam])\s*", notation.lower())
+            if not morceaux:
+                raise ValueError(f"Notation de forward invalide : {notation} (ex : 5y5y)")
+            debut = float(morceaux[1]) / (12 if morceaux[2] == "m" else 1)
+            duree = float(morceaux[3]) / (12 if morceaux[4] == "m" else 1)
+            t1.append(debut)
+            t2.append(debut + duree)
+        valeurs = self.paires(t1, t2)
+        return float(valeurs[0]) if unique else pd.Series(valeurs, index=list(notations))
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+
+import pandas as pd
+
+from src.io_bam import read_bam_csv_safely
+from src.metrics import compter, etape
+
+
+class BamCache:
+    """
+    Cache disque des courbes BAM, indexé par date de publication.
+
+    Pour chaque date, on conserve le CSV brut (`AAAA-MM-JJ.csv`) et le DataFrame analysé
+    (`AAAA-MM-JJ.pkl`). Le CSV brut permet de reconstruire la courbe hors ligne si le
+    DataFrame est absent ou illisible.
+
+    Éviction : les entrées non consultées depuis plus de `max_age` secondes sont supprimées,
+    puis les moins récemment consultées tant que `max_entrees` ou `max_octets` est dépassé.
+    En mode `hors_ligne`, aucun téléchargement n'est tenté : une date absente lève une ValueError.
+    """
+
+    def __init__(self, dossier, max_entrees=None, max_octets=None, max_age=None, hors_ligne=False):
+        self.dossier = dossier
+        self.max_entrees = max_entrees
+        self.max_octets = max_octets
+        self.max_age = max_age
+        self.hors_ligne = hors_ligne
+        self.hits = 0
+        self.misses = 0
+        self._verrou = threading.Lock()
+        os.makedirs(dossier, exist_ok=True)
+
+    def _chemins(self, date_obj):
+        cle = pd.Timestamp(date_obj).strftime("%Y-%m-%d")
+        base = os.path.join(self.dossier, cle)
+        return base + ".csv", base + ".pkl"
+
+    def _compter(self, hit: bool):
+        with self._verrou:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        compter("yield_curve_bam_cache_total", 1, "Consultations du cache des courbes BAM",
+                resultat="hit" if hit else "miss")
+
+    def lire(self, date_obj):
+        """Retourne la courbe en cache pour cette date, ou None si elle est absente."""
+        chemin_csv, chemin_pkl = self._chemins(date_obj)
+        try:
+            df = pd.read_pickle(chemin_pkl)
+        except Exception:
+            # DataFrame absent ou illisible : rejoue l'analyse à partir du CSV brut
+            try:
+                with open(chemin_csv, "rb") as f:
+                    df = read_bam_csv_safely(f.read().decode("utf-8"))
+            except (OSError, ValueError):
+                return None
+            self._ecrire_fichier(chemin_pkl, df.to_pickle)
+        now = time.time()
+        for chemin in (chemin_csv, chemin_pkl):
+            try:
+                os.utime(chemin, (now, now))
+            except OSError:
+                pass
+        return df
+
+    def ecrire(self, date_obj, contenu: bytes, df: pd.DataFrame):
+        """Enregistre le CSV brut et la courbe analysée, puis applique la politique d'éviction."""
+        chemin_csv, chemin_pkl = self._chemins(date_obj)
+
+        def ecrire_brut(chemin):
+            with open(chemin, "wb") as f:
+                f.write(contenu)
+
+        self._ecrire_fichier(chemin_csv, ecrire_brut)
+        self._ecrire_fichier(chemin_pkl, df.to_pickle)
+        self.evincer()
+
+    @staticmethod
+    def _ecrire_fichier(chemin, ecrire):
+        # Écriture atomique : plusieurs workers peuvent remplir le cache en parallèle
+        tmp = f"{chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+        ecrire(tmp)
+        os.replace(tmp, chemin)
+
+    def charger(self, date_obj, telecharger) -> pd.DataFrame:
+        """
+        Retourne la courbe du cache ou, à défaut, la télécharge via `telecharger(date_obj)`
+        (qui renvoie le CSV brut en octets) et l'enregistre.
+        """
+        with etape("lecture_cache"):
+            df = self.lire(date_obj)
+        if df is not None:
+            self._compter(True)
+            return df
+        self._compter(False)
+
+        if self.hors_ligne:
+            raise ValueError(f"Mode hors ligne : aucune courbe en cache pour le {pd.Timestamp(date_obj):%d/%m/%Y}.")
+        contenu = telecharger(date_obj)
+        try:
+            df = read_bam_csv_safely(contenu.decode("utf-8"))
+        except Exception as e:
+            raise ValueError(f"Une erreur est survenue lors du traitement des données BAM : {e}")
+        self.ecrire(date_obj, contenu, df)
+        return df
+
+    def entrees(self):
+        """Liste des entrées (date, octets, dernier accès), de la plus ancienne à la plus récente."""
+        entrees = []
+        for nom in os.listdir(self.dossier):
+            if not nom.endswith(".csv"):
+                continue
+            cle = nom[:-4]
+            taille, acces = 0, 0.0
+            for ext in (".csv", ".pkl"):
+                try:
+                    st = os.stat(os.path.join(self.dossier, cle + ext))
+                except OSError:
+                    continue
+                taille += st.st_size
+                acces = max(acces, st.st_mtime)
+            entrees.append((cle, taille, acces))
+        return sorted(entrees, key=lambda e: e[2])
+
+    def supprimer(self, cle: str):
+        for ext in (".csv", ".pkl"):
+            try:
+                os.remove(os.path.join(self.dossier, cle + ext))
+            except OSError:
+                pass
+
+    def evincer(self):
+        """Applique les limites d'âge, de nombre d'entrées et de taille totale."""
+        entrees = self.entrees()
+        if self.max_age is not None:
+            limite = time.time() - self.max_age
+            for cle, _, acces in [e for e in entrees if e[2] < limite]:
+                self.supprimer(cle)
+            entrees = [e for e in entrees if e[2] >= limite]
+
+        total = sum(e[1] for e in entrees)
+        while entrees and ((self.max_entrees is not None and len(entrees) > self.max_entrees)
+                           or (self.max_octets is not None and total > self.max_octets)):
+            cle, taille, _ = entrees.pop(0)
+            self.supprimer(cle)
+            total -= taille
+
+    def stats(self) -> dict:
+        entrees = self.entrees()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entrees": len(entrees),
+            "octets": sum(e[1] for e in entrees),
+        }
+
+
+_cache_defaut = None
+
+
+def cache_par_defaut() -> BamCache:
+    """
+    Cache partagé par les applications, configuré par variables d'environnement :
+      - BAM_CACHE_DIR : dossier du cache (défaut : ~/.cache/yield-curve/bam)
+      - BAM_CACHE_MAX_ENTREES, BAM_CACHE_MAX_MO, BAM_CACHE_MAX_JOURS : limites d'éviction
+      - BAM_HORS_LIGNE=1 : ne jamais télécharger, servir uniquement le cache
+    """
+    global _cache_defaut
+    if _cache_defaut is None:
+        env = os.environ
+        dossier = env.get("BAM_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "yield-curve", "bam")
+        max_mo = env.get("BAM_CACHE_MAX_MO")
+        max_jours = env.get("BAM_CACHE_MAX_JOURS")
+        _cache_defaut = BamCache(
+            dossier,
+            max_entrees=int(env["BAM_CACHE_MAX_ENTREES"]) if env.get("BAM_CACHE_MAX_ENTREES") else None,
+            max_octets=int(float(max_mo) * 1024 * 1024) if max_mo else None,
+            max_age=float(max_jours) * 86400 if max_jours else None,
+            hors_ligne=env.get("BAM_HORS_LIGNE", "") in ("1", "true", "oui"),
+        )
+    return _cache_defaut
@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, timedelta
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.io_bam import telecharger_bam_csv, read_bam_csv_safely
+
+# Jours fériés civils marocains (mois, jour). Les fêtes religieuses, dont la date
+# dépend du calendrier lunaire, sont à passer explicitement via `feries`.
+FERIES_FIXES = {
+    (1, 1), (1, 11), (1, 14), (5, 1), (7, 30), (8, 14), (8, 20), (8, 21), (11, 6), (11, 18),
+}
+
+
+def jours_ouvres(debut, fin, feries=()):
+    """
+    Dates de publication possibles entre `debut` et `fin` inclus : hors week-ends,
+    jours fériés fixes et dates listées dans `feries`.
+    """
+    debut, fin = pd.Timestamp(debut).date(), pd.Timestamp(fin).date()
+    feries = {pd.Timestamp(d).date() for d in feries}
+    jours = []
+    d = debut
+    while d <= fin:
+        if d.weekday() < 5 and (d.month, d.day) not in FERIES_FIXES and d not in feries:
+            jours.append(d)
+        d += timedelta(days=1)
+    return jours
+
+
+class LimiteurDebit:
+    """Seau à jetons partagé entre threads : au plus `requetes_par_seconde` requêtes par seconde."""
+
+    def __init__(self, requetes_par_seconde: float):
+        self.intervalle = 1.0 / requetes_par_seconde if requetes_par_seconde else 0.0
+        self._prochain = time.monotonic()
+        self._verrou = threading.Lock()
+
+    def attendre(self):
+        if not self.intervalle:
+            return
+        with self._verrou:
+            maintenant = time.monotonic()
+            depart = max(self._prochain, maintenant)
+            self._prochain = depart + self.intervalle
+        if depart > maintenant:
+            time.sleep(depart - maintenant)
+
+
+def _reessayable(erreur: ValueError) -> bool:
+    """Erreurs réseau et réponses 429/5xx : on réessaie. Absence de données : non."""
+    cause = erreur.__cause__
+    if isinstance(cause, requests.HTTPError):
+        code = cause.response.status_code if cause.response is not None else 0
+        return code == 429 or code >= 500
+    return isinstance(cause, requests.RequestException)
+
+
+def _nouvelle_session(taille_pool: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=taille_pool)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def telecharger_historique(debut, fin, max_workers=8, requetes_par_seconde=5.0, tentatives=3,
+                           backoff=0.5, feries=(), cache=None, timeout=30, url_base=None):
+    """
+    Télécharge en parallèle les courbes BAM publiées entre `debut` et `fin`.
+
+    Les requêtes partagent une même session HTTP (connexions réutilisées), sont limitées
+    à `requetes_par_seconde` et réessayées jusqu'à `tentatives` fois avec un délai
+    exponentiel (`backoff`, 2*`backoff`, ...). Les week-ends et jours fériés sont ignorés.
+    Si un `BamCache` est fourni, les dates déjà en cache ne sont pas retéléchargées.
+
+    Générateur : produit `(date, df, erreur)` au fur et à mesure que les courbes arrivent
+    (ordre d'arrivée, pas ordre chronologique). `df` vaut None en cas d'erreur.
+    """
+    dates = jours_ouvres(debut, fin, feries)
+    limiteur = LimiteurDebit(requetes_par_seconde)
+    session = _nouvelle_session(max_workers)
+
+    def telecharger(d: date) -> bytes:
+        for tentative in range(tentatives):
+            limiteur.attendre()
+            try:
+                return telecharger_bam_csv(d, session=session, timeout=timeout, url_base=url_base)
+            except ValueError as e:
+                if not _reessayable(e) or tentative == tentatives - 1:
+                    raise
+            time.sleep(backoff * 2 ** tentative)
+
+    def tache(d: date) -> pd.DataFrame:
+        if cache:
+            return cache.charger(d, telecharger)
+        return read_bam_csv_safely(telecharger(d).decode("utf-8"))
+
+    restantes = iter(dates)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Nombre borné de tâches en vol : les longues plages ne sont pas toutes soumises d'un coup
+            en_cours = {}
+            for d in restantes:
+                en_cours[executor.submit(tache, d)] = d
+                if len(en_cours) >= 2 * max_workers:
+                    break
+            while en_cours:
+                finies, _ = wait(en_cours, return_when=FIRST_COMPLETED)
+                for future in finies:
+                    d = en_cours.pop(future)
+                    try:
+                        yield d, future.result(), None
+                    except Exception as e:
+                        yield d, None, e
+                    suivante = next(restantes, None)
+                    if suivante is not None:
+                        en_cours[executor.submit(tache, suivante)] = suivante
+    finally:
+        session.close()
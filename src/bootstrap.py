@@ -14,46 +14,233 @@ def taux_actuariel(T: float, t: float) -> float:
     return t
 
 
+def taux_actuariel_array(maturites, taux) -> np.ndarray:
+    """
+    Version vectorisée de `taux_actuariel` : accepte des tableaux de maturités (en années)
+    et de taux moyens pondérés (en décimal) de même forme, ou diffusables entre eux.
+    """
+    T = np.asarray(maturites, dtype=float)
+    t = np.asarray(taux, dtype=float)
+    if np.any(T <= 0):
+        raise ValueError("La maturité T doit être strictement positive.")
+    T, t = np.broadcast_arrays(T, t)
+    court = T < 1.0
+    r = t.astype(float, copy=True)
+    r[court] = (1 + t[court] * T[court]) ** (1 / T[court]) - 1
+    return r
+
+
+def _sommes_repli(T: np.ndarray, r: np.ndarray, debut: int = 0) -> np.ndarray:
+    """
+    Somme de repli de chaque pilier : coupons des années 1..floor(T) sans ZC disponible,
+    actualisés au taux actuariel r du pilier. `r` est de forme (n,) ou (scénarios, n).
+
+    Les maturités étant triées, l'ensemble des années sans pilier est connu dès le départ :
+    toutes les sommes sont calculées en une passe vectorisée (à partir du pilier `debut`).
+    """
+    cles = np.rint(T).astype(np.int64)
+    annees = np.floor(T).astype(np.int64)
+    cle_prec = np.concatenate(([0], cles[:-1]))
+
+    longs = np.flatnonzero(T[debut:] > 1) + debut
+    repli = np.zeros(r.shape)
+    if longs.size:
+        K = int(annees[longs].max())
+        k = np.arange(1, K + 1)
+        presentes = np.zeros(K + 1, dtype=bool)
+        cles_valides = cles[(cles >= 1) & (cles <= K)]
+        presentes[cles_valides] = True
+        manquantes = (k <= annees[longs, None]) & ~(presentes[k] & (k <= cle_prec[longs, None]))
+        x = 1.0 / (1.0 + r[..., longs])
+        repli[..., longs] = np.where(manquantes, x[..., None] ** k, 0.0).sum(axis=-1)
+    return repli
+
+
+def _bootstrap_trie(T: np.ndarray, r: np.ndarray, debut: int = 0, zc=None) -> np.ndarray:
+    """
+    Cœur du bootstrap sur des maturités triées (ordre croissant) et des taux actuariels.
+
+    Reproduit la logique historique de `bootstrap_zc` : chaque ZC est indexé par sa maturité
+    arrondie à l'année, et les coupons d'années sans pilier sont actualisés au taux
+    actuariel de la ligne courante. Comme les maturités sont triées :
+      - les années déjà « closes » (clé < clé de la ligne précédente) ont une valeur définitive,
+        dont la somme actualisée est tenue de façon cumulative ;
+      - seule l'année de la ligne précédente peut encore être réécrite ;
+      - les sommes de repli sont précalculées par `_sommes_repli`.
+
+    Avec `debut` > 0, seuls les piliers à partir de `debut` sont recalculés : les ZC des
+    piliers précédents sont lus dans `zc` (qui est complété et retourné) et l'état de la
+    récurrence est reconstitué à partir d'eux.
+    """
+    n = T.size
+    cles = np.rint(T).astype(np.int64)
+    annees = np.floor(T).astype(np.int64)
+    repli = _sommes_repli(T, r, debut)
+
+    cumul = 0.0        # somme actualisée des années closes (clé < cle_cour)
+    cle_cour = 0       # dernière clé écrite
+    actu_cour = 0.0    # facteur d'actualisation de la dernière clé écrite
+    if debut > 0:
+        cles_p, zc_p = cles[:debut], zc[:debut]
+        cle_cour = int(cles_p[-1])
+        actu_cour = (1 + zc_p[-1]) ** (-cle_cour)
+        # Dernier pilier de chaque année close : c'est sa valeur qui est retenue
+        closes = np.r_[cles_p[1:] != cles_p[:-1], True] & (cles_p >= 1) & (cles_p < cle_cour)
+        cumul = float(np.sum((1 + zc_p[closes]) ** (-cles_p[closes])))
+    else:
+        zc = np.empty(n)
+
+    for i, (Ti, ri, ni, ci, si) in enumerate(zip(T[debut:].tolist(), r[debut:].tolist(),
+                                                 annees[debut:].tolist(), cles[debut:].tolist(),
+                                                 repli[debut:].tolist()), start=debut):
+        if Ti <= 1:
+            z = ri
+        else:
+            connus = cumul + (actu_cour if 1 <= cle_cour <= ni else 0.0)
+            denom = 1 - ri * (connus + si)
+            z = ri if denom <= 0 else ((1 + ri) / denom) ** (1 / Ti) - 1
+        if ci != cle_cour:
+            if cle_cour >= 1:
+                cumul += actu_cour
+            cle_cour = ci
+        actu_cour = (1 + z) ** (-ci)
+        zc[i] = z
+    return zc
+
+
+def _bootstrap_trie_matrice(T: np.ndarray, R: np.ndarray) -> np.ndarray:
+    """
+    Même récurrence que `_bootstrap_trie`, menée simultanément sur tous les scénarios :
+    `R` est une matrice (scénarios, piliers) de taux actuariels, chaque pas de la boucle
+    sur les piliers traite une colonne entière.
+    """
+    cles = np.rint(T).astype(np.int64)
+    annees = np.floor(T).astype(np.int64)
+    repli = _sommes_repli(T, R)
+
+    zc = np.empty(R.shape)
+    cumul = np.zeros(R.shape[0])
+    cle_cour = 0
+    actu_cour = np.zeros(R.shape[0])
+    for i in range(T.size):
+        ri = R[:, i]
+        if T[i] <= 1:
+            z = ri
+        else:
+            connus = cumul + actu_cour if 1 <= cle_cour <= annees[i] else cumul
+            denom = 1 - ri * (connus + repli[:, i])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                z = np.where(denom <= 0, ri, ((1 + ri) / denom) ** (1 / T[i]) - 1)
+        if cles[i] != cle_cour:
+            if cle_cour >= 1:
+                cumul = cumul + actu_cour
+            cle_cour = cles[i]
+        actu_cour = (1 + z) ** (-cle_cour)
+        zc[:, i] = z
+    return zc
+
+
+def bootstrap_zc_array(maturites, taux) -> np.ndarray:
+    """
+    Moteur de bootstrap zéro-coupon sur tableaux NumPy.
+
+    Parameters
+    ----------
+    maturites : array-like
+        Maturités en années (> 0), triées en ordre croissant.
+    taux : array-like
+        Taux moyens pondérés en décimal (ex : 0.025 pour 2.5%).
+
+    Returns
+    -------
+    np.ndarray
+        Taux zéro-coupon, dans l'ordre des maturités fournies.
+    """
+    T = np.asarray(maturites, dtype=float)
+    t = np.asarray(taux, dtype=float)
+    if T.shape != t.shape or T.ndim != 1:
+        raise ValueError("Les maturités et les taux doivent être des vecteurs de même longueur.")
+    if T.size == 0:
+        return np.empty(0)
+    if np.any(T <= 0):
+        raise ValueError("Maturité non valide (≤ 0) détectée.")
+    if np.any(np.diff(T) < 0):
+        raise ValueError("Les maturités doivent être triées par ordre croissant.")
+    return _bootstrap_trie(T, taux_actuariel_array(T, t))
+
+
+def bootstrap_zc_queue(maturites, taux, zc, debut: int) -> np.ndarray:
+    """
+    Recalcule les taux zéro-coupon à partir du pilier `debut` seulement.
+
+    Le ZC d'une maturité ne dépend que des piliers de maturité inférieure : après une
+    modification, un ajout ou une suppression au rang `debut`, les valeurs de `zc` avant
+    ce rang restent valides. `zc` (de même longueur que `maturites`) est complété sur place
+    et retourné ; `taux` sont les taux moyens pondérés en décimal.
+    """
+    T = np.asarray(maturites, dtype=float)
+    t = np.asarray(taux, dtype=float)
+    if debut <= 0:
+        zc[:] = bootstrap_zc_array(T, t)
+        return zc
+    if debut >= T.size:
+        return zc
+    r = np.empty(T.size)
+    r[debut:] = taux_actuariel_array(T[debut:], t[debut:])
+    return _bootstrap_trie(T, r, debut, zc)
+
+
+def bootstrap_zc_matrice(maturites, taux) -> np.ndarray:
+    """
+    Bootstrap de plusieurs jeux de taux sur les mêmes piliers (scénarios de choc, bumps).
+
+    Parameters
+    ----------
+    maturites : array-like
+        Maturités en années (> 0), triées en ordre croissant, de longueur n.
+    taux : array-like
+        Matrice (scénarios, n) de taux moyens pondérés en décimal.
+
+    Returns
+    -------
+    np.ndarray
+        Matrice (scénarios, n) des taux zéro-coupon ; la ligne s est égale à
+        `bootstrap_zc_array(maturites, taux[s])`.
+    """
+    T = np.asarray(maturites, dtype=float)
+    t = np.atleast_2d(np.asarray(taux, dtype=float))
+    if T.ndim != 1 or t.ndim != 2 or t.shape[1] != T.size:
+        raise ValueError("Les taux doivent former une matrice (scénarios, nombre de maturités).")
+    if np.any(T <= 0):
+        raise ValueError("Maturité non valide (≤ 0) détectée.")
+    if np.any(np.diff(T) < 0):
+        raise ValueError("Les maturités doivent être triées par ordre croissant.")
+    if T.size == 0:
+        return np.empty(t.shape)
+    return _bootstrap_trie_matrice(T, taux_actuariel_array(T, t))
+
+
 def bootstrap_zc(df: pd.DataFrame) -> pd.Series:
     """
     Calcule les taux zéro-coupon par bootstrap à partir d'un DataFrame contenant :
-      - 'maturite_en_ans' : maturité en années (doit être > 0)
+      - 'maturite_annees' : maturité en années (doit être > 0)
       - 'Taux_decimal' : taux moyen pondéré en décimal (ex : 0.025 pour 2.5%)
-    
-    Retourne une Series de taux zéro-coupon.
-    """
-    zc_dict = {}
-    zc_list = []
-
-    for idx, row in df.iterrows():
-        T = row["maturite_annees"]
-        if T <= 0:
-            raise ValueError(f"Maturité non valide (≤ 0) détectée à l'index {idx} : {T}")
-        
-        r = taux_actuariel(T, row["Taux_decimal"])
-        C = r  # coupon annuel supposé égal au taux actuariel
-        
-        if T <= 1:
-            # Cas échéance courte, taux ZC égal taux actuariel
-            zc = r
-        else:
-            # Somme actualisée des coupons précédents
-            s = 0.0
-            for k in range(1, int(np.floor(T)) + 1):
-                prev_zc = zc_dict.get(k)
-                if prev_zc is None:
-                    # Si pas encore calculé, fallback au taux actuariel
-                    prev_zc = r
-                s += C / (1 + prev_zc) ** k
-
-            denom = 1 - s
-            if denom <= 0:
-                # Protection contre division par zéro ou négative
-                zc = r
-            else:
-                zc = ((1 + C) / denom) ** (1 / T) - 1
-
-        zc_dict[int(round(T))] = zc
-        zc_list.append(zc)
-
-    return pd.Series(zc_list, index=df.index)
+
+    Retourne une Series de taux zéro-coupon, alignée sur l'index de `df`.
+
+    Les lignes sont traitées par maturité croissante (tri stable) via `bootstrap_zc_array`.
+    Sur des maturités déjà triées (sortie de `process_dataframe`), le résultat est celui de
+    l'ancienne boucle ligne à ligne. Sur une entrée non triée, il diffère : l'ancienne boucle
+    suivait l'ordre des lignes, si bien qu'un pilier long traité avant un pilier court
+    servait au bootstrap de ce dernier ; chaque ZC ne dépend plus que des piliers plus courts.
+    """
+    T = df["maturite_annees"].to_numpy(dtype=float)
+    invalides = np.flatnonzero(~(T > 0))
+    if invalides.size:
+        i = invalides[0]
+        raise ValueError(f"Maturité non valide (≤ 0) détectée à l'index {df.index[i]} : {T[i]}")
+
+    ordre = np.argsort(T, kind="stable")
+    zc = np.empty(T.size)
+    zc[ordre] = bootstrap_zc_array(T[ordre], df["Taux_decimal"].to_numpy(dtype=float)[ordre])
+    return pd.Series(zc, index=df.index)
@@ -0,0 +1,234 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.interpolation import CurveInterpolator
+from src.sensitivities import KEY_RATES
+
+COL_DATE = "Date publication"
+COLONNES_PILIERS = ("maturite_annees", "Taux_decimal", "Taux_actuariel", "Taux_zero_coupon", "Forward")
+
+
+class CurveStore:
+    """
+    Historique de courbes bootstrappées, stocké par colonnes dans un dossier et relu en
+    mémoire partagée (`np.memmap`) : une requête ne lit que les colonnes et les lignes utiles.
+
+    Organisation du dossier :
+      - meta.json : ténors de la grille et nombres de dates / de piliers écrits ;
+      - dates.i8, debuts.i8 : dates de publication (jours depuis 1970, croissantes) et rang
+        du premier pilier de chaque date (index par date) ;
+      - piliers/<colonne>.f8 : une valeur par pilier (maturité, taux BAM, actuariel, ZC,
+        forward du pilier précédent à celui-ci), les piliers d'une date étant contigus ;
+      - grille/zc_<ténor>.f8 : ZC interpolé à chaque ténor de la grille, une valeur par date
+        (index par ténor : une série « ZC 10 ans » est un seul fichier lu sur une plage).
+
+    Les fichiers binaires sont complétés en mode ajout, puis meta.json est remplacé de façon
+    atomique : un ajout interrompu laisse des octets au-delà des compteurs, ignorés à la
+    lecture et tronqués au prochain ajout.
+    """
+
+    def __init__(self, dossier: str, tenors=KEY_RATES):
+        self.dossier = dossier
+        chemin_meta = os.path.join(dossier, "meta.json")
+        if os.path.exists(chemin_meta):
+            with open(chemin_meta, encoding="utf-8") as f:
+                self.meta = json.load(f)
+        else:
+            os.makedirs(os.path.join(dossier, "piliers"), exist_ok=True)
+            os.makedirs(os.path.join(dossier, "grille"), exist_ok=True)
+            self.meta = {"version": 1, "tenors": [float(t) for t in tenors], "n_dates": 0, "n_piliers": 0}
+            self._ecrire_meta()
+        self.tenors = np.array(self.meta["tenors"], dtype=float)
+
+    # ------------------------------------------------------------------ fichiers
+    def _chemin(self, nom: str) -> str:
+        return os.path.join(self.dossier, nom)
+
+    def _fichiers(self):
+        """(fichier, dtype, compteur) de toutes les colonnes."""
+        yield "dates.i8", np.int64, "n_dates"
+        yield "debuts.i8", np.int64, "n_dates"
+        for colonne in COLONNES_PILIERS:
+            yield f"piliers/{colonne}.f8", np.float64, "n_piliers"
+        for tenor in self.tenors:
+            yield f"grille/zc_{tenor:g}.f8", np.float64, "n_dates"
+
+    def _lire(self, nom: str, dtype, debut: int = 0, fin=None) -> np.ndarray:
+        compte = self.meta["n_piliers" if nom.startswith("piliers/") else "n_dates"]
+        fin = compte if fin is None else min(fin, compte)
+        if fin <= debut:
+            return np.empty(0, dtype=dtype)
+        # Seule la plage demandée est projetée en mémoire
+        return np.memmap(self._chemin(nom), dtype=dtype, mode="r", offset=debut * np.dtype(dtype).itemsize,
+                         shape=(fin - debut,))
+
+    def _ecrire_meta(self):
+        tmp = self._chemin(f"meta.json.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self._chemin("meta.json"))
+
+    # ------------------------------------------------------------------ écriture
+    def ajouter(self, date_pub, df: pd.DataFrame):
+        """Ajoute la courbe d'une date (sortie de `process_dataframe`)."""
+        self.ajouter_panel(df.assign(**{COL_DATE: date_pub}))
+
+    def ajouter_panel(self, panel: pd.DataFrame):
+        """
+        Ajoute en une fois plusieurs dates (sortie long format de `process_panel`). Les dates
+        doivent être postérieures à la dernière date déjà stockée.
+        """
+        jours_pub = np.asarray(pd.to_datetime(panel[COL_DATE]), dtype="datetime64[D]").astype(np.int64)
+        T = panel["maturite_annees"].to_numpy(dtype=float)
+        ordre = np.lexsort((T, jours_pub))
+        jours_pub, T = jours_pub[ordre], T[ordre]
+        zc = panel["Taux_zero_coupon"].to_numpy(dtype=float)[ordre]
+
+        dates, debuts = np.unique(jours_pub, return_index=True)
+        if dates.size == 0:
+            return
+        if self.meta["n_dates"] and dates[0] <= self._lire("dates.i8", np.int64)[-1]:
+            raise ValueError("Les dates ajoutées doivent être postérieures à la dernière date du store.")
+
+        # Forward du pilier précédent à chaque pilier d'une même date (même règle que taux_forward)
+        forward = np.full(T.size, np.nan)
+        meme_date = jours_pub[1:] == jours_pub[:-1]
+        ecart = np.diff(T)
+        valide = meme_date & (ecart > 1e-6)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fw = (zc[1:] * T[1:] - zc[:-1] * T[:-1]) / ecart
+        forward[1:][valide] = fw[valide]
+
+        fins = np.r_[debuts[1:], T.size]
+        grille = np.array([_grille(T[d:f], zc[d:f], self.tenors) for d, f in zip(debuts, fins)])
+
+        colonnes = {
+            "dates.i8": dates,
+            "debuts.i8": debuts + self.meta["n_piliers"],
+            "piliers/Forward.f8": forward,
+        }
+        for colonne in COLONNES_PILIERS[:-1]:
+            colonnes[f"piliers/{colonne}.f8"] = panel[colonne].to_numpy(dtype=float)[ordre]
+        for j, tenor in enumerate(self.tenors):
+            colonnes[f"grille/zc_{tenor:g}.f8"] = grille[:, j]
+
+        for nom, dtype, compteur in self._fichiers():
+            chemin = self._chemin(nom)
+            with open(chemin, "ab") as f:
+                f.truncate(self.meta[compteur] * np.dtype(dtype).itemsize)  # reste d'un ajout interrompu
+                f.write(np.ascontiguousarray(colonnes[nom], dtype=dtype).tobytes())
+        self.meta["n_dates"] += int(dates.size)
+        self.meta["n_piliers"] += int(T.size)
+        self._ecrire_meta()
+
+    # ------------------------------------------------------------------ lecture
+    def __len__(self):
+        return self.meta["n_dates"]
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._lire("dates.i8", np.int64).astype("datetime64[D]"))
+
+    def _plage_dates(self, debut=None, fin=None):
+        """Rangs [i0, i1) des dates de publication comprises entre `debut` et `fin` (inclus)."""
+        dates = self._lire("dates.i8", np.int64)
+        i0 = 0 if debut is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(debut).date(), "D").astype(np.int64)))
+        i1 = dates.size if fin is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(fin).date(), "D").astype(np.int64), side="right"))
+        return i0, max(i0, i1), dates[i0:i1]
+
+    def _bornes_piliers(self, i0: int, i1: int) -> np.ndarray:
+        """Rangs des piliers de début de chaque date de [i0, i1), plus la fin du dernier."""
+        debuts = self._lire("debuts.i8", np.int64, i0, i1 + 1)
+        fin = debuts[-1] if i1 < self.meta["n_dates"] else self.meta["n_piliers"]
+        return np.r_[debuts[:i1 - i0], fin]
+
+    def plage(self, debut=None, fin=None, colonnes=COLONNES_PILIERS) -> pd.DataFrame:
+        """Piliers des dates de publication entre `debut` et `fin`, colonnes demandées uniquement."""
+        i0, i1, dates = self._plage_dates(debut, fin)
+        if i1 == i0:
+            # Mêmes colonnes et types qu'une plage non vide (schéma des exports conservé)
+            return pd.DataFrame({COL_DATE: np.empty(0, dtype="datetime64[D]"),
+                                 **{colonne: np.empty(0) for colonne in colonnes}})
+        bornes = self._bornes_piliers(i0, i1)
+        p0, p1 = int(bornes[0]), int(bornes[-1])
+        res = {COL_DATE: np.repeat(dates.astype("datetime64[D]"), np.diff(bornes))}
+        for colonne in colonnes:
+            res[colonne] = np.array(self._lire(f"piliers/{colonne}.f8", np.float64, p0, p1))
+        return pd.DataFrame(res)
+
+    def blocs(self, debut=None, fin=None, colonnes=COLONNES_PILIERS, dates_par_bloc: int = 250):
+        """
+        Piliers des dates entre `debut` et `fin`, par blocs de `dates_par_bloc` dates : un export
+        de l'historique (`src.exports.flux_export`) ne charge qu'un bloc à la fois. Une plage
+        vide produit un seul bloc vide, qui porte les colonnes.
+        """
+        i0, i1, dates = self._plage_dates(debut, fin)
+        if i1 == i0:
+            yield self.plage(debut, fin, colonnes)
+        for d in range(0, i1 - i0, dates_par_bloc):
+            premiere, derniere = dates[d], dates[min(d + dates_par_bloc, i1 - i0) - 1]
+            yield self.plage(premiere.astype("datetime64[D]"), derniere.astype("datetime64[D]"), colonnes)
+
+    def courbe(self, date_pub) -> pd.DataFrame:
+        """Piliers d'une date de publication."""
+        df = self.plage(date_pub, date_pub)
+        if df.empty:
+            raise KeyError(f"Aucune courbe stockée pour le {pd.Timestamp(date_pub):%d/%m/%Y}.")
+        return df.drop(columns=COL_DATE)
+
+    def serie(self, tenor: float, debut=None, fin=None, colonne: str = "Taux_zero_coupon") -> pd.Series:
+        """
+        Série temporelle d'un taux à maturité constante (ex : ZC 10 ans de 2015 à aujourd'hui).
+
+        Pour le ZC à un ténor de la grille, seule la plage utile du fichier de ce ténor est lue.
+        Sinon, la colonne est interpolée linéairement dans les piliers de chaque date, lus sur
+        la seule plage de dates demandée.
+        """
+        i0, i1, dates = self._plage_dates(debut, fin)
+        index = pd.DatetimeIndex(dates.astype("datetime64[D]"), name=COL_DATE)
+        nom = f"{colonne} {tenor:g} ans"
+        if i1 == i0:
+            return pd.Series([], index=index, name=nom, dtype=float)
+
+        sur_grille = np.flatnonzero(np.isclose(self.tenors, tenor))
+        if colonne == "Taux_zero_coupon" and sur_grille.size:
+            valeurs = np.array(self._lire(f"grille/zc_{self.tenors[sur_grille[0]]:g}.f8", np.float64, i0, i1))
+            return pd.Series(valeurs, index=index, name=nom)
+
+        bornes = self._bornes_piliers(i0, i1)
+        p0, p1 = int(bornes[0]), int(bornes[-1])
+        T = self._lire("piliers/maturite_annees.f8", np.float64, p0, p1)
+        y = np.array(self._lire(f"piliers/{colonne}.f8", np.float64, p0, p1))
+        return pd.Series(_interpoler_segments(T, y, bornes - p0, tenor), index=index, name=nom)
+
+
+def _grille(T: np.ndarray, zc: np.ndarray, tenors: np.ndarray) -> np.ndarray:
+    """ZC d'une date aux ténors de la grille ; une date à un seul pilier donne une courbe plate."""
+    if np.unique(T).size < 2:
+        return np.full(tenors.size, zc[-1])  # même valeur que `serie` hors grille
+    return CurveInterpolator(T, zc)(tenors)
+
+
+def _interpoler_segments(T: np.ndarray, y: np.ndarray, bornes: np.ndarray, tenor: float) -> np.ndarray:
+    """
+    Interpolation linéaire (extrapolée aux bords) à la maturité `tenor` dans chaque segment
+    [bornes[k], bornes[k+1]) de maturités croissantes, en une passe vectorisée : les
+    segments sont mis bout à bout par une clé (rang du segment, maturité).
+    """
+    n = bornes.size - 1
+    segment = np.repeat(np.arange(n), np.diff(bornes))
+    echelle = float(np.nanmax(T)) + abs(tenor) + 1.0 if T.size else 1.0
+    cles = segment * echelle + T
+    debut, fin = bornes[:-1], bornes[1:]
+    j = np.searchsorted(cles, np.arange(n) * echelle + tenor, side="right") - 1
+    j = np.clip(j, debut, np.maximum(fin - 2, debut))
+    k = np.minimum(j + 1, fin - 1)
+    dx = T[k] - T[j]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w = np.where(dx > 0, (tenor - T[j]) / dx, 0.0)
+    resultat = y[j] * (1 - w) + y[k] * w
+    resultat[fin == debut] = np.nan
+    return resultat
@@ -0,0 +1,93 @@
+import json
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.interpolation import CurveInterpolator
+
+
+class DailyCurveTable:
+    """
+    Table journalière précalculée d'une courbe : taux ZC, facteurs d'actualisation et
+    forwards à un jour pour chaque jour calendaire entre la date de base et la dernière
+    échéance (~11 000 lignes pour 30 ans).
+
+    Une requête sur une date n'est plus qu'un accès par indice (décalage en jours).
+    Les trois séries sont les lignes d'un tableau (3, n) contigu, enregistrable en `.npy`
+    et relu en mémoire partagée (`np.load(..., mmap_mode="r")`) par d'autres processus.
+    """
+
+    ZC, DF, FWD = 0, 1, 2
+
+    def __init__(self, base_date: date, valeurs: np.ndarray, jours_par_an: float = 365):
+        self.base_date = base_date
+        self.valeurs = valeurs
+        self.jours_par_an = jours_par_an
+
+    @classmethod
+    def depuis_resultats(cls, df: pd.DataFrame, base_date: date, jours_par_an: float = 365,
+                         method: str = "linear"):
+        """
+        Construit la table à partir de la sortie de `process_dataframe`
+        (colonnes 'maturite_annees' et 'Taux_zero_coupon').
+        """
+        courbe = CurveInterpolator(df["maturite_annees"], df["Taux_zero_coupon"], method=method)
+        dernier_jour = int(np.ceil(df["maturite_annees"].max() * jours_par_an))
+        t = np.arange(dernier_jour + 1) / jours_par_an
+
+        valeurs = np.empty((3, t.size))
+        valeurs[cls.ZC] = courbe(t)
+        valeurs[cls.DF] = (1 + valeurs[cls.ZC]) ** -t
+        # Forward actuariel sur [j, j+1] ; le dernier jour reprend la valeur précédente
+        valeurs[cls.FWD, :-1] = (valeurs[cls.DF, :-1] / valeurs[cls.DF, 1:]) ** jours_par_an - 1
+        valeurs[cls.FWD, -1] = valeurs[cls.FWD, -2] if t.size > 1 else valeurs[cls.ZC, -1]
+        return cls(base_date, valeurs, jours_par_an)
+
+    @property
+    def zc(self) -> np.ndarray:
+        return self.valeurs[self.ZC]
+
+    @property
+    def discount(self) -> np.ndarray:
+        return self.valeurs[self.DF]
+
+    @property
+    def forward_1j(self) -> np.ndarray:
+        return self.valeurs[self.FWD]
+
+    def __len__(self):
+        return self.valeurs.shape[1]
+
+    def indices(self, dates) -> np.ndarray:
+        """Décalages en jours depuis la date de base pour une date ou un tableau de dates."""
+        jours = (np.asarray(pd.to_datetime(dates), dtype="datetime64[D]")
+                 - np.datetime64(self.base_date, "D")).astype(np.int64)
+        if np.any(jours < 0) or np.any(jours >= len(self)):
+            raise ValueError("Date hors de la table (avant la date de base ou après la dernière échéance).")
+        return jours
+
+    def lookup(self, dates) -> pd.DataFrame:
+        """Taux ZC, facteurs d'actualisation et forwards à un jour aux dates demandées."""
+        i = np.atleast_1d(self.indices(dates))
+        return pd.DataFrame({
+            "Taux_zero_coupon": self.zc[i],
+            "Facteur_actualisation": self.discount[i],
+            "Forward_1j": self.forward_1j[i],
+        }, index=pd.to_datetime(np.atleast_1d(dates)))
+
+    def save(self, chemin: str):
+        """Écrit la table (`chemin`.npy) et ses métadonnées (`chemin`.json)."""
+        base = chemin[:-4] if chemin.endswith(".npy") else chemin
+        np.save(base + ".npy", np.ascontiguousarray(self.valeurs))
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump({"base_date": self.base_date.isoformat(), "jours_par_an": self.jours_par_an}, f)
+
+    @classmethod
+    def load(cls, chemin: str, mmap: bool = True):
+        """Relit une table ; par défaut en mémoire partagée, sans copie ni recalcul."""
+        base = chemin[:-4] if chemin.endswith(".npy") else chemin
+        with open(base + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+        valeurs = np.load(base + ".npy", mmap_mode="r" if mmap else None)
+        return cls(date.fromisoformat(meta["base_date"]), valeurs, meta["jours_par_an"])
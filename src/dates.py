@@ -1,8 +1,21 @@
+import threading
 from datetime import datetime, date
 import pandas as pd
 import numpy as np
 from dateutil import parser
 
+# Formats essayés en priorité pour l'analyse vectorisée (jour en premier, comme BAM).
+# Les formats ISO ne sont pas listés : dateutil avec dayfirst=True les lit différemment,
+# ils passent donc par l'analyse souple pour garder le même résultat. De même pour les
+# années sur deux chiffres : le pivot de strptime ('70' -> 1970) n'est pas celui de dateutil
+# ('70' -> 2070).
+FORMATS_RAPIDES = ("%d/%m/%Y", "%d-%m-%Y", "%d.%m.%Y")
+
+_TAILLE_CACHE = 100_000
+_cache_dates = {}
+_verrou_cache = threading.Lock()  # le mémo est partagé par les threads (Flask, API, batch)
+
+
 def parse_date_flexible(date_str):
     """
     Tente de parser une date dans un format souple, en considérant le jour en premier.
@@ -14,12 +27,61 @@ def parse_date_flexible(date_str):
         return pd.NaT
 
 
+def _detecter_format(valeurs):
+    """Premier format de FORMATS_RAPIDES qui lit tout l'échantillon, ou None."""
+    echantillon = valeurs[:50]
+    for fmt in FORMATS_RAPIDES:
+        if pd.to_datetime(echantillon, format=fmt, errors="coerce").notna().all():
+            return fmt
+    return None
+
+
+def vider_cache_dates():
+    """Vide le mémo de `parse_dates` (ex : pour chronométrer l'analyse et non le cache)."""
+    with _verrou_cache:
+        _cache_dates.clear()
+
+
+def parse_dates(valeurs) -> pd.Series:
+    """
+    Analyse une colonne de dates en une passe vectorisée.
+
+    Chaque valeur distincte n'est analysée qu'une fois (résultats mémorisés d'un appel à
+    l'autre). Le format est détecté une seule fois sur un échantillon et appliqué à toute
+    la colonne ; seules les valeurs qui échouent passent par `parse_date_flexible`.
+    Retourne une Series datetime64 alignée sur l'entrée (NaT si la date est invalide).
+    """
+    s = pd.Series(valeurs)
+    codes, uniques = pd.factorize(s.astype(str).str.strip())
+
+    # Copie locale des valeurs connues : un autre thread peut vider le mémo entre-temps
+    with _verrou_cache:
+        connues = {u: _cache_dates[u] for u in uniques if u in _cache_dates}
+    nouvelles = [u for u in uniques if u not in connues]
+    if nouvelles:
+        fmt = _detecter_format(nouvelles)
+        if fmt is not None:
+            lues = pd.to_datetime(nouvelles, format=fmt, errors="coerce")
+        else:
+            lues = pd.DatetimeIndex([pd.NaT] * len(nouvelles))
+        analysees = {valeur: parse_date_flexible(valeur) if pd.isna(d) else d for valeur, d in zip(nouvelles, lues)}
+        with _verrou_cache:
+            if len(_cache_dates) + len(analysees) > _TAILLE_CACHE:
+                _cache_dates.clear()
+            _cache_dates.update(analysees)
+        connues.update(analysees)
+
+    table = pd.to_datetime(pd.Series([connues[u] for u in uniques] + [pd.NaT], dtype=object))
+    # Le code -1 (valeur manquante) pointe sur le NaT ajouté en fin de table
+    return pd.Series(table.to_numpy()[codes], index=s.index)
+
+
 def get_base_date(df, col_name="Echeance") -> date:
     """
     Récupère la date de base (date de valorisation) en analysant la colonne des échéances.
     Utilise la date valide la plus ancienne trouvée. Si aucune date valide, retourne date.today().
     """
-    dates_parsed = df[col_name].apply(parse_date_flexible).dropna()
+    dates_parsed = parse_dates(df[col_name]).dropna()
     if not dates_parsed.empty:
         return dates_parsed.min().date()
     else:
@@ -39,3 +101,14 @@ def calc_maturite(date_str: str, date_base: date) -> float:
         return max(delta_days, 1)  # 👈 correction ici : minimum 1 jour
     except Exception:
         return np.nan
+
+
+def calc_maturites(echeances, date_base: date) -> pd.Series:
+    """
+    Version vectorisée de `calc_maturite` pour toute une colonne d'échéances.
+    Retourne les maturités en jours (entiers, minimum 1 jour) dans une Series 'Int64',
+    avec <NA> pour les dates invalides.
+    """
+    dates = parse_dates(echeances)
+    jours = (dates.dt.normalize() - pd.Timestamp(date_base)).dt.days
+    return jours.clip(lower=1).astype("Int64")
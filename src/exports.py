@@ -0,0 +1,132 @@
+import io
+import zlib
+
+import pandas as pd
+
+# format -> (type MIME, extension)
+FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "csv.gz": ("application/gzip", ".csv.gz"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrows"),
+}
+LIGNES_PAR_BLOC = 50_000
+
+
+def _blocs(donnees, lignes_par_bloc: int):
+    """Découpe un DataFrame en blocs de lignes ; un itérable de DataFrames est repris tel quel."""
+    if isinstance(donnees, pd.DataFrame):
+        if donnees.empty:
+            yield donnees
+        for debut in range(0, len(donnees), lignes_par_bloc):
+            yield donnees.iloc[debut:debut + lignes_par_bloc]
+    else:
+        yield from donnees
+
+
+def _flux_csv(blocs):
+    """CSV au format français (';' et virgule décimale), avec BOM UTF-8 pour Excel."""
+    yield b"\xef\xbb\xbf"
+    for i, bloc in enumerate(blocs):
+        yield bloc.to_csv(index=False, header=i == 0, sep=";", decimal=",").encode("utf-8")
+
+
+def _flux_gzip(morceaux):
+    compresseur = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 : en-tête gzip
+    for morceau in morceaux:
+        sortie = compresseur.compress(morceau)
+        if sortie:
+            yield sortie
+    yield compresseur.flush()
+
+
+class _Tampon(io.RawIOBase):
+    """Fichier en écriture seule dont le contenu est vidé au fur et à mesure par le générateur."""
+
+    def __init__(self):
+        self.morceaux = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.morceaux.append(bytes(b))
+        self.position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.position
+
+    def vider(self) -> bytes:
+        contenu = b"".join(self.morceaux)
+        self.morceaux.clear()
+        return contenu
+
+
+def _flux_arrow(blocs, format: str):
+    """
+    Parquet (un groupe de lignes par bloc) ou flux IPC Arrow, écrits bloc par bloc. Sans
+    aucun bloc, le fichier produit est valide mais sans colonnes (schéma vide).
+    """
+    import pyarrow as pa
+
+    def ouvrir(schema):
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(tampon, schema)
+        return pa.ipc.new_stream(tampon, schema)
+
+    tampon = _Tampon()
+    ecrivain = schema = None
+    for bloc in blocs:
+        table = pa.Table.from_pandas(bloc, preserve_index=False, schema=schema)
+        if ecrivain is None:
+            schema = table.schema  # celui du premier bloc, imposé aux suivants
+            ecrivain = ouvrir(schema)
+        ecrivain.write_table(table)
+        morceau = tampon.vider()
+        if morceau:
+            yield morceau
+    if ecrivain is None:
+        ecrivain = ouvrir(pa.schema([]))
+    ecrivain.close()
+    yield tampon.vider()
+
+
+def flux_export(donnees, format: str = "csv", lignes_par_bloc: int = LIGNES_PAR_BLOC):
+    """
+    Générateur des octets d'un export, produit bloc par bloc : la mémoire utilisée est celle
+    d'un bloc de `lignes_par_bloc` lignes, pas celle du fichier complet.
+
+    Parameters
+    ----------
+    donnees : pd.DataFrame ou itérable de pd.DataFrame
+        Tableau à exporter, ou blocs successifs de même schéma (ex : `CurveStore.blocs`).
+    format : str
+        'csv' (';' et virgule décimale, comme les exports existants), 'csv.gz' (le même,
+        compressé), 'parquet' ou 'arrow' (flux IPC Arrow).
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Format d'export inconnu : {format} (attendu : {', '.join(FORMATS)})")
+    blocs = _blocs(donnees, lignes_par_bloc)
+    if format == "csv":
+        return _flux_csv(blocs)
+    if format == "csv.gz":
+        return _flux_gzip(_flux_csv(blocs))
+    return _flux_arrow(blocs, format)
+
+
+def exporter(donnees, format: str = "csv") -> bytes:
+    """Export complet en mémoire, pour les API qui attendent des octets (Streamlit)."""
+    return b"".join(flux_export(donnees, format))
+
+
+def reponse_export(donnees, nom: str, format: str = "csv"):
+    """Réponse Flask qui transmet l'export en flux (transfert par morceaux), sans le construire en mémoire."""
+    from flask import Response
+
+    flux = flux_export(donnees, format)
+    mimetype, extension = FORMATS[format]
+    return Response(flux, mimetype=mimetype,
+                    headers={"Content-Disposition": f'attachment; filename="{nom}{extension}"'})
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import taux_actuariel_array, bootstrap_zc_queue
+from src.interpolation import CurveInterpolator
+
+
+class IncrementalCurve:
+    """
+    Courbe BAM modifiable pilier par pilier, sans refaire tout le pipeline.
+
+    Le ZC d'une maturité T ne dépend que des piliers de maturité ≤ T : une correction,
+    un ajout ou une suppression au rang i ne rend invalides que les ZC et forwards à partir
+    du rang i (le forward i-1 → i compris). Les modifications marquent ce rang ; le recalcul
+    de la queue est fait à la première lecture des résultats, une seule fois pour une série
+    de modifications. Toute modification invalide l'interpolateur mis en cache.
+    """
+
+    TOLERANCE = 1e-9  # écart de maturité (années) en deçà duquel deux piliers sont confondus
+
+    def __init__(self, maturites, taux):
+        """
+        `maturites` en années (> 0), `taux` moyens pondérés en décimal ('Taux_decimal').
+        """
+        T = np.asarray(maturites, dtype=float)
+        t = np.asarray(taux, dtype=float)
+        if T.shape != t.shape or T.ndim != 1:
+            raise ValueError("Les maturités et les taux doivent être des vecteurs de même longueur.")
+        if np.any(T <= 0):
+            raise ValueError("Maturité non valide (≤ 0) détectée.")
+        ordre = np.argsort(T, kind="stable")
+        self._T = T[ordre]
+        self._taux = t[ordre]
+        self._zc = np.empty(self._T.size)
+        self._fw = np.empty(max(self._T.size - 1, 0))  # forward de chaque couple (i, i+1)
+        self._sale = 0          # premier rang à recalculer (taille de la courbe si à jour)
+        self.version = 0
+        self._interpolateur = None
+
+    @classmethod
+    def depuis_resultats(cls, df: pd.DataFrame):
+        """Construit la courbe à partir de la sortie de `process_dataframe`."""
+        return cls(df["maturite_annees"], df["Taux_decimal"])
+
+    def __len__(self):
+        return self._T.size
+
+    def _rang(self, maturite: float) -> int:
+        i = int(np.searchsorted(self._T, maturite - self.TOLERANCE))
+        if i >= self._T.size or abs(self._T[i] - maturite) > self.TOLERANCE:
+            raise KeyError(f"Aucun pilier de maturité {maturite} ans.")
+        return i
+
+    def _invalider(self, rang: int):
+        self._sale = min(self._sale, rang)
+        self.version += 1
+        self._interpolateur = None
+
+    def mettre_a_jour(self, maturite: float, taux: float):
+        """Corrige le taux moyen pondéré du pilier de maturité donnée."""
+        i = self._rang(maturite)
+        self._taux[i] = taux
+        self._invalider(i)
+
+    def inserer(self, maturite: float, taux: float):
+        """Ajoute un pilier (placé après les piliers de même maturité)."""
+        if maturite <= 0:
+            raise ValueError("La maturité doit être strictement positive.")
+        i = int(np.searchsorted(self._T, maturite, side="right"))
+        self._T = np.insert(self._T, i, maturite)
+        self._taux = np.insert(self._taux, i, taux)
+        self._zc = np.insert(self._zc, i, np.nan)
+        self._invalider(i)
+
+    def supprimer(self, maturite: float):
+        """Retire le pilier de maturité donnée."""
+        i = self._rang(maturite)
+        self._T = np.delete(self._T, i)
+        self._taux = np.delete(self._taux, i)
+        self._zc = np.delete(self._zc, i)
+        self._invalider(i)
+
+    def _recalculer(self):
+        n = self._T.size
+        # Forwards : seuls les couples à partir de (sale - 1, sale) changent. Le tableau est
+        # redimensionné même sans ZC à recalculer (suppression du dernier pilier).
+        d = max(min(self._sale, n) - 1, 0)
+        if self._fw.size != max(n - 1, 0):
+            fw = np.empty(max(n - 1, 0))
+            fw[:d] = self._fw[:d]
+            self._fw = fw
+        if self._sale >= n:
+            return
+        bootstrap_zc_queue(self._T, self._taux, self._zc, self._sale)
+
+        T, zc = self._T[d:], self._zc[d:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self._fw[d:] = (zc[1:] * T[1:] - zc[:-1] * T[:-1]) / (T[1:] - T[:-1])
+        self._sale = n
+
+    @property
+    def maturites(self) -> np.ndarray:
+        return self._T
+
+    @property
+    def taux_zc(self) -> np.ndarray:
+        self._recalculer()
+        return self._zc
+
+    @property
+    def taux_actuariels(self) -> np.ndarray:
+        return taux_actuariel_array(self._T, self._taux)
+
+    def forwards(self):
+        """Forwards entre piliers consécutifs, mêmes sorties que `taux_forward`."""
+        self._recalculer()
+        valide = np.diff(self._T) > 1e-6
+        return self._T[:-1][valide], self._T[1:][valide], self._fw[valide]
+
+    @property
+    def interpolateur(self) -> CurveInterpolator:
+        """Interpolateur ZC, reconstruit seulement après une modification de la courbe."""
+        if self._interpolateur is None:
+            self._interpolateur = CurveInterpolator(self._T, self.taux_zc)
+        return self._interpolateur
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            "maturite_annees": self._T,
+            "Taux_decimal": self._taux,
+            "Taux_actuariel": self.taux_actuariels,
+            "Taux_zero_coupon": self.taux_zc,
+        })
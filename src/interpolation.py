@@ -1,11 +1,148 @@
 import numpy as np
-from scipy.interpolate import interp1d
+
+
+class CurveInterpolator:
+    """
+    Interpolateur de courbe construit une fois par courbe bootstrappée.
+
+    Les nœuds (maturités triées) et les coefficients polynomiaux de chaque intervalle sont
+    calculés à la construction ; une évaluation ne fait ensuite qu'une recherche binaire
+    (`np.searchsorted`) et un schéma de Horner, vectorisés sur tout le lot de points.
+
+    Méthodes :
+      - "linear" : interpolation linéaire des taux ;
+      - "log_df" : interpolation linéaire du log du facteur d'actualisation
+        (DF = (1 + z)^-t), avec le nœud DF(0) = 1 ;
+      - "monotone_cubic" : spline cubique monotone de Fritsch-Carlson (type PCHIP).
+    En dehors des nœuds, l'extrapolation prolonge le premier / dernier polynôme.
+    """
+
+    METHODES = ("linear", "log_df", "monotone_cubic")
+
+    def __init__(self, x, y, method: str = "linear", extrapolate: bool = True):
+        if method not in self.METHODES:
+            raise ValueError(f"Méthode d'interpolation inconnue : {method} (attendu : {', '.join(self.METHODES)})")
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("x et y doivent être des vecteurs de même longueur.")
+
+        # Tri des nœuds ; pour une maturité en double, la dernière valeur est retenue
+        ordre = np.argsort(x, kind="stable")
+        x, y = x[ordre], y[ordre]
+        garder = np.r_[x[1:] != x[:-1], True]
+        x, y = x[garder], y[garder]
+
+        self.method = method
+        self.extrapolate = extrapolate
+        self.x_min, self.x_max = (x[0], x[-1]) if x.size else (np.nan, np.nan)
+        self.maturites, self.taux = x, y
+
+        if method == "log_df":
+            # Interpolation de g(t) = -ln DF(t) = t * ln(1 + z)
+            g = x * np.log1p(y)
+            if x.size and x[0] > 0:
+                x, g = np.r_[0.0, x], np.r_[0.0, g]
+            y = g
+        if x.size < 2:
+            raise ValueError("Au moins deux maturités distinctes sont nécessaires pour interpoler.")
+
+        self.knots = x
+        self.coefs = self._coefficients(x, y, method)
+
+    @staticmethod
+    def _coefficients(x, y, method):
+        """Coefficients (c0, c1, c2, c3) de chaque intervalle, en puissances de (t - x_i)."""
+        h = np.diff(x)
+        pente = np.diff(y) / h
+        c = np.zeros((4, h.size))
+        c[0] = y[:-1]
+        if method != "monotone_cubic":
+            c[1] = pente
+            return c
+
+        # Dérivées aux nœuds : moyenne harmonique pondérée (Fritsch-Carlson)
+        d = np.zeros(x.size)
+        if x.size == 2:
+            d[:] = pente[0]
+        else:
+            w1 = 2 * h[1:] + h[:-1]
+            w2 = h[1:] + 2 * h[:-1]
+            meme_signe = pente[:-1] * pente[1:] > 0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                harm = (w1 + w2) / (w1 / pente[:-1] + w2 / pente[1:])
+            d[1:-1] = np.where(meme_signe, harm, 0.0)
+            d[0] = CurveInterpolator._derivee_bord(h[0], h[1], pente[0], pente[1])
+            d[-1] = CurveInterpolator._derivee_bord(h[-1], h[-2], pente[-1], pente[-2])
+        c[1] = d[:-1]
+        c[2] = (3 * pente - 2 * d[:-1] - d[1:]) / h
+        c[3] = (d[:-1] + d[1:] - 2 * pente) / h ** 2
+        return c
+
+    @staticmethod
+    def _derivee_bord(h0, h1, m0, m1):
+        # Formule à trois points non centrée, bornée pour préserver la monotonie
+        d = ((2 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        if np.sign(d) != np.sign(m0):
+            return 0.0
+        if np.sign(m0) != np.sign(m1) and abs(d) > abs(3 * m0):
+            return 3 * m0
+        return d
+
+    def _evaluer(self, t):
+        t = np.asarray(t, dtype=float)
+        if not self.extrapolate and (np.any(t < self.x_min) or np.any(t > self.x_max)):
+            raise ValueError("Maturité hors de l'intervalle des nœuds (extrapolation désactivée).")
+        i = np.clip(np.searchsorted(self.knots, t, side="right") - 1, 0, self.knots.size - 2)
+        dx = t - self.knots[i]
+        c = self.coefs
+        return ((c[3, i] * dx + c[2, i]) * dx + c[1, i]) * dx + c[0, i], t
+
+    def __call__(self, t) -> np.ndarray:
+        """Taux zéro-coupon interpolés aux maturités `t` (années)."""
+        v, t = self._evaluer(t)
+        if self.method != "log_df":
+            return v
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(t > 0, np.expm1(v / t), np.expm1(self.coefs[1, 0]))
+
+    def discount(self, t) -> np.ndarray:
+        """Facteurs d'actualisation DF(t) = (1 + z(t))^-t."""
+        if self.method == "log_df":
+            return np.exp(-self._evaluer(t)[0])
+        t = np.asarray(t, dtype=float)
+        return (1 + self(t)) ** -t
+
+
+def interpolate_lineaire_matrice(x, Y, x_new) -> np.ndarray:
+    """
+    Interpolation linéaire (extrapolée aux bords) de plusieurs courbes partageant les mêmes
+    nœuds `x` (strictement croissants) : `Y` est une matrice (courbes, nœuds). Les indices et poids sont calculés une
+    seule fois pour `x_new`, puis appliqués à toutes les courbes.
+    Retourne une matrice (courbes, len(x_new)).
+    """
+    x = np.asarray(x, dtype=float)
+    Y = np.atleast_2d(np.asarray(Y, dtype=float))
+    x_new = np.asarray(x_new, dtype=float)
+    i = np.clip(np.searchsorted(x, x_new, side="right") - 1, 0, x.size - 2)
+    w = (x_new - x[i]) / (x[i + 1] - x[i])
+    return Y[:, i] * (1 - w) + Y[:, i + 1] * w
+
 
 def interpolate_rate(x: np.ndarray,
                      y: np.ndarray,
                      x_new: np.ndarray,
                      method: str = "linear",
                      extrapolate: bool = True) -> np.ndarray:
+    if method in CurveInterpolator.METHODES:
+        return CurveInterpolator(x, y, method=method, extrapolate=extrapolate)(x_new)
+    # Autres méthodes ('quadratic', 'cubic'...) : scipy n'est importé qu'à ce moment-là,
+    # il reste une dépendance optionnelle
+    try:
+        from scipy.interpolate import interp1d
+    except ImportError as e:
+        raise ImportError(f"La méthode '{method}' nécessite scipy ; méthodes disponibles sans scipy : "
+                          f"{', '.join(CurveInterpolator.METHODES)}.") from e
     fill = "extrapolate" if extrapolate else None
     f = interp1d(x, y, kind=method,
                  fill_value=fill,
@@ -1,67 +1,240 @@
-import requests
+import os
 import pandas as pd
-from io import StringIO
+from io import BytesIO
 
-def read_bam_csv_safely(csv_data: str) -> pd.DataFrame:
+from src.metrics import etape, compter
+
+COLONNES_BAM = {
+    "Date échéance": "Echeance",
+    "Date d'échéance": "Echeance",
+    "Taux moyen": "Taux moyen pondéré"  # Le nom de colonne a changé dans le nouveau fichier
+}
+COL_TAUX = "Taux moyen pondéré"
+
+
+def _en_octets(source) -> bytes:
+    """Contenu brut d'un CSV : texte, octets, chemin de fichier ou objet fichier (upload)."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        if "\n" not in source and os.path.exists(source):
+            with open(source, "rb") as f:
+                return f.read()
+        return source.encode("utf-8")
+    contenu = source.read()
+    return contenu.encode("utf-8") if isinstance(contenu, str) else contenu
+
+
+def _decoder(ligne: bytes) -> str:
+    try:
+        return ligne.decode("utf-8")
+    except UnicodeDecodeError:
+        # Exports Excel enregistrés en Windows-1252
+        return ligne.decode("cp1252", errors="replace")
+
+
+def _est_entete(ligne: bytes) -> bool:
+    texte = _decoder(ligne).lower()
+    return ";" in texte and "taux" in texte and ("échéance" in texte or "echeance" in texte)
+
+
+def _est_total(ligne: bytes) -> bool:
+    return ligne.strip().strip(b'"').lower().startswith(b"total")
+
+
+def _noms_colonnes(entete: bytes):
+    noms = [n.strip().strip('"').strip() for n in _decoder(entete).strip("\ufeff\r\n").split(";")]
+    return [COLONNES_BAM.get(n, n) or f"Unnamed: {i}" for i, n in enumerate(noms)]
+
+
+def _lire_corps(noms, corps: bytes) -> pd.DataFrame:
     """
-    Lecture robuste d'un CSV de BAM en sautant les lignes d'en-tête et de pied de page,
-    et en utilisant le point-virgule comme séparateur.
+    Analyse les lignes de données avec le moteur C de pandas. Les '%' sont retirés en une
+    passe sur les octets et la virgule décimale est gérée par le lecteur : la colonne des
+    taux sort directement en float (en pourcentage).
     """
-    # Nettoyage des retours à la ligne pour plus de robustesse
-    csv_data = csv_data.replace('\r\n', '\n').replace('\r', '\n').strip()
-
-    # Lecture du CSV en sautant les 2 premières lignes et la dernière ligne (Total)
-    # Le séparateur est probablement un point-virgule (';') lors de l'export depuis Excel (Fr)
-    df = pd.read_csv(
-        StringIO(csv_data),
-        sep=";", 
-        encoding="utf-8",
-        skiprows=2,  # Correction: Saute les deux premières lignes
-        skipfooter=1, # Correction: Saute la dernière ligne ('Total')
-        engine='python', # Moteur nécessaire pour utiliser skipfooter
-    )
-
-    # Renommer les colonnes pour correspondre à ce que le script principal attend
-    df.rename(columns={
-        "Date d'échéance": "Echeance",
-        "Taux moyen": "Taux moyen pondéré" # Le nom de colonne a changé dans le nouveau fichier
-    }, inplace=True)
+    if b"%" in corps:
+        corps = corps.translate(None, b"%")
+    options = dict(sep=";", header=None, names=noms, decimal=",", engine="c", encoding_errors="replace")
+    dtype = {n: str for n in noms if n != COL_TAUX}
+    try:
+        df = pd.read_csv(BytesIO(corps), dtype=dtype, **options)
+    except ValueError:
+        # Valeur non numérique dans la colonne des taux : lecture en texte puis conversion
+        df = pd.read_csv(BytesIO(corps), dtype=str, **options)
+    if COL_TAUX in df.columns and not pd.api.types.is_numeric_dtype(df[COL_TAUX]):
+        df[COL_TAUX] = pd.to_numeric(df[COL_TAUX].str.strip().str.replace(",", ".", regex=False), errors="coerce")
+    return df
+
 
+def _verifier_colonnes(df: pd.DataFrame) -> pd.DataFrame:
     # Vérification que les colonnes requises existent
-    required_cols = ["Echeance", "Taux moyen pondéré"]
+    required_cols = ["Echeance", COL_TAUX]
     if not all(col in df.columns for col in required_cols):
         raise ValueError(f"Colonnes requises ('Echeance', 'Taux moyen pondéré') non trouvées. Colonnes : {df.columns.tolist()}")
+    return df.dropna(subset=required_cols)
 
-    df = df.dropna(subset=required_cols)
 
-    return df
+def read_bam_csv(source) -> pd.DataFrame:
+    """
+    Lecteur commun des exports CSV de BAM (téléchargement ou fichier uploadé).
 
-def import_bam_curve(date_obj) -> pd.DataFrame:
+    Repère lui-même la ligne d'en-tête et la ligne de pied de page ('Total'), puis analyse
+    les données avec le moteur C de pandas (séparateur ';', virgule décimale).
+    La colonne 'Taux moyen pondéré' est retournée en float (pourcentage, ex : 2.268).
     """
-    Télécharge et nettoie la courbe des taux BAM pour une date donnée.
+    donnees = _en_octets(source)
+    if donnees.startswith(b"\xef\xbb\xbf"):
+        donnees = donnees[3:]
+    # Fins de ligne CR seul (anciens exports Mac / Excel) : ramenées à LF
+    if donnees.count(b"\r") != donnees.count(b"\r\n"):
+        donnees = donnees.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+    # En-tête : première ligne contenant l'échéance et le taux (à défaut, la 3e ligne)
+    debut, entete, pos = None, None, 0
+    lignes_entete = []
+    for _ in range(20):
+        fin = donnees.find(b"\n", pos)
+        fin = len(donnees) if fin < 0 else fin
+        lignes_entete.append((pos, fin))
+        if _est_entete(donnees[pos:fin]):
+            entete, debut = donnees[pos:fin], fin + 1
+            break
+        if fin >= len(donnees):
+            break
+        pos = fin + 1
+    if entete is None:
+        if len(lignes_entete) < 3:
+            raise ValueError("Fichier BAM vide ou incomplet.")
+        pos, fin = lignes_entete[2]
+        entete, debut = donnees[pos:fin], fin + 1
+
+    # Pied de page : dernière ligne non vide si elle commence par 'Total'
+    fin = len(donnees.rstrip())
+    derniere = donnees.rfind(b"\n", debut, fin) + 1
+    if derniere > 0 and _est_total(donnees[derniere:fin]):
+        fin = derniere
+
+    noms = _noms_colonnes(entete)
+    with etape("lecture_csv"):
+        return _verifier_colonnes(_lire_corps(noms, donnees[debut:fin]))
+
+
+def iter_bam_csv(source, chunksize=100_000):
+    """
+    Lecture en flux d'une archive contenant plusieurs exports BAM à la suite
+    (chaque bloc : lignes de titre, en-tête, données, ligne 'Total').
+
+    `source` est un chemin ou un fichier ouvert en binaire ; il est lu ligne à ligne et au
+    plus `chunksize` lignes de données sont gardées en mémoire. Produit des couples
+    `(numero_bloc, df)` ; un bloc plus long que `chunksize` est découpé en plusieurs DataFrames.
+    """
+    fichier = open(source, "rb") if isinstance(source, (str, os.PathLike)) else source
+    noms, bloc, tampon = None, -1, []
+    try:
+        for ligne in fichier:
+            if _est_entete(ligne):
+                if tampon:
+                    yield bloc, _verifier_colonnes(_lire_corps(noms, b"".join(tampon)))
+                    tampon = []
+                noms, bloc = _noms_colonnes(ligne), bloc + 1
+            elif noms is None or not ligne.strip():
+                continue
+            elif _est_total(ligne):
+                if tampon:
+                    yield bloc, _verifier_colonnes(_lire_corps(noms, b"".join(tampon)))
+                    tampon = []
+                noms = None
+            else:
+                tampon.append(ligne)
+                if len(tampon) >= chunksize:
+                    yield bloc, _verifier_colonnes(_lire_corps(noms, b"".join(tampon)))
+                    tampon = []
+        if tampon:
+            yield bloc, _verifier_colonnes(_lire_corps(noms, b"".join(tampon)))
+    finally:
+        if fichier is not source:
+            fichier.close()
+
+
+def read_bam_csv_safely(csv_data: str) -> pd.DataFrame:
+    """
+    Lecture robuste d'un CSV de BAM en sautant les lignes d'en-tête et de pied de page,
+    et en utilisant le point-virgule comme séparateur.
+    """
+    return read_bam_csv(csv_data)
+
+
+def taux_en_decimal(taux: pd.Series) -> pd.Series:
+    """
+    Convertit la colonne 'Taux moyen pondéré' en taux décimal (0.025 pour 2.5%).
+    Accepte la colonne déjà numérique de `read_bam_csv` ou du texte au format français ('2,5 %').
+    """
+    if pd.api.types.is_numeric_dtype(taux):
+        return taux.astype(float) / 100
+    return taux.astype(str).str.replace('%', '', regex=False).str.replace(',', '.', regex=False).astype(float) / 100
+
+BAM_URL = os.environ.get(
+    "BAM_URL",
+    "https://www.bkam.ma/export/blockcsv/2340/"
+    "c3367fcefc5f524397748201aee5dab8/"
+    "e1d6b9bbf87f86f8ba53e8518e882982"
+)
+BAM_BLOCK = "e1d6b9bbf87f86f8ba53e8518e882982"
+
+
+def bam_url(date_obj, url_base=None) -> str:
+    """
+    Construit l'URL d'export CSV de BAM pour une date de publication.
+    `url_base` (ou la variable d'environnement BAM_URL) permet de viser un serveur local.
     """
     # Le format de date attendu par l'URL est souvent jj/mm/aaaa
-    date_str = date_obj.strftime("%d/%m/%Y")
-    encoded_date = date_str.replace("/", "%2F")
-    url = (
-        "https://www.bkam.ma/export/blockcsv/2340/"
-        "c3367fcefc5f524397748201aee5dab8/"
-        "e1d6b9bbf87f86f8ba53e8518e882982"
-        f"?date={encoded_date}&block=e1d6b9bbf87f86f8ba53e8518e882982"
-    )
+    encoded_date = date_obj.strftime("%d/%m/%Y").replace("/", "%2F")
+    return f"{url_base or BAM_URL}?date={encoded_date}&block={BAM_BLOCK}"
+
+
+def telecharger_bam_csv(date_obj, session=None, timeout=30, url_base=None) -> bytes:
+    """
+    Télécharge le CSV brut publié par BAM pour une date donnée.
+    Lève une ValueError si la requête échoue ou si BAM n'a rien publié ce jour-là.
+    """
+    import requests  # importé au premier téléchargement seulement (démarrage à froid)
 
+    date_str = date_obj.strftime("%d/%m/%Y")
+    http = session or requests
     try:
-        response = requests.get(url)
+        with etape("telechargement_bam"):
+            response = http.get(bam_url(date_obj, url_base), timeout=timeout)
         response.raise_for_status()
-        
-        csv_data = response.content.decode("utf-8")
-        
-        if not csv_data or "aucun" in csv_data.lower():
-             raise ValueError(f"Aucune donnée disponible pour la date {date_str}.")
-
-        return read_bam_csv_safely(csv_data)
-    
     except requests.HTTPError as e:
-        raise ValueError(f"Erreur réseau lors de l'import depuis BAM (code: {e.response.status_code}). Il n'y a peut-être pas de données pour cette date.")
+        raise ValueError(f"Erreur réseau lors de l'import depuis BAM (code: {e.response.status_code}). Il n'y a peut-être pas de données pour cette date.") from e
+    except requests.RequestException as e:
+        raise ValueError(f"Erreur réseau lors de l'import depuis BAM : {e}") from e
+
+    contenu = response.content
+    compter("yield_curve_bam_downloaded_bytes_total", len(contenu), "Octets téléchargés depuis BAM")
+    if not contenu or "aucun" in contenu.decode("utf-8", errors="replace").lower():
+        raise ValueError(f"Aucune donnée disponible pour la date {date_str}.")
+    return contenu
+
+
+def import_bam_curve(date_obj, cache=None) -> pd.DataFrame:
+    """
+    Télécharge et nettoie la courbe des taux BAM pour une date donnée.
+
+    Les courbes publiées ne changent plus : elles sont servies depuis le cache disque
+    (`src.bam_cache.cache_par_defaut()` si `cache` n'est pas fourni). `cache=False`
+    force le téléchargement sans cache.
+    """
+    if cache is None:
+        from src.bam_cache import cache_par_defaut
+        cache = cache_par_defaut()
+    if cache:
+        return cache.charger(date_obj, telecharger_bam_csv)
+
+    try:
+        return read_bam_csv_safely(telecharger_bam_csv(date_obj).decode("utf-8"))
+    except ValueError:
+        raise
     except Exception as e:
-        raise ValueError(f"Une erreur est survenue lors du traitement des données BAM : {e}")
\ No newline at end of file
+        raise ValueError(f"Une erreur est survenue lors du traitement des données BAM : {e}")
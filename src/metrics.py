@@ -0,0 +1,182 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Bornes (secondes) des histogrammes de durée
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Durées par étape de la requête en cours (None hors requête instrumentée)
+_etapes_requete = contextvars.ContextVar("etapes_requete", default=None)
+
+logger = logging.getLogger(__name__)
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    paires = []
+    for cle, valeur in labels.items():
+        valeur = str(valeur).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        paires.append(f'{cle}="{valeur}"')
+    return "{" + ",".join(paires) + "}"
+
+
+class Registre:
+    """
+    Compteurs et histogrammes en mémoire, exposés au format texte Prometheus.
+
+    Volontairement minimal (pas de dépendance à `prometheus_client`) : une série est
+    identifiée par son nom et ses labels, les mises à jour sont protégées par un verrou
+    pour les serveurs multi-threads.
+    """
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._compteurs = {}    # (nom, labels) -> valeur
+        self._histogrammes = {}  # (nom, labels) -> [effectifs par borne, somme, nombre]
+        self._aides = {}
+        self._verrou = threading.Lock()
+
+    def incrementer(self, nom: str, valeur: float = 1, aide: str = "", **labels):
+        cle = (nom, tuple(sorted(labels.items())))
+        with self._verrou:
+            self._aides.setdefault(nom, ("counter", aide))
+            self._compteurs[cle] = self._compteurs.get(cle, 0) + valeur
+
+    def observer(self, nom: str, valeur: float, aide: str = "", **labels):
+        cle = (nom, tuple(sorted(labels.items())))
+        with self._verrou:
+            self._aides.setdefault(nom, ("histogram", aide))
+            serie = self._histogrammes.get(cle)
+            if serie is None:
+                serie = self._histogrammes[cle] = [[0] * len(self.buckets), 0.0, 0]
+            for i, borne in enumerate(self.buckets):
+                if valeur <= borne:
+                    serie[0][i] += 1
+            serie[1] += valeur
+            serie[2] += 1
+
+    def valeur(self, nom: str, **labels) -> float:
+        """Valeur d'un compteur (0 si la série n'existe pas encore)."""
+        with self._verrou:
+            return self._compteurs.get((nom, tuple(sorted(labels.items()))), 0)
+
+    def reinitialiser(self):
+        with self._verrou:
+            self._compteurs.clear()
+            self._histogrammes.clear()
+            self._aides.clear()
+
+    def exposer(self) -> str:
+        """Toutes les séries au format d'exposition texte Prometheus (version 0.0.4)."""
+        with self._verrou:
+            compteurs = sorted(self._compteurs.items())
+            histogrammes = sorted((cle, (list(s[0]), s[1], s[2])) for cle, s in self._histogrammes.items())
+            aides = dict(self._aides)
+
+        lignes = []
+        deja_decrits = set()
+
+        def entete(nom):
+            if nom not in deja_decrits:
+                type_, aide = aides[nom]
+                if aide:
+                    lignes.append(f"# HELP {nom} {aide}")
+                lignes.append(f"# TYPE {nom} {type_}")
+                deja_decrits.add(nom)
+
+        for (nom, labels), valeur in compteurs:
+            entete(nom)
+            lignes.append(f"{nom}{_labels(dict(labels))} {valeur:g}")
+        for (nom, labels), (effectifs, somme, nombre) in histogrammes:
+            entete(nom)
+            labels = dict(labels)
+            for borne, effectif in zip(self.buckets, effectifs):
+                lignes.append(f"{nom}_bucket{_labels({**labels, 'le': f'{borne:g}'})} {effectif}")
+            lignes.append(f"{nom}_bucket{_labels({**labels, 'le': '+Inf'})} {nombre}")
+            lignes.append(f"{nom}_sum{_labels(labels)} {somme:.6f}")
+            lignes.append(f"{nom}_count{_labels(labels)} {nombre}")
+        return "\n".join(lignes) + "\n"
+
+
+REGISTRE = Registre()
+
+
+@contextmanager
+def etape(nom: str):
+    """
+    Chronomètre une étape du traitement (téléchargement BAM, lecture CSV, dates, bootstrap...).
+
+    La durée alimente l'histogramme `yield_curve_stage_seconds{stage=...}` et, pendant une
+    requête instrumentée, le détail par étape utilisé pour journaliser les requêtes lentes.
+    """
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        duree = time.perf_counter() - debut
+        REGISTRE.observer("yield_curve_stage_seconds", duree,
+                          "Durée de chaque étape du calcul de la courbe", stage=nom)
+        etapes = _etapes_requete.get()
+        if etapes is not None:
+            etapes[nom] = etapes.get(nom, 0.0) + duree
+
+
+def compter(nom: str, valeur: float = 1, aide: str = "", **labels):
+    """Incrémente un compteur du registre global."""
+    REGISTRE.incrementer(nom, valeur, aide, **labels)
+
+
+def instrumenter(app, seuil_lent=None):
+    """
+    Ajoute à une application Flask la route `/metrics` (format Prometheus), la mesure de la
+    durée de chaque requête et, si `seuil_lent` (secondes) est fourni ou défini par la
+    variable d'environnement METRICS_SEUIL_LENT, la journalisation des requêtes plus lentes
+    avec le détail du temps passé dans chaque étape.
+    """
+    from flask import Response, g, request
+
+    if seuil_lent is None and os.environ.get("METRICS_SEUIL_LENT"):
+        seuil_lent = float(os.environ["METRICS_SEUIL_LENT"])
+
+    @app.before_request
+    def _debut_requete():
+        g._metrics_debut = time.perf_counter()
+        g._metrics_jeton = _etapes_requete.set({})
+
+    @app.after_request
+    def _fin_requete(response):
+        debut = g.pop("_metrics_debut", None)
+        if debut is None or request.endpoint == "metrics":
+            return response
+        duree = time.perf_counter() - debut
+        route = request.url_rule.rule if request.url_rule else "inconnue"
+        REGISTRE.observer("yield_curve_http_request_seconds", duree, "Durée des requêtes HTTP",
+                          route=route, method=request.method)
+        compter("yield_curve_http_requests_total", 1, "Nombre de requêtes HTTP",
+                route=route, method=request.method, status=response.status_code)
+        if seuil_lent is not None and duree >= seuil_lent:
+            etapes = _etapes_requete.get() or {}
+            detail = ", ".join(f"{nom}={d * 1e3:.1f} ms" for nom, d in
+                               sorted(etapes.items(), key=lambda e: -e[1]))
+            logger.warning("Requête lente %s %s : %.1f ms (%s)", request.method, request.path,
+                           duree * 1e3, detail or "aucune étape instrumentée")
+        return response
+
+    @app.teardown_request
+    def _nettoyer(_exc):
+        jeton = g.pop("_metrics_jeton", None)
+        if jeton is not None:
+            try:
+                _etapes_requete.reset(jeton)
+            except ValueError:  # jeton créé dans un autre contexte
+                _etapes_requete.set(None)
+
+    @app.route("/metrics")
+    def metrics():
+        return Response(REGISTRE.exposer(), mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+    return app
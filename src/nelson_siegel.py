@@ -0,0 +1,208 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+MODELES = {"ns": ("beta0", "beta1", "beta2", "tau1"),
+           "nss": ("beta0", "beta1", "beta2", "beta3", "tau1", "tau2")}
+TAU_MIN, TAU_MAX = 0.05, 30.0
+COL_DATE = "Date publication"
+
+
+def _charges(t: np.ndarray, tau: float):
+    """Facteurs de pente L1 = (1 - e^-x) / x et de courbure L2 = L1 - e^-x, avec x = t / tau."""
+    x = t / tau
+    e = np.exp(-x)
+    l1 = -np.expm1(-x) / x
+    return x, e, l1, l1 - e
+
+
+def taux_nss(t, params) -> np.ndarray:
+    """Taux zéro-coupon du modèle Nelson-Siegel (4 paramètres) ou Svensson (6 paramètres)."""
+    t = np.maximum(np.asarray(t, dtype=float), 1e-8)
+    if len(params) == 4:
+        b0, b1, b2, tau1 = params
+        _, _, l1, l2 = _charges(t, tau1)
+        return b0 + b1 * l1 + b2 * l2
+    b0, b1, b2, b3, tau1, tau2 = params
+    _, _, l1, l2 = _charges(t, tau1)
+    _, _, _, m2 = _charges(t, tau2)
+    return b0 + b1 * l1 + b2 * l2 + b3 * m2
+
+
+def jacobien_nss(t, params) -> np.ndarray:
+    """
+    Jacobien analytique (maturités × paramètres) de `taux_nss`.
+    Pour les tau : dL1/dx = (e^-x - L1) / x, dL2/dx = dL1/dx + e^-x et dx/dtau = -x / tau.
+    """
+    t = np.maximum(np.asarray(t, dtype=float), 1e-8)
+    svensson = len(params) == 6
+    b1, b2 = params[1], params[2]
+    tau1 = params[4] if svensson else params[3]
+
+    x, e, l1, l2 = _charges(t, tau1)
+    dl1 = (e - l1) / x
+    colonnes = [np.ones_like(t), l1, l2]
+    d_tau1 = (b1 * dl1 + b2 * (dl1 + e)) * (-x / tau1)
+    if not svensson:
+        return np.column_stack(colonnes + [d_tau1])
+
+    b3, tau2 = params[3], params[5]
+    y, f, m1, m2 = _charges(t, tau2)
+    d_tau2 = b3 * ((f - m1) / y + f) * (-y / tau2)
+    return np.column_stack(colonnes + [m2, d_tau1, d_tau2])
+
+
+def params_initiaux(maturites, taux, modele: str = "nss") -> np.ndarray:
+    """Point de départ heuristique : niveau = taux long, pente = court - long, pas de courbure."""
+    taux = np.asarray(taux, dtype=float)
+    ordre = np.argsort(maturites)
+    court, long = taux[ordre[0]], taux[ordre[-1]]
+    if modele == "ns":
+        return np.array([long, court - long, 0.0, 1.5])
+    return np.array([long, court - long, 0.0, 0.0, 1.5, 8.0])
+
+
+class CourbeNSS:
+    """
+    Courbe paramétrique Nelson-Siegel(-Svensson) : 4 ou 6 paramètres au lieu d'une table de
+    piliers, évaluable en temps constant à toute maturité.
+
+    Les attributs `residus` (décimal, aux piliers ajustés), `rmse_pb`, `max_pb`, `duree`
+    (secondes), `iterations` et `succes` décrivent l'ajustement quand la courbe provient de
+    `fit_nss`.
+    """
+
+    def __init__(self, params, modele: str = "nss"):
+        if modele not in MODELES:
+            raise ValueError(f"Modèle inconnu : {modele} (attendu : {', '.join(MODELES)})")
+        self.params = np.asarray(params, dtype=float)
+        if self.params.size != len(MODELES[modele]):
+            raise ValueError(f"Le modèle {modele} attend {len(MODELES[modele])} paramètres.")
+        self.modele = modele
+        self.residus = None
+        self.rmse_pb = self.max_pb = self.duree = None
+        self.iterations = 0
+        self.succes = True
+
+    def __call__(self, t) -> np.ndarray:
+        return taux_nss(t, self.params)
+
+    def discount(self, t) -> np.ndarray:
+        """Facteurs d'actualisation (1 + z(t)) ** -t, même convention que CurveInterpolator."""
+        t = np.asarray(t, dtype=float)
+        return (1 + self(t)) ** -t
+
+    def to_dict(self) -> dict:
+        return dict(zip(MODELES[self.modele], self.params.tolist()))
+
+
+def fit_nss(maturites, taux, modele: str = "nss", depart=None, poids=None) -> CourbeNSS:
+    """
+    Ajuste un modèle Nelson-Siegel ('ns') ou Svensson ('nss') sur des taux zéro-coupon.
+
+    Moindres carrés non linéaires (`scipy.optimize.least_squares`, région de confiance) avec
+    résidus vectorisés et jacobien analytique ; les tau sont bornés à [TAU_MIN, TAU_MAX].
+    `depart` permet de partir des paramètres d'une autre courbe (ex : la veille).
+    """
+    T = np.asarray(maturites, dtype=float)
+    z = np.asarray(taux, dtype=float)
+    if T.shape != z.shape or T.ndim != 1:
+        raise ValueError("Les maturités et les taux doivent être des vecteurs de même longueur.")
+    n_params = len(MODELES[modele])
+    if T.size < n_params:
+        raise ValueError(f"Au moins {n_params} piliers sont nécessaires pour le modèle {modele}.")
+    w = np.ones(T.size) if poids is None else np.sqrt(np.asarray(poids, dtype=float))
+    from scipy.optimize import least_squares
+
+    n_tau = 1 if modele == "ns" else 2
+    bas = np.r_[np.full(n_params - n_tau, -np.inf), np.full(n_tau, TAU_MIN)]
+    haut = np.r_[np.full(n_params - n_tau, np.inf), np.full(n_tau, TAU_MAX)]
+    x0 = params_initiaux(T, z, modele) if depart is None else np.asarray(depart, dtype=float)
+    x0 = np.clip(x0, bas + 1e-12, haut - 1e-12)
+
+    debut = time.perf_counter()
+    res = least_squares(lambda p: w * (taux_nss(T, p) - z),
+                        x0, jac=lambda p: w[:, None] * jacobien_nss(T, p),
+                        bounds=(bas, haut), method="trf", x_scale="jac")
+    courbe = CourbeNSS(res.x, modele)
+    courbe.duree = time.perf_counter() - debut
+    courbe.residus = taux_nss(T, res.x) - z
+    courbe.rmse_pb = float(np.sqrt(np.mean(courbe.residus ** 2)) * 1e4)
+    courbe.max_pb = float(np.max(np.abs(courbe.residus)) * 1e4)
+    courbe.iterations = int(res.nfev)
+    courbe.succes = bool(res.success)
+    return courbe
+
+
+def depuis_resultats(df: pd.DataFrame, modele: str = "nss", depart=None) -> CourbeNSS:
+    """Ajuste la courbe sur la sortie de `process_dataframe` (colonnes 'maturite_annees', 'Taux_zero_coupon')."""
+    return fit_nss(df["maturite_annees"], df["Taux_zero_coupon"], modele, depart)
+
+
+def _ajuster_serie(series, modele, depart=None):
+    """
+    Ajuste une suite chronologique de courbes [(date, maturités, taux)], chacune partant
+    des paramètres de la précédente. Si le départ à chaud échoue, on reprend à froid.
+    """
+    lignes = []
+    for date_pub, T, z in series:
+        try:
+            courbe = fit_nss(T, z, modele, depart)
+            if depart is not None and not courbe.succes:
+                courbe = fit_nss(T, z, modele)
+        except ValueError as e:
+            lignes.append({COL_DATE: date_pub, "succes": False, "erreur": str(e), "n_piliers": len(T)})
+            continue
+        depart = courbe.params
+        lignes.append({COL_DATE: date_pub, **courbe.to_dict(), "rmse_pb": courbe.rmse_pb,
+                       "max_pb": courbe.max_pb, "duree_s": courbe.duree, "iterations": courbe.iterations,
+                       "succes": courbe.succes, "n_piliers": len(T)})
+    return lignes
+
+
+def fit_historique(courbes, modele: str = "nss", max_workers=None, depart=None) -> pd.DataFrame:
+    """
+    Ajuste le modèle sur un historique de courbes.
+
+    Parameters
+    ----------
+    courbes : dict ou pd.DataFrame
+        {date: sortie de `process_dataframe`} ou DataFrame long de `process_panel`
+        (colonne 'Date publication').
+    max_workers : int, optional
+        Processus utilisés. L'historique est découpé en autant de plages de dates contiguës :
+        dans chaque plage, chaque date part des paramètres de la date précédente.
+    depart : array-like, optional
+        Paramètres de départ de la première date de chaque plage.
+
+    Returns
+    -------
+    pd.DataFrame
+        Une ligne par date : paramètres, 'rmse_pb', 'max_pb' (résidus en points de base),
+        'duree_s' (temps d'ajustement), 'iterations', 'succes' et 'n_piliers'.
+    """
+    if isinstance(courbes, pd.DataFrame):
+        courbes = dict(tuple(courbes.groupby(COL_DATE, sort=True)))
+    series = [(d, courbes[d]["maturite_annees"].to_numpy(dtype=float),
+               courbes[d]["Taux_zero_coupon"].to_numpy(dtype=float)) for d in sorted(courbes)]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(series)))
+    taille = -(-len(series) // max_workers) if series else 1
+    plages = [series[i:i + taille] for i in range(0, len(series), taille)]
+
+    if max_workers == 1 or len(plages) <= 1:
+        lignes = [l for plage in plages for l in _ajuster_serie(plage, modele, depart)]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_ajuster_serie, plage, modele, depart) for plage in plages]
+            lignes = [l for f in futures for l in f.result()]
+
+    colonnes = [COL_DATE, *MODELES[modele], "rmse_pb", "max_pb", "duree_s", "iterations", "succes", "n_piliers"]
+    resultat = pd.DataFrame(lignes)
+    return resultat.reindex(columns=colonnes + (["erreur"] if "erreur" in resultat.columns else [])) \
+        .set_index(COL_DATE)
@@ -0,0 +1,211 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from src.interpolation import CurveInterpolator
+from src.sensitivities import KEY_RATES
+
+FACTEURS = ("niveau", "pente", "courbure")
+
+
+class CovarianceEnLigne:
+    """
+    Moyenne et covariance d'observations arrivant par blocs (une date ou plusieurs), mises à
+    jour par la formule de fusion de Chan/Welford : chaque ajout coûte O(p²) pour p ténors,
+    sans conserver ni relire les observations passées.
+    """
+
+    def __init__(self, p: int):
+        self.n = 0
+        self.moyenne = np.zeros(p)
+        self.m2 = np.zeros((p, p))  # somme des produits croisés centrés
+
+    def ajouter(self, X):
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        X = X[np.isfinite(X).all(axis=1)]  # lignes incomplètes ignorées
+        m = len(X)
+        if m == 0:
+            return
+        moyenne_bloc = X.mean(axis=0)
+        centre = X - moyenne_bloc
+        delta = moyenne_bloc - self.moyenne
+        n = self.n + m
+        self.m2 += centre.T @ centre + np.outer(delta, delta) * (self.n * m / n)
+        self.moyenne += delta * (m / n)
+        self.n = n
+
+    @property
+    def covariance(self) -> np.ndarray:
+        if self.n < 2:
+            return np.full_like(self.m2, np.nan)
+        return self.m2 / (self.n - 1)
+
+
+def _orienter(vecteurs: np.ndarray) -> np.ndarray:
+    """
+    Signes des vecteurs propres fixés pour que les facteurs gardent leur sens d'une mise à
+    jour à l'autre : niveau à charges positives, pente croissante avec la maturité, courbure
+    positive au milieu de la grille ; au-delà, plus grande charge positive.
+    """
+    milieu = vecteurs.shape[0] // 2
+    orientes = vecteurs.copy()
+    for k in range(vecteurs.shape[1]):
+        v = vecteurs[:, k]
+        if k == 0:
+            critere = v.sum()
+        elif k == 1:
+            critere = v[-1] - v[0]
+        elif k == 2:
+            critere = v[milieu] - (v[0] + v[-1]) / 2
+        else:
+            critere = v[np.argmax(np.abs(v))]
+        if critere < 0:
+            orientes[:, k] = -v
+    return orientes
+
+
+class ACPCourbes:
+    """
+    Analyse en composantes principales (niveau, pente, courbure) de l'historique des courbes
+    zéro-coupon sur une grille fixe de ténors, mise à jour date par date.
+
+    Seules la moyenne et la covariance des observations (variations quotidiennes des taux
+    par défaut, ou niveaux si `variations=False`) et la dernière courbe sont conservées :
+    ajouter une date ne relit pas l'historique, et les charges, la variance expliquée et les
+    scores sont recalculés à la demande par décomposition de la seule matrice p × p.
+    """
+
+    def __init__(self, tenors=KEY_RATES, n_facteurs: int = 3, variations: bool = True):
+        self.tenors = np.asarray(tenors, dtype=float)
+        self.n_facteurs = min(n_facteurs, self.tenors.size)
+        self.variations = variations
+        self.stats = CovarianceEnLigne(self.tenors.size)
+        self.derniere_date = None
+        self.derniere_courbe = None
+        self.derniere_observation = None
+        self._decomposition = None
+
+    # ------------------------------------------------------------------ mise à jour
+    def grille(self, df: pd.DataFrame) -> np.ndarray:
+        """ZC d'une courbe (sortie de `process_dataframe`) aux ténors de la grille."""
+        return CurveInterpolator(df["maturite_annees"], df["Taux_zero_coupon"])(self.tenors)
+
+    def ajouter(self, date_pub, df: pd.DataFrame):
+        """Ajoute la courbe d'une nouvelle date de publication."""
+        self.ajouter_grille([date_pub], self.grille(df)[None, :])
+
+    def ajouter_grille(self, dates, matrice):
+        """
+        Ajoute plusieurs dates d'un coup : `matrice` (dates × ténors) des ZC sur la grille,
+        dates strictement croissantes et postérieures à la dernière date ajoutée.
+        """
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        if len(dates) == 0:
+            return
+        X = np.asarray(matrice, dtype=float).reshape(len(dates), -1)
+        if X.shape[1] != self.tenors.size:
+            raise ValueError(f"{X.shape[1]} taux par date pour {self.tenors.size} ténors.")
+        if not dates.is_monotonic_increasing or dates.has_duplicates or \
+                (self.derniere_date is not None and dates[0] <= self.derniere_date):
+            raise ValueError("Les dates ajoutées doivent être croissantes et postérieures à la dernière date.")
+
+        if self.variations:
+            suite = X if self.derniere_courbe is None else np.vstack([self.derniere_courbe, X])
+            observations = np.diff(suite, axis=0)
+        else:
+            observations = X
+        self.stats.ajouter(observations)
+        if len(observations):
+            self.derniere_observation = observations[-1]
+        self.derniere_date = dates[-1]
+        self.derniere_courbe = X[-1]
+        self._decomposition = None
+
+    def ajouter_store(self, store) -> int:
+        """
+        Ajoute les dates d'un `CurveStore` postérieures à la dernière date déjà prise en compte
+        (une série par ténor, lue sur la seule plage nouvelle). Retourne le nombre de dates ajoutées.
+        """
+        debut = None if self.derniere_date is None else self.derniere_date + pd.Timedelta(days=1)
+        series = pd.concat([store.serie(t, debut) for t in self.tenors], axis=1)
+        self.ajouter_grille(series.index, series.to_numpy())
+        return len(series)
+
+    # ------------------------------------------------------------------ résultats
+    def _decomposer(self):
+        if self._decomposition is None:
+            if self.stats.n < 2:
+                raise ValueError("Au moins deux observations sont nécessaires pour l'ACP.")
+            valeurs, vecteurs = np.linalg.eigh(self.stats.covariance)
+            ordre = np.argsort(valeurs)[::-1]
+            self._decomposition = (np.clip(valeurs[ordre], 0, None), _orienter(vecteurs[:, ordre]))
+        return self._decomposition
+
+    @property
+    def noms(self) -> list:
+        return [FACTEURS[k] if k < len(FACTEURS) else f"facteur_{k + 1}" for k in range(self.n_facteurs)]
+
+    @property
+    def charges(self) -> pd.DataFrame:
+        """Charges des facteurs (ténors × facteurs), vecteurs propres normés."""
+        _, vecteurs = self._decomposer()
+        return pd.DataFrame(vecteurs[:, :self.n_facteurs], index=pd.Index(self.tenors, name="tenor"),
+                            columns=self.noms)
+
+    @property
+    def variance_expliquee(self) -> pd.Series:
+        """Part de la variance totale expliquée par chaque facteur."""
+        valeurs, _ = self._decomposer()
+        total = valeurs.sum()
+        return pd.Series(valeurs[:self.n_facteurs] / total if total > 0 else np.nan, index=self.noms,
+                         name="variance_expliquee")
+
+    def scores(self, observations=None) -> pd.DataFrame:
+        """
+        Coordonnées d'observations sur les facteurs : (x - moyenne) · charges. Les observations
+        sont de même nature que celles de l'ACP (variations si `variations=True`) ; par défaut
+        la dernière observation ajoutée.
+        """
+        if observations is None:
+            if self.derniere_observation is None:
+                raise ValueError("Aucune observation ajoutée : précisez les observations à projeter.")
+            observations = self.derniere_observation[None, :]
+            index = pd.DatetimeIndex([self.derniere_date])
+        else:
+            index = observations.index if isinstance(observations, pd.DataFrame) else None
+        _, vecteurs = self._decomposer()
+        X = np.atleast_2d(np.asarray(observations, dtype=float))
+        return pd.DataFrame((X - self.stats.moyenne) @ vecteurs[:, :self.n_facteurs], index=index,
+                            columns=self.noms)
+
+    # ------------------------------------------------------------------ persistance
+    def sauvegarder(self, chemin: str):
+        """État (statistiques et dernière courbe) en JSON, remplacé de façon atomique."""
+        etat = {
+            "tenors": self.tenors.tolist(), "n_facteurs": self.n_facteurs, "variations": self.variations,
+            "n": self.stats.n, "moyenne": self.stats.moyenne.tolist(), "m2": self.stats.m2.tolist(),
+            "derniere_date": None if self.derniere_date is None else self.derniere_date.isoformat(),
+            "derniere_courbe": None if self.derniere_courbe is None else self.derniere_courbe.tolist(),
+            "derniere_observation": None if self.derniere_observation is None else self.derniere_observation.tolist(),
+        }
+        tmp = f"{chemin}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(etat, f)
+        os.replace(tmp, chemin)
+
+    @classmethod
+    def charger(cls, chemin: str) -> "ACPCourbes":
+        with open(chemin, encoding="utf-8") as f:
+            etat = json.load(f)
+        acp = cls(etat["tenors"], etat["n_facteurs"], etat["variations"])
+        acp.stats.n = etat["n"]
+        acp.stats.moyenne = np.array(etat["moyenne"], dtype=float)
+        acp.stats.m2 = np.array(etat["m2"], dtype=float)
+        if etat["derniere_date"] is not None:
+            acp.derniere_date = pd.Timestamp(etat["derniere_date"])
+            acp.derniere_courbe = np.array(etat["derniere_courbe"], dtype=float)
+        if etat["derniere_observation"] is not None:
+            acp.derniere_observation = np.array(etat["derniere_observation"], dtype=float)
+        return acp
@@ -0,0 +1,145 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MAX_FIGURES = 64      # figures sérialisées gardées en cache
+MAX_POINTS = 1_000    # points par série au-delà desquels l'historique est sous-échantillonné
+# plotly n'est importé qu'à la construction d'une figure : il ne pèse pas sur le démarrage
+
+_figures = OrderedDict()
+_verrou = threading.Lock()
+
+
+def version_courbe(*colonnes) -> str:
+    """Empreinte des données d'une courbe : deux courbes identiques ont la même version."""
+    h = hashlib.blake2b(digest_size=16)
+    for colonne in colonnes:
+        valeurs = np.ascontiguousarray(np.asarray(colonne, dtype=float))
+        h.update(valeurs.shape[0].to_bytes(8, "little"))
+        h.update(valeurs.tobytes())
+    return h.hexdigest()
+
+
+def _figure_en_cache(cle, construire) -> str:
+    """
+    HTML de la figure identifiée par `cle`, construit et sérialisé une seule fois.
+    Le cache est borné à MAX_FIGURES entrées (les moins récemment utilisées sont retirées).
+    """
+    with _verrou:
+        if cle in _figures:
+            _figures.move_to_end(cle)
+            return _figures[cle]
+    html = construire().to_html(full_html=False, include_plotlyjs="cdn")
+    with _verrou:
+        _figures[cle] = html
+        _figures.move_to_end(cle)
+        while len(_figures) > MAX_FIGURES:
+            _figures.popitem(last=False)
+    return html
+
+
+def _mise_en_page(fig, titre, titre_x, titre_y):
+    fig.update_layout(title=titre, xaxis_title=titre_x, yaxis_title=titre_y,
+                      template="plotly_white", hovermode="x unified",
+                      margin=dict(l=40, r=20, t=50, b=40), height=420)
+    return fig
+
+
+def create_yield_curve_chart(df: pd.DataFrame) -> str:
+    """
+    Courbe zéro-coupon (et actuarielle si la colonne 'Taux_actuariel' est présente),
+    en HTML à insérer dans le template. La figure est mise en cache par version de courbe.
+    """
+    colonnes = [c for c in ("Taux_zero_coupon", "Taux_actuariel") if c in df.columns]
+    mats = df["maturite_annees"].to_numpy(dtype=float)
+    cle = ("zc", version_courbe(mats, *(df[c] for c in colonnes)))
+
+    def construire():
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
+        noms = {"Taux_zero_coupon": "Taux zéro-coupon", "Taux_actuariel": "Taux actuariel"}
+        for c in colonnes:
+            fig.add_trace(go.Scatter(x=mats, y=df[c].to_numpy(dtype=float) * 100,
+                                     mode="lines+markers", name=noms[c]))
+        return _mise_en_page(fig, "Courbe des taux", "Maturité (années)", "Taux (%)")
+
+    return _figure_en_cache(cle, construire)
+
+
+def create_forward_curve_chart(mats_end, forwards) -> str:
+    """Courbe des taux forwards (en fin de période), mise en cache par version."""
+    mats_end = np.asarray(mats_end, dtype=float)
+    forwards = np.asarray(forwards, dtype=float)
+    cle = ("forward", version_courbe(mats_end, forwards))
+
+    def construire():
+        import plotly.graph_objects as go
+
+        fig = go.Figure(go.Scatter(x=mats_end, y=forwards * 100, mode="lines+markers",
+                                   name="Taux forward"))
+        return _mise_en_page(fig, "Courbe des taux forwards", "Maturité (années)", "Taux forward (%)")
+
+    return _figure_en_cache(cle, construire)
+
+
+def lttb(x, y, n_points: int) -> np.ndarray:
+    """
+    Sous-échantillonnage « Largest-Triangle-Three-Buckets » : indices des `n_points` points
+    conservés (premier et dernier compris). Les points intérieurs sont répartis en seaux ;
+    dans chaque seau on garde le point formant le plus grand triangle avec le point retenu
+    précédemment et la moyenne du seau suivant, ce qui préserve pics et creux de la série.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = x.size
+    if n_points >= n or n_points < 3:
+        return np.arange(n)
+
+    bornes = np.linspace(1, n - 1, n_points - 1).astype(np.int64)
+    # Moyenne de chaque seau ; le « seau suivant » du dernier est le dernier point
+    sommes_x = np.add.reduceat(x[1:n - 1], bornes[:-1] - 1)
+    sommes_y = np.add.reduceat(y[1:n - 1], bornes[:-1] - 1)
+    tailles = np.diff(bornes)
+    moy_x = np.r_[sommes_x / tailles, x[-1]]
+    moy_y = np.r_[sommes_y / tailles, y[-1]]
+
+    indices = np.empty(n_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_points - 2):
+        debut, fin = bornes[i], bornes[i + 1]
+        xs, ys = x[debut:fin], y[debut:fin]
+        aires = np.abs((x[a] - moy_x[i + 1]) * (ys - y[a]) - (x[a] - xs) * (moy_y[i + 1] - y[a]))
+        a = debut + int(np.argmax(aires))
+        indices[i + 1] = a
+    return indices
+
+
+def create_history_chart(historique: pd.DataFrame, titre: str = "Historique des taux",
+                         max_points: int = MAX_POINTS) -> str:
+    """
+    Historique multi-dates (index : dates, une colonne par série, ex : un taux par ténor,
+    en décimal). Chaque série de plus de `max_points` points est réduite par LTTB : la taille
+    de la figure et le temps de rendu restent bornés quand l'historique s'allonge.
+    """
+    index = pd.to_datetime(historique.index)
+    x = index.asi8.astype(float)
+    cle = ("historique", titre, max_points, version_courbe(x, *(historique[c] for c in historique.columns)),
+           tuple(map(str, historique.columns)))
+
+    def construire():
+        import plotly.graph_objects as go
+
+        fig = go.Figure()
+        for colonne in historique.columns:
+            y = historique[colonne].to_numpy(dtype=float)
+            valide = np.flatnonzero(~np.isnan(y))
+            garder = valide[lttb(x[valide], y[valide], max_points)]
+            fig.add_trace(go.Scatter(x=index[garder], y=y[garder] * 100, mode="lines", name=str(colonne)))
+        return _mise_en_page(fig, titre, "Date", "Taux (%)")
+
+    return _figure_en_cache(cle, construire)
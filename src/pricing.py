@@ -0,0 +1,128 @@
+import numpy as np
+import pandas as pd
+
+JOURS_PAR_AN = 365
+
+
+def _ajouter_mois(jours: np.ndarray, mois: np.ndarray) -> np.ndarray:
+    """
+    Décale des dates (datetime64[D]) de `mois` mois, jour ramené à la fin du mois si besoin
+    (ex : 31/03 - 1 mois = 28/02 ou 29/02).
+
+    Les conversions calendaires datetime64[M] -> [D] étant coûteuses, elles ne sont faites
+    que sur la plage de mois concernée, puis lues par indice.
+    """
+    mois_base = jours.astype("datetime64[M]").astype(np.int64)
+    cible = mois_base + mois
+    premier = min(mois_base.min(), cible.min())
+    debuts = np.arange(premier, max(mois_base.max(), cible.max()) + 2) \
+        .astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+    jour = jours.astype(np.int64) - debuts[mois_base - premier]
+    debut_cible = debuts[cible - premier]
+    longueur = debuts[cible - premier + 1] - debut_cible
+    return (debut_cible + np.minimum(jour, longueur - 1)).view("datetime64[D]")
+
+
+def echeanciers(echeances, frequences, date_valorisation):
+    """
+    Construit les échéanciers de coupons de toutes les obligations sous forme de matrices
+    (obligations × flux restants), en remontant depuis l'échéance par pas de 12/fréquence mois.
+
+    Returns
+    -------
+    dates : np.ndarray datetime64[D]
+        Dates des flux restants, (n, k) ; les cases au-delà du dernier flux sont masquées.
+    masque : np.ndarray bool
+        Flux existants.
+    precedent : np.ndarray datetime64[D]
+        Date du dernier coupon détaché (≤ date de valorisation), pour le coupon couru.
+    """
+    echeances = np.asarray(pd.to_datetime(echeances), dtype="datetime64[D]")
+    frequences = np.asarray(frequences, dtype=np.int64)
+    if np.any(12 % frequences):
+        raise ValueError("La fréquence des coupons doit diviser 12 (1, 2, 4 ou 12 par an).")
+    valo = np.datetime64(pd.Timestamp(date_valorisation).date(), "D")
+    if np.any(echeances <= valo):
+        raise ValueError("Toutes les échéances doivent être postérieures à la date de valorisation.")
+
+    pas = 12 // frequences
+    mois_restants = (echeances.astype("datetime64[M]") - valo.astype("datetime64[M]")).astype(np.int64)
+    nb_flux = mois_restants // pas + 2
+    k = np.arange(nb_flux.max())
+    # Colonne j : j-ième flux avant l'échéance ; on garde ceux postérieurs à la valorisation
+    dates = _ajouter_mois(echeances[:, None], -(k[None, :] * pas[:, None]))
+    masque = dates > valo
+    n_restants = masque.sum(axis=1)
+    precedent = dates[np.arange(dates.shape[0]), n_restants]
+    return dates, masque, precedent
+
+
+def flux_portefeuille(obligations: pd.DataFrame, date_valorisation):
+    """
+    Flux restants et coupon couru de chaque obligation.
+
+    Returns
+    -------
+    flux : np.ndarray
+        Montants (obligations, flux) ; 0 dans les cases sans flux.
+    jours : np.ndarray
+        Jours entre la valorisation et chaque flux (0 dans les cases sans flux).
+    coupon_couru : np.ndarray
+        Coupon couru à la date de valorisation.
+    """
+    nominal = obligations["Nominal"].to_numpy(dtype=float)
+    coupon_taux = obligations["Taux_coupon"].to_numpy(dtype=float)
+    if "Frequence" in obligations.columns:
+        frequences = obligations["Frequence"].to_numpy(dtype=np.int64)
+    else:
+        frequences = np.ones(len(obligations), dtype=np.int64)
+
+    dates, masque, precedent = echeanciers(obligations["Echeance"], frequences, date_valorisation)
+    valo = np.datetime64(pd.Timestamp(date_valorisation).date(), "D")
+
+    coupon = nominal * coupon_taux / frequences
+    flux = np.where(masque, coupon[:, None], 0.0)
+    flux[:, 0] += nominal  # la colonne 0 est l'échéance
+    jours = np.where(masque, (dates - valo).astype(np.int64), 0)
+
+    # Coupon couru : fraction de la période courante écoulée (jours réels / jours de la période)
+    prochain = dates[np.arange(dates.shape[0]), masque.sum(axis=1) - 1]
+    ecoule = (valo - precedent).astype(np.int64)
+    periode = (prochain - precedent).astype(np.int64)
+    return flux, jours, coupon * ecoule / periode
+
+
+def price_portfolio(obligations: pd.DataFrame, courbe, date_valorisation) -> pd.DataFrame:
+    """
+    Valorise un portefeuille d'obligations (Bons du Trésor) sur la courbe zéro-coupon.
+
+    Généralise `calcule_prix_dirty_corrected` (une obligation, un taux d'actualisation
+    unique) : tous les flux sont générés en matrices et actualisés en une passe avec les
+    facteurs d'actualisation de la courbe, aux maturités (jours / 365) depuis la valorisation.
+
+    Parameters
+    ----------
+    obligations : pd.DataFrame
+        Colonnes 'Nominal', 'Taux_coupon' (décimal), 'Echeance' (date) et, en option,
+        'Frequence' (coupons par an, 1 par défaut).
+    courbe : CurveInterpolator
+        Courbe dont la méthode `discount(t)` donne les facteurs d'actualisation.
+    date_valorisation : date
+        Date de valorisation, supposée égale à la date de base de la courbe.
+
+    Returns
+    -------
+    pd.DataFrame
+        'Prix_dirty', 'Coupon_couru' et 'Prix_clean' (en montant, même unité que le nominal),
+        ainsi que 'Prix_clean (%)' du nominal, indexé comme `obligations`.
+    """
+    flux, jours, coupon_couru = flux_portefeuille(obligations, date_valorisation)
+    prix_dirty = (flux * courbe.discount(jours / JOURS_PAR_AN)).sum(axis=1)
+
+    prix_clean = prix_dirty - coupon_couru
+    return pd.DataFrame({
+        "Prix_dirty": prix_dirty,
+        "Coupon_couru": coupon_couru,
+        "Prix_clean": prix_clean,
+        "Prix_clean (%)": prix_clean / obligations["Nominal"].to_numpy(dtype=float) * 100,
+    }, index=obligations.index)
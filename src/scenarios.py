@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import bootstrap_zc_matrice
+from src.interpolation import interpolate_lineaire_matrice
+
+
+def _matrice(valeurs, noms, maturites) -> pd.DataFrame:
+    return pd.DataFrame(valeurs, index=pd.Index(noms, name="Scénario"),
+                        columns=pd.Index(np.asarray(maturites, dtype=float), name="maturite_annees"))
+
+
+def choc_parallele(maturites, amplitudes_bp) -> pd.DataFrame:
+    """Déplacements parallèles de la courbe, un scénario par amplitude (points de base)."""
+    amplitudes = np.atleast_1d(np.asarray(amplitudes_bp, dtype=float))
+    chocs = np.repeat(amplitudes[:, None] / 1e4, np.asarray(maturites).size, axis=1)
+    return _matrice(chocs, [f"parallele {a:+g}pb" for a in amplitudes], maturites)
+
+
+def choc_twist(maturites, amplitudes_bp, pivot: float = 5.0) -> pd.DataFrame:
+    """
+    Rotations autour de la maturité `pivot` : choc nul au pivot, linéaire en maturité,
+    égal à l'amplitude à la maturité la plus longue (pentification si l'amplitude est positive).
+    """
+    T = np.asarray(maturites, dtype=float)
+    amplitudes = np.atleast_1d(np.asarray(amplitudes_bp, dtype=float))
+    profil = (T - pivot) / max(T.max() - pivot, 1e-12)
+    return _matrice(amplitudes[:, None] / 1e4 * profil, [f"twist {a:+g}pb" for a in amplitudes], T)
+
+
+def choc_papillon(maturites, amplitudes_bp, court: float = 2.0, centre: float = 5.0,
+                  long: float = 10.0) -> pd.DataFrame:
+    """
+    Papillons : ailes (≤ `court` et ≥ `long`) déplacées de l'amplitude, ventre (`centre`)
+    de l'amplitude opposée, interpolation linéaire entre les deux.
+    """
+    T = np.asarray(maturites, dtype=float)
+    amplitudes = np.atleast_1d(np.asarray(amplitudes_bp, dtype=float))
+    profil = np.interp(T, [court, centre, long], [1.0, -1.0, 1.0])
+    return _matrice(amplitudes[:, None] / 1e4 * profil, [f"papillon {a:+g}pb" for a in amplitudes], T)
+
+
+def chocs_historiques(historique: pd.DataFrame, maturites, horizon: int = 1) -> pd.DataFrame:
+    """
+    Chocs de VaR historique : variations observées des taux sur `horizon` dates consécutives.
+
+    `historique` a une ligne par date et une colonne par ténor (en années), en décimal
+    (ex : sortie pivotée de `process_panel`). Chaque variation est reportée sur les piliers
+    `maturites` par interpolation linéaire entre ténors, constante au-delà des extrémités.
+    """
+    historique = historique.sort_index().sort_index(axis=1)
+    tenors = historique.columns.to_numpy(dtype=float)
+    valeurs = historique.to_numpy(dtype=float)
+    variations = valeurs[horizon:] - valeurs[:-horizon]
+    garder = ~np.isnan(variations).any(axis=1)
+    T = np.asarray(maturites, dtype=float)
+    if tenors.size == 1:
+        chocs = np.repeat(variations[garder], T.size, axis=1)
+    else:
+        chocs = interpolate_lineaire_matrice(tenors, variations[garder], np.clip(T, tenors[0], tenors[-1]))
+    dates = historique.index[horizon:][garder]
+    return _matrice(chocs, [f"historique {pd.Timestamp(d):%Y-%m-%d}" for d in dates], T)
+
+
+def _bootstrap_lot(args):
+    T, taux = args
+    return bootstrap_zc_matrice(T, taux)
+
+
+def appliquer_scenarios(df_courbe: pd.DataFrame, chocs, scenarios_par_lot: int = 2_000,
+                        max_workers: int = 1):
+    """
+    Rebootstrappe la courbe sous chaque scénario de choc, en une passe matricielle.
+
+    Les chocs (en décimal, scénarios × piliers) s'ajoutent aux taux moyens pondérés
+    ('Taux_decimal' de la sortie de `process_dataframe`) ; tous les scénarios d'un lot sont
+    bootstrappés ensemble par `bootstrap_zc_matrice`. Les lots de `scenarios_par_lot`
+    bornent la mémoire intermédiaire ; avec `max_workers` > 1 ils sont répartis sur un pool
+    de processus.
+
+    Parameters
+    ----------
+    chocs : pd.DataFrame ou array-like
+        Matrice (scénarios, piliers) dans l'ordre des lignes de `df_courbe` (ex : sortie de
+        `choc_parallele`, `choc_twist`, `choc_papillon`, `chocs_historiques`, concaténées),
+        ou vecteur d'un seul scénario.
+
+    Returns
+    -------
+    zc : pd.DataFrame
+        Taux zéro-coupon (scénarios × maturités triées).
+    forwards : pd.DataFrame
+        Forwards entre piliers consécutifs (scénarios × maturité de fin), même règle que
+        `taux_forward`.
+    """
+    T = df_courbe["maturite_annees"].to_numpy(dtype=float)
+    taux = df_courbe["Taux_decimal"].to_numpy(dtype=float)
+    if isinstance(chocs, pd.DataFrame):
+        noms = chocs.index
+    elif isinstance(chocs, pd.Series) and chocs.name is not None:
+        noms = pd.Index([chocs.name], name="Scénario")  # une ligne d'une matrice de chocs
+    else:
+        noms = None
+    # Un vecteur seul est un scénario : atleast_2d avant de compter les scénarios
+    chocs = np.atleast_2d(np.asarray(chocs, dtype=float))
+    if noms is None:
+        noms = pd.RangeIndex(chocs.shape[0], name="Scénario")
+    if chocs.shape[1] != T.size:
+        raise ValueError("La matrice de chocs doit avoir une colonne par pilier de la courbe.")
+
+    ordre = np.argsort(T, kind="stable")
+    T, taux, chocs = T[ordre], taux[ordre], chocs[:, ordre]
+    lots = [(T, taux[None, :] + chocs[i:i + scenarios_par_lot])
+            for i in range(0, chocs.shape[0], scenarios_par_lot)]
+
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, len(lots)))
+    if max_workers == 1:
+        zc = np.vstack([_bootstrap_lot(lot) for lot in lots]) if lots else np.empty((0, T.size))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            zc = np.vstack(list(executor.map(_bootstrap_lot, lots)))
+
+    valide = np.diff(T) > 1e-6
+    debut, fin = T[:-1][valide], T[1:][valide]
+    forwards = (zc[:, 1:][:, valide] * fin - zc[:, :-1][:, valide] * debut) / (fin - debut)
+    return (pd.DataFrame(zc, index=noms, columns=pd.Index(T, name="maturite_annees")),
+            pd.DataFrame(forwards, index=noms, columns=pd.Index(fin, name="À (années)")))
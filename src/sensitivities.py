@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import bootstrap_zc_matrice
+from src.interpolation import interpolate_lineaire_matrice
+from src.pricing import flux_portefeuille, JOURS_PAR_AN
+
+KEY_RATES = (0.25, 0.5, 1, 2, 3, 5, 7, 10, 15, 20, 25, 30)
+
+
+def poids_key_rates(maturites, key_rates=KEY_RATES) -> np.ndarray:
+    """
+    Poids (key rates, piliers) des chocs key rate : triangle centré sur chaque maturité clé,
+    nul aux maturités clés voisines, constant au-delà de la première et de la dernière.
+    Les poids d'un pilier somment à 1 : la somme des chocs key rate est le choc parallèle.
+    """
+    key_rates = np.asarray(key_rates, dtype=float)
+    maturites = np.asarray(maturites, dtype=float)
+    identite = np.eye(key_rates.size)
+    return np.array([np.interp(maturites, key_rates, identite[j]) for j in range(key_rates.size)])
+
+
+def matrice_chocs(maturites, key_rates=KEY_RATES, bp: float = 1.0):
+    """
+    Matrice (scénarios, piliers) des chocs appliqués aux taux BAM, en décimal :
+    ligne 0 sans choc, lignes 1-2 choc parallèle +/- `bp` points de base, puis pour chaque
+    maturité clé un couple +/- `bp`.
+    """
+    h = bp / 1e4
+    poids = poids_key_rates(maturites, key_rates)
+    n = np.asarray(maturites).size
+    chocs = np.empty((3 + 2 * poids.shape[0], n))
+    chocs[0] = 0.0
+    chocs[1], chocs[2] = h, -h
+    chocs[3::2], chocs[4::2] = h * poids, -h * poids
+    return chocs
+
+
+def sensibilites(obligations: pd.DataFrame, df_courbe: pd.DataFrame, date_valorisation,
+                 key_rates=KEY_RATES, bp: float = 1.0, scenarios_par_lot: int = 8):
+    """
+    DV01, DV01 key rate et convexité de chaque obligation, par chocs de la courbe BAM.
+
+    Tous les chocs sont appliqués en une fois aux taux des piliers ('Taux_decimal' de la
+    sortie de `process_dataframe`), rebootstrappés ensemble par `bootstrap_zc_matrice`,
+    puis le portefeuille entier est revalorisé pour chaque scénario. Les facteurs
+    d'actualisation ne sont calculés que sur les dates de flux distinctes, et les scénarios
+    sont traités par lots de `scenarios_par_lot` pour borner la mémoire.
+
+    Returns
+    -------
+    sens : pd.DataFrame
+        'Prix_dirty', 'DV01' (baisse de prix pour +1 pb), 'Duration_modifiee' et 'Convexite',
+        indexé comme `obligations`.
+    krd : pd.DataFrame
+        DV01 par maturité clé (obligations × key rates).
+    """
+    T = df_courbe["maturite_annees"].to_numpy(dtype=float)
+    taux = df_courbe["Taux_decimal"].to_numpy(dtype=float)
+    ordre = np.argsort(T, kind="stable")
+    T, taux = T[ordre], taux[ordre]
+
+    chocs = matrice_chocs(T, key_rates, bp)
+    zc = bootstrap_zc_matrice(T, taux[None, :] + chocs)
+    # Maturités en double : on garde le dernier pilier, comme CurveInterpolator
+    garder = np.r_[T[1:] != T[:-1], True]
+    T, zc = T[garder], zc[:, garder]
+
+    flux, jours, _ = flux_portefeuille(obligations, date_valorisation)
+    jours_uniques, inverse = np.unique(jours, return_inverse=True)
+    inverse = inverse.reshape(jours.shape)
+    t = jours_uniques / JOURS_PAR_AN
+
+    prix = np.empty((chocs.shape[0], flux.shape[0]))
+    for debut in range(0, chocs.shape[0], scenarios_par_lot):
+        lot = slice(debut, debut + scenarios_par_lot)
+        actualisation = (1 + interpolate_lineaire_matrice(T, zc[lot], t)) ** -t
+        prix[lot] = (flux[None, :, :] * actualisation[:, inverse]).sum(axis=-1)
+
+    h = bp / 1e4
+    p0, p_haut, p_bas = prix[0], prix[1], prix[2]
+    dv01 = (p_bas - p_haut) / 2 / bp
+    sens = pd.DataFrame({
+        "Prix_dirty": p0,
+        "DV01": dv01,
+        "Duration_modifiee": dv01 / p0 * 1e4,
+        "Convexite": (p_haut + p_bas - 2 * p0) / (p0 * h ** 2),
+    }, index=obligations.index)
+    krd = pd.DataFrame(((prix[4::2] - prix[3::2]) / 2 / bp).T, index=obligations.index,
+                       columns=pd.Index(list(key_rates), name="Key rate (années)"))
+    return sens, krd
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from src.interpolation import CurveInterpolator
+from src.metrics import compter
+
+
+def empreinte(df: pd.DataFrame) -> str:
+    """Empreinte du contenu d'un DataFrame (valeurs et noms de colonnes, index exclu)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _taille(objet) -> int:
+    if isinstance(objet, pd.DataFrame):
+        return int(objet.memory_usage(deep=True).sum())
+    if isinstance(objet, pd.Series):
+        return int(objet.memory_usage(deep=True))
+    return 0
+
+
+class EntreeCourbe:
+    """
+    Courbe calculée partagée par toutes les sessions qui ont obtenu le même résultat.
+    Les objets dérivés (interpolateur) sont construits une seule fois, à la première demande,
+    sous le verrou de l'entrée. Le DataFrame est partagé : il ne doit pas être modifié sur place.
+    """
+
+    def __init__(self, version: str, df: pd.DataFrame, extras: dict):
+        self.version = version
+        self.df = df
+        self.extras = extras
+        self.taille = _taille(df) + sum(_taille(v) for v in extras.values())
+        self._interpolateur = None
+        self._derives = {}
+        self._verrou = threading.RLock()  # une fabrique peut demander un autre objet dérivé
+
+    def __getitem__(self, cle):
+        return self.extras[cle]
+
+    def get(self, cle, defaut=None):
+        return self.extras.get(cle, defaut)
+
+    def completer(self, extras: dict) -> int:
+        """Ajoute les objets liés absents de l'entrée ; retourne la taille ajoutée (octets)."""
+        ajout = 0
+        with self._verrou:
+            for cle, valeur in extras.items():
+                if cle not in self.extras:
+                    self.extras[cle] = valeur
+                    ajout += _taille(valeur)
+            self.taille += ajout
+        return ajout
+
+    @property
+    def interpolateur(self) -> CurveInterpolator:
+        with self._verrou:
+            if self._interpolateur is None:
+                self._interpolateur = CurveInterpolator(self.df["maturite_annees"], self.df["Taux_zero_coupon"])
+            return self._interpolateur
+
+    def derive(self, cle: str, fabrique):
+        """Objet dérivé de la courbe (moteur de forwards...), construit par `fabrique()` au premier appel."""
+        with self._verrou:
+            objet = self._derives.get(cle)
+            if objet is None:
+                objet = self._derives[cle] = fabrique()
+            return objet
+
+
+class SessionCurveCache:
+    """
+    Cache en mémoire des courbes calculées, par session et par contenu.
+
+    Chaque session pointe vers une entrée identifiée par l'empreinte de sa courbe : deux
+    utilisateurs qui importent la même courbe partagent la même entrée. Les entrées sont
+    évincées de la moins récemment utilisée à la plus récente dès que la taille estimée
+    dépasse `max_octets` ; une session dont l'entrée a été évincée (ou traitée par un autre
+    processus) n'a plus de courbe et doit la recalculer. Toutes les opérations sont protégées
+    par un verrou pour les serveurs multi-threads.
+    """
+
+    def __init__(self, max_octets: int = 256 * 1024 * 1024, max_sessions: int = 10_000):
+        self.max_octets = max_octets
+        self.max_sessions = max_sessions
+        self._entrees = OrderedDict()   # version -> EntreeCourbe, de la moins à la plus récente
+        self._sessions = OrderedDict()  # session -> version
+        self._octets = 0
+        self._verrou = threading.Lock()
+
+    def deposer(self, session_id: str, df: pd.DataFrame, **extras) -> EntreeCourbe:
+        """
+        Associe la courbe `df` (et des objets liés : forwards, date de base...) à la session.
+        Si la même courbe est déjà en cache, l'entrée existante est réutilisée et complétée
+        des objets liés qu'elle n'a pas encore : chaque appelant retrouve ceux qu'il a déposés.
+        """
+        version = empreinte(df)
+        with self._verrou:
+            entree = self._entrees.get(version)
+            if entree is None:
+                entree = EntreeCourbe(version, df, extras)
+                self._entrees[version] = entree
+                self._octets += entree.taille
+            elif extras:
+                self._octets += entree.completer(extras)
+            self._entrees.move_to_end(version)
+            self._sessions[session_id] = version
+            self._sessions.move_to_end(session_id)
+            self._evincer()
+        return entree
+
+    def lire(self, session_id: str):
+        """Entrée de la session, ou None si elle n'en a pas (ou plus)."""
+        with self._verrou:
+            version = self._sessions.get(session_id)
+            entree = self._entrees.get(version) if version else None
+            if entree is None:
+                self._sessions.pop(session_id, None)
+            else:
+                self._entrees.move_to_end(version)
+                self._sessions.move_to_end(session_id)
+        compter("yield_curve_session_cache_total", 1, "Consultations du cache de courbes par session",
+                resultat="hit" if entree is not None else "miss")
+        return entree
+
+    def oublier(self, session_id: str):
+        with self._verrou:
+            self._sessions.pop(session_id, None)
+
+    def _evincer(self):
+        # L'entrée qui vient d'être déposée est la plus récente : elle est toujours gardée
+        while self._octets > self.max_octets and len(self._entrees) > 1:
+            _, entree = self._entrees.popitem(last=False)
+            self._octets -= entree.taille
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._verrou:
+            return {"entrees": len(self._entrees), "sessions": len(self._sessions), "octets": self._octets}
+
+
+def cache_sessions_par_defaut() -> SessionCurveCache:
+    """Cache de l'application, borné par CURVE_CACHE_MAX_MO (Mo, 256 par défaut)."""
+    max_mo = float(os.environ.get("CURVE_CACHE_MAX_MO") or 256)
+    return SessionCurveCache(max_octets=int(max_mo * 1024 * 1024))
@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+
+
+class FauxBam:
+    """
+    Serveur HTTP local qui imite l'export CSV de BAM : GET /export?date=jj/mm/aaaa&block=...
+
+    `reponse(date, numero_appel)` retourne `(statut, corps, delai_s)` ; par défaut, une courbe
+    synthétique de 20 piliers pour toute date. Les appels reçus sont enregistrés dans
+    `appels` (date, instant monotone).
+    """
+
+    def __init__(self):
+        self.appels = []
+        self.compteurs = defaultdict(int)
+        self.reponse = lambda date_pub, n: (200, generer_csv_bam(20, date_pub), 0.0)
+        self._verrou = threading.Lock()
+        faux = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                date_str = parse_qs(urlparse(self.path).query)["date"][0]
+                date_pub = pd.to_datetime(date_str, format="%d/%m/%Y").date()
+                with faux._verrou:
+                    faux.appels.append((date_pub, time.monotonic()))
+                    faux.compteurs[date_pub] += 1
+                    n = faux.compteurs[date_pub]
+                statut, corps, delai = faux.reponse(date_pub, n)
+                if delai:
+                    time.sleep(delai)
+                try:
+                    self.send_response(statut)
+                    self.send_header("Content-Length", str(len(corps)))
+                    self.end_headers()
+                    self.wfile.write(corps)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client parti sur timeout
+
+            def log_message(self, *args):
+                pass
+
+        self.serveur = ThreadingHTTPServer(("127.0.0.1", 0), Gestionnaire)
+        self.serveur.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.serveur.server_address[1]}/export"
+
+    def dates_appelees(self):
+        return [d for d, _ in self.appels]
+
+
+@pytest.fixture
+def faux_bam():
+    faux = FauxBam()
+    thread = threading.Thread(target=faux.serveur.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield faux
+    faux.serveur.shutdown()
+    faux.serveur.server_close()
@@ -0,0 +1,115 @@
+import os
+from datetime import date
+
+import pytest
+
+import src.bam_cache as bam_cache
+import src.io_bam as io_bam
+from src.bam_cache import BamCache
+from src.io_bam import import_bam_curve, telecharger_bam_csv
+
+JOUR = date(2025, 10, 17)
+
+
+def _charger(cache, faux, d=JOUR):
+    return cache.charger(d, lambda d: telecharger_bam_csv(d, url_base=faux.url))
+
+
+def test_miss_puis_hit(tmp_path, faux_bam):
+    cache = BamCache(tmp_path)
+    premier = _charger(cache, faux_bam)
+    second = _charger(cache, faux_bam)
+
+    assert faux_bam.dates_appelees() == [JOUR]
+    assert second.equals(premier)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["2025-10-17.csv", "2025-10-17.pkl"]
+
+
+def test_import_bam_curve_passe_par_le_cache(tmp_path, faux_bam, monkeypatch):
+    monkeypatch.setattr(io_bam, "BAM_URL", faux_bam.url)
+    cache = BamCache(tmp_path)
+    df = import_bam_curve(JOUR, cache=cache)
+    assert import_bam_curve(JOUR, cache=cache).equals(df)
+    assert len(faux_bam.appels) == 1
+    assert {"Echeance", "Taux moyen pondéré"} <= set(df.columns)
+
+
+def test_reconstruction_depuis_le_csv_brut(tmp_path, faux_bam):
+    cache = BamCache(tmp_path)
+    df = _charger(cache, faux_bam)
+    os.remove(tmp_path / "2025-10-17.pkl")
+
+    hors_ligne = BamCache(tmp_path, hors_ligne=True)
+    assert _charger(hors_ligne, faux_bam).equals(df)
+    assert len(faux_bam.appels) == 1
+    assert (tmp_path / "2025-10-17.pkl").exists()
+
+
+def _vieillir(dossier, cle, age):
+    for ext in (".csv", ".pkl"):
+        chemin = dossier / f"{cle}{ext}"
+        instant = os.stat(chemin).st_mtime - age
+        os.utime(chemin, (instant, instant))
+
+
+def test_eviction_par_nombre_d_entrees(tmp_path, faux_bam):
+    cache = BamCache(tmp_path, max_entrees=2)
+    _charger(cache, faux_bam, date(2025, 10, 15))
+    _vieillir(tmp_path, "2025-10-15", 20)
+    _charger(cache, faux_bam, date(2025, 10, 16))
+    _vieillir(tmp_path, "2025-10-16", 10)
+    _charger(cache, faux_bam, date(2025, 10, 17))
+
+    assert [e[0] for e in cache.entrees()] == ["2025-10-16", "2025-10-17"]
+    # La date évincée est retéléchargée, celles en cache non
+    _charger(cache, faux_bam, date(2025, 10, 17))
+    _charger(cache, faux_bam, date(2025, 10, 15))
+    assert faux_bam.compteurs[date(2025, 10, 15)] == 2
+    assert faux_bam.compteurs[date(2025, 10, 17)] == 1
+
+
+def test_eviction_par_age_et_par_taille(tmp_path, faux_bam):
+    cache = BamCache(tmp_path, max_age=3600)
+    _charger(cache, faux_bam, date(2025, 10, 16))
+    _vieillir(tmp_path, "2025-10-16", 7200)
+    _charger(cache, faux_bam, date(2025, 10, 17))
+    assert [e[0] for e in cache.entrees()] == ["2025-10-17"]
+
+    taille = cache.stats()["octets"]
+    petit = BamCache(tmp_path, max_octets=taille)
+    _vieillir(tmp_path, "2025-10-17", 10)
+    _charger(petit, faux_bam, date(2025, 10, 20))
+    assert [e[0] for e in petit.entrees()] == ["2025-10-20"]
+
+
+def test_mode_hors_ligne_sans_reseau(tmp_path, faux_bam):
+    cache = BamCache(tmp_path, hors_ligne=True)
+    with pytest.raises(ValueError, match="hors ligne"):
+        _charger(cache, faux_bam)
+    assert faux_bam.appels == []
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_par_defaut_hors_ligne_par_environnement(tmp_path, faux_bam, monkeypatch):
+    monkeypatch.setattr(bam_cache, "_cache_defaut", None)
+    monkeypatch.setattr(io_bam, "BAM_URL", faux_bam.url)
+    monkeypatch.setenv("BAM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("BAM_HORS_LIGNE", "1")
+
+    cache = bam_cache.cache_par_defaut()
+    assert cache.hors_ligne and cache.dossier == str(tmp_path)
+    with pytest.raises(ValueError, match="hors ligne"):
+        import_bam_curve(JOUR)
+    assert faux_bam.appels == []
+
+
+def test_erreurs_du_serveur(tmp_path, faux_bam):
+    cache = BamCache(tmp_path)
+    faux_bam.reponse = lambda d, n: (404, b"", 0.0)
+    with pytest.raises(ValueError, match="code: 404"):
+        _charger(cache, faux_bam)
+    faux_bam.reponse = lambda d, n: (200, "Aucune donnée".encode("utf-8"), 0.0)
+    with pytest.raises(ValueError, match="Aucune donnée"):
+        _charger(cache, faux_bam)
+    assert cache.entrees() == []
@@ -0,0 +1,74 @@
+from datetime import date
+
+import numpy as np
+
+from benchmarks.synthetic import generer_csv_bam
+from src.bam_cache import BamCache
+from src.bam_downloader import jours_ouvres, telecharger_historique
+
+
+def _tout(faux, debut, fin, **options):
+    options = {"backoff": 0.01, "timeout": 5, "url_base": faux.url, **options}
+    return {d: (df, erreur) for d, df, erreur in telecharger_historique(debut, fin, **options)}
+
+
+def test_jours_feries_et_week_ends_ignores(faux_bam):
+    # 01/01/2025 (férié fixe) est un mercredi, 04-05/01 un week-end, 07/01 passé en férié
+    resultats = _tout(faux_bam, "2024-12-31", "2025-01-08", feries=["2025-01-07"])
+
+    attendues = [date(2024, 12, 31), date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 6), date(2025, 1, 8)]
+    assert sorted(resultats) == attendues
+    assert sorted(faux_bam.dates_appelees()) == attendues
+    assert all(erreur is None and len(df) == 20 for df, erreur in resultats.values())
+    assert jours_ouvres("2025-01-01", "2025-01-01") == []
+
+
+def test_limite_de_debit(faux_bam):
+    debit = 20.0
+    resultats = _tout(faux_bam, "2025-03-03", "2025-03-14", max_workers=8, requetes_par_seconde=debit)
+
+    instants = np.sort([t for _, t in faux_bam.appels])
+    assert len(resultats) == len(instants) == 10
+    # Seau à jetons : une requête toutes les 1/debit secondes, même avec 8 threads
+    assert instants[-1] - instants[0] >= (len(instants) - 1) / debit * 0.9
+    assert np.diff(instants).min() >= 1 / debit * 0.5
+
+
+def test_reessai_sur_erreur_5xx(faux_bam):
+    courbe = generer_csv_bam(20)
+    faux_bam.reponse = lambda d, n: (503, b"", 0.0) if n < 3 else (200, courbe, 0.0)
+    resultats = _tout(faux_bam, "2025-03-03", "2025-03-04", requetes_par_seconde=0)
+
+    assert all(erreur is None for _, erreur in resultats.values())
+    assert dict(faux_bam.compteurs) == {date(2025, 3, 3): 3, date(2025, 3, 4): 3}
+
+
+def test_reessai_sur_timeout(faux_bam):
+    courbe = generer_csv_bam(20)
+    faux_bam.reponse = lambda d, n: (200, courbe, 1.0 if n == 1 else 0.0)
+    resultats = _tout(faux_bam, "2025-03-03", "2025-03-03", timeout=0.2, requetes_par_seconde=0)
+
+    df, erreur = resultats[date(2025, 3, 3)]
+    assert erreur is None and len(df) == 20
+    assert faux_bam.compteurs[date(2025, 3, 3)] == 2
+
+
+def test_abandon_apres_les_tentatives_et_pas_de_reessai_sur_404(faux_bam):
+    faux_bam.reponse = lambda d, n: (500, b"", 0.0) if d.day == 3 else (404, b"", 0.0)
+    resultats = _tout(faux_bam, "2025-03-03", "2025-03-04", tentatives=3, requetes_par_seconde=0)
+
+    for d in resultats:
+        df, erreur = resultats[d]
+        assert df is None and isinstance(erreur, ValueError)
+    assert faux_bam.compteurs[date(2025, 3, 3)] == 3
+    assert faux_bam.compteurs[date(2025, 3, 4)] == 1
+
+
+def test_dates_en_cache_non_retelechargees(tmp_path, faux_bam):
+    cache = BamCache(tmp_path)
+    _tout(faux_bam, "2025-03-03", "2025-03-05", cache=cache, requetes_par_seconde=0)
+    resultats = _tout(faux_bam, "2025-03-03", "2025-03-06", cache=cache, requetes_par_seconde=0)
+
+    assert len(resultats) == 4
+    assert sorted(faux_bam.dates_appelees()) == [date(2025, 3, 3), date(2025, 3, 4), date(2025, 3, 5),
+                                                 date(2025, 3, 6)]
@@ -0,0 +1,67 @@
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.batch_processor import chemins_sortie, main, traiter_dossier
+
+
+def _ecrire_exports(dossier, noms, seed=0):
+    for k, nom in enumerate(noms):
+        chemin = dossier / nom
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+        chemin.write_bytes(generer_csv_bam(30, seed=seed + k))
+
+
+def test_memes_noms_dans_des_dossiers_differents(tmp_path):
+    entrees, sortie = tmp_path / "exports", tmp_path / "resultats"
+    _ecrire_exports(entrees, ["a/2025-01-02.csv", "b/2025-01-02.csv"])
+
+    bilan = traiter_dossier([str(entrees / "*" / "2025-01-02.csv")], str(sortie), max_workers=1)
+    assert bilan == {"traites": 2, "ignores": 0, "erreurs": {}}
+    a = pd.read_parquet(sortie / "a" / "2025-01-02.parquet")
+    b = pd.read_parquet(sortie / "b" / "2025-01-02.parquet")
+    assert not a["Taux_zero_coupon"].equals(b["Taux_zero_coupon"])
+    assert (sortie / "b" / "2025-01-02_forwards.parquet").exists()
+
+    # Deuxième passage : les deux fichiers sont à jour
+    bilan = traiter_dossier([str(entrees / "*" / "2025-01-02.csv")], str(sortie), max_workers=1)
+    assert bilan == {"traites": 0, "ignores": 2, "erreurs": {}}
+
+    # Un seul fichier modifié : lui seul est retraité
+    source = entrees / "b" / "2025-01-02.csv"
+    os.utime(source, (os.path.getmtime(source) + 10,) * 2)
+    bilan = traiter_dossier([str(entrees / "*" / "2025-01-02.csv")], str(sortie), max_workers=1)
+    assert bilan == {"traites": 1, "ignores": 1, "erreurs": {}}
+
+
+def test_dossier_a_plat(tmp_path):
+    entrees, sortie = tmp_path / "exports", tmp_path / "resultats"
+    _ecrire_exports(entrees, ["2025-01-02.csv", "2025-01-03.csv"])
+
+    bilan = traiter_dossier([str(entrees)], str(sortie), format="csv", max_workers=1)
+    assert bilan["traites"] == 2
+    assert sorted(os.listdir(sortie)) == ["2025-01-02.csv.gz", "2025-01-02_forwards.csv.gz",
+                                          "2025-01-03.csv.gz", "2025-01-03_forwards.csv.gz"]
+    assert chemins_sortie("/x/courbe.csv", "out") == (os.path.join("out", "courbe.parquet"),
+                                                     os.path.join("out", "courbe_forwards.parquet"))
+
+
+def test_collision_refusee(tmp_path, capsys):
+    entrees, sortie = tmp_path / "exports", tmp_path / "resultats"
+    _ecrire_exports(entrees, ["x.csv", "x_forwards.csv"])
+
+    with pytest.raises(ValueError, match="produiraient tous deux"):
+        traiter_dossier([str(entrees)], str(sortie), max_workers=1)
+    assert main([str(entrees), "--sortie", str(sortie)]) == 2
+    assert not any(sortie.rglob("*.parquet"))
+
+
+def test_erreur_de_fichier(tmp_path):
+    entrees, sortie = tmp_path / "exports", tmp_path / "resultats"
+    _ecrire_exports(entrees, ["bon.csv"])
+    (entrees / "mauvais.csv").write_bytes(b"rien\r\n")
+
+    assert main([str(entrees), "--sortie", str(sortie), "--workers", "1"]) == 1
+    assert (sortie / "bon.parquet").exists()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import process_dataframe
+from src.bootstrap import (bootstrap_zc, bootstrap_zc_array, bootstrap_zc_matrice, bootstrap_zc_queue,
+                           taux_actuariel, taux_actuariel_array)
+from src.io_bam import read_bam_csv
+
+
+def bootstrap_historique(df: pd.DataFrame) -> pd.Series:
+    """Boucle ligne à ligne d'origine (avant vectorisation), gardée comme référence."""
+    zc_dict = {}
+    zc_list = []
+    for idx, row in df.iterrows():
+        T = row["maturite_annees"]
+        r = taux_actuariel(T, row["Taux_decimal"])
+        C = r
+        if T <= 1:
+            zc = r
+        else:
+            s = 0.0
+            for k in range(1, int(np.floor(T)) + 1):
+                prev_zc = zc_dict.get(k)
+                if prev_zc is None:
+                    prev_zc = r
+                s += C / (1 + prev_zc) ** k
+            denom = 1 - s
+            zc = r if denom <= 0 else ((1 + C) / denom) ** (1 / T) - 1
+        zc_dict[int(round(T))] = zc
+        zc_list.append(zc)
+    return pd.Series(zc_list, index=df.index)
+
+
+@pytest.fixture(scope="module", params=[(25, 0), (120, 1), (400, 2)], ids=["25", "120", "400"])
+def courbe(request):
+    n, seed = request.param
+    df, _, _ = process_dataframe(read_bam_csv(generer_csv_bam(n, seed=seed)))
+    return df
+
+
+def test_bootstrap_identique_a_la_boucle_historique(courbe):
+    attendu = bootstrap_historique(courbe)
+    # Taux moyens pondérés (courts) et piliers partageant une même année arrondie sont couverts
+    assert (courbe["maturite_annees"] < 1).any()
+    assert np.rint(courbe["maturite_annees"]).duplicated().any()
+
+    np.testing.assert_allclose(bootstrap_zc(courbe), attendu, rtol=1e-12, atol=0)
+    np.testing.assert_allclose(courbe["Taux_zero_coupon"], attendu, rtol=1e-12, atol=0)
+    np.testing.assert_allclose(bootstrap_zc_array(courbe["maturite_annees"], courbe["Taux_decimal"]),
+                               attendu, rtol=1e-12, atol=0)
+    np.testing.assert_allclose(taux_actuariel_array(courbe["maturite_annees"], courbe["Taux_decimal"]),
+                               [taux_actuariel(T, t) for T, t in zip(courbe["maturite_annees"], courbe["Taux_decimal"])],
+                               rtol=1e-12)
+
+
+def test_queue_identique_au_calcul_complet(courbe):
+    T = courbe["maturite_annees"].to_numpy()
+    t = courbe["Taux_decimal"].to_numpy().copy()
+    complet = bootstrap_zc_array(T, t)
+    for debut in (0, 1, len(T) // 3, len(T) // 2, len(T) - 1, len(T)):
+        zc = complet.copy()
+        zc[debut:] = np.nan
+        np.testing.assert_allclose(bootstrap_zc_queue(T, t, zc, debut), complet, rtol=1e-12)
+
+    # Pilier modifié au milieu : la queue recalculée est celle de la boucle historique
+    i = len(T) // 2
+    t[i] += 0.001
+    zc = bootstrap_zc_queue(T, t, complet.copy(), i)
+    attendu = bootstrap_historique(courbe.assign(Taux_decimal=t))
+    np.testing.assert_allclose(zc, attendu, rtol=1e-12)
+
+
+def test_matrice_identique_ligne_par_ligne(courbe):
+    T = courbe["maturite_annees"].to_numpy()
+    t = courbe["Taux_decimal"].to_numpy()
+    chocs = np.array([0.0, 0.01, -0.005])[:, None] + np.linspace(0, 0.002, T.size)
+    matrice = bootstrap_zc_matrice(T, t + chocs)
+    for s in range(len(chocs)):
+        attendu = bootstrap_historique(courbe.assign(Taux_decimal=t + chocs[s]))
+        np.testing.assert_allclose(matrice[s], attendu, rtol=1e-12)
+
+
+def test_entree_non_triee_traitee_par_maturite_croissante():
+    df = pd.DataFrame({"maturite_annees": [5.0, 0.5, 2.0, 10.0, 1.0],
+                       "Taux_decimal": [0.03, 0.022, 0.025, 0.035, 0.023]}, index=list("abcde"))
+    trie = df.sort_values("maturite_annees", kind="stable")
+    zc = bootstrap_zc(df)
+    assert list(zc.index) == list("abcde")
+    pd.testing.assert_series_equal(zc.loc[trie.index], bootstrap_historique(trie))
+
+
+def test_maturites_invalides():
+    with pytest.raises(ValueError, match="index b"):
+        bootstrap_zc(pd.DataFrame({"maturite_annees": [1.0, 0.0], "Taux_decimal": [0.02, 0.02]},
+                                  index=["a", "b"]))
+    with pytest.raises(ValueError):
+        bootstrap_zc_array([2.0, 1.0], [0.02, 0.02])
@@ -0,0 +1,107 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.panel_processor import process_panel
+from services.taux_processor import process_dataframe
+from src.curve_store import COL_DATE, CurveStore
+from src.interpolation import CurveInterpolator
+from src.io_bam import read_bam_csv
+
+JOURS = [date(2025, 9, 1) + timedelta(days=k) for k in range(6)]
+
+
+@pytest.fixture(scope="module")
+def courbes():
+    return {j: process_dataframe(read_bam_csv(generer_csv_bam(15 + 3 * k, j, seed=k)))[0]
+            for k, j in enumerate(JOURS)}
+
+
+@pytest.fixture
+def store(tmp_path, courbes):
+    store = CurveStore(str(tmp_path / "store"))
+    for j in JOURS[:2]:
+        store.ajouter(j, courbes[j])
+    panel, _ = process_panel({j: read_bam_csv(generer_csv_bam(15 + 3 * k, j, seed=k))
+                              for k, j in enumerate(JOURS) if k >= 2}, max_workers=1)
+    store.ajouter_panel(panel)
+    return store
+
+
+def _lectures(store, monkeypatch):
+    lectures = []
+    lire = store._lire
+
+    def espion(nom, dtype, debut=0, fin=None):
+        lectures.append((nom, debut, fin))
+        return lire(nom, dtype, debut, fin)
+
+    monkeypatch.setattr(store, "_lire", espion)
+    return lectures
+
+
+def test_serie_sur_la_grille_et_hors_grille(store, courbes):
+    assert len(store) == len(JOURS)
+    assert list(store.dates.date) == JOURS
+
+    zc10 = store.serie(10)
+    attendu = [CurveInterpolator(c["maturite_annees"], c["Taux_zero_coupon"])(10.0) for c in courbes.values()]
+    np.testing.assert_allclose(zc10, attendu, rtol=1e-12)
+    assert zc10.name == "Taux_zero_coupon 10 ans" and list(zc10.index.date) == JOURS
+
+    hors = store.serie(6.3, colonne="Taux_actuariel")
+    attendu = [np.interp(6.3, c["maturite_annees"], c["Taux_actuariel"]) for c in courbes.values()]
+    np.testing.assert_allclose(hors, attendu, rtol=1e-12)
+
+    pd.testing.assert_frame_equal(store.courbe(JOURS[3])[["maturite_annees", "Taux_zero_coupon"]],
+                                  courbes[JOURS[3]][["maturite_annees", "Taux_zero_coupon"]], check_dtype=False)
+
+
+def test_serie_ne_lit_que_la_plage_demandee(store, monkeypatch):
+    lectures = _lectures(store, monkeypatch)
+    serie = store.serie(10, JOURS[2], JOURS[3])
+    assert list(serie.index.date) == JOURS[2:4]
+    assert ("grille/zc_10.f8", 2, 4) in lectures
+    assert not any(nom.startswith("piliers/") for nom, _, _ in lectures)
+
+    lectures.clear()
+    store.serie(6.3, JOURS[4], JOURS[4])
+    piliers = [(debut, fin) for nom, debut, fin in lectures if nom.startswith("piliers/")]
+    bornes = store._bornes_piliers(4, 5)
+    assert piliers and all((debut, fin) == (bornes[0], bornes[1]) for debut, fin in piliers)
+
+    assert store.serie(10, "2030-01-01").empty
+
+
+def test_reouverture_depuis_le_disque(store, courbes):
+    relu = CurveStore(store.dossier)
+    assert len(relu) == len(store) and relu.meta == store.meta
+    pd.testing.assert_series_equal(relu.serie(5), store.serie(5))
+    pd.testing.assert_frame_equal(relu.plage(), store.plage())
+
+    # Un ajout après réouverture complète les mêmes fichiers
+    suivant = JOURS[-1] + timedelta(days=1)
+    relu.ajouter(suivant, courbes[JOURS[0]])
+    assert list(CurveStore(store.dossier).dates.date) == JOURS + [suivant]
+
+
+def test_dates_dans_le_desordre_refusees(store, courbes):
+    for jour in (JOURS[0], JOURS[-1]):
+        with pytest.raises(ValueError):
+            store.ajouter(jour, courbes[JOURS[0]])
+    assert len(CurveStore(store.dossier)) == len(JOURS)
+
+
+def test_date_a_un_seul_pilier(tmp_path, courbes):
+    store = CurveStore(str(tmp_path / "store"))
+    un_pilier = courbes[JOURS[0]].iloc[[3]]
+    panel = pd.concat([courbes[JOURS[0]].assign(**{COL_DATE: JOURS[0]}), un_pilier.assign(**{COL_DATE: JOURS[1]})])
+    store.ajouter_panel(panel)
+    assert len(store) == 2
+    zc = un_pilier["Taux_zero_coupon"].iloc[0]
+    assert store.serie(10).iloc[1] == zc
+    assert store.serie(6.3).iloc[1] == zc
+    assert np.isnan(store.plage(JOURS[1], JOURS[1])["Forward"]).all()
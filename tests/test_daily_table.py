@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import courbe_zc, interpolate_user_date, process_dataframe, table_journaliere
+from src.daily_table import DailyCurveTable
+from src.io_bam import read_bam_csv
+
+
+@pytest.fixture(scope="module")
+def courbe():
+    df, _, base = process_dataframe(read_bam_csv(generer_csv_bam(40)))
+    return df, base, table_journaliere(df, base)
+
+
+def test_table_comme_interpolateur(courbe):
+    df, base, table = courbe
+    dernier = int(np.ceil(df["maturite_annees"].max() * 365))
+    assert len(table) == dernier + 1
+
+    jours = np.array([0, 1, 30, 365, 1000, 3652, dernier])
+    dates = [base + timedelta(days=int(j)) for j in jours]
+    resultat = table.lookup(dates)
+    interpolateur = courbe_zc(df)
+    np.testing.assert_allclose(resultat["Taux_zero_coupon"], interpolateur(jours / 365), rtol=1e-12)
+    np.testing.assert_allclose(resultat["Facteur_actualisation"], interpolateur.discount(jours / 365), rtol=1e-12)
+    assert list(resultat.index) == list(pd.to_datetime(dates))
+
+    # Forward à un jour : (DF(j) / DF(j+1))^365 - 1
+    df_j = interpolateur.discount(np.array([1000, 1001]) / 365)
+    assert table.lookup(base + timedelta(days=1000))["Forward_1j"].iloc[0] == \
+        pytest.approx((df_j[0] / df_j[1]) ** 365 - 1, rel=1e-10)
+    assert table.forward_1j[-1] == table.forward_1j[-2]
+
+
+def test_dates_hors_table(courbe):
+    _, base, table = courbe
+    for hors in (base - timedelta(days=1), base + timedelta(days=len(table))):
+        with pytest.raises(ValueError):
+            table.lookup(hors)
+    with pytest.raises(ValueError):
+        table.indices([base, base - timedelta(days=3)])
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load(tmp_path, courbe, mmap):
+    _, base, table = courbe
+    chemin = str(tmp_path / "table.npy")
+    table.save(chemin)
+    relue = DailyCurveTable.load(chemin, mmap=mmap)
+    assert isinstance(relue.valeurs, np.memmap) == mmap
+    assert relue.base_date == base and relue.jours_par_an == 365
+    np.testing.assert_array_equal(relue.valeurs, table.valeurs)
+    assert relue.valeurs.flags["C_CONTIGUOUS"]
+    pd.testing.assert_frame_equal(relue.lookup([base + timedelta(days=400)]),
+                                  table.lookup([base + timedelta(days=400)]))
+    # Sans extension : mêmes fichiers
+    assert DailyCurveTable.load(str(tmp_path / "table")).base_date == base
+
+
+def test_interpolate_user_date_par_la_table(courbe):
+    df, base, table = courbe
+    for jours in (1, 180, 2000, len(table) - 1, len(table) + 200):
+        saisie = (base + timedelta(days=jours)).strftime("%d/%m/%Y")
+        assert interpolate_user_date(saisie, df, base, table=table) == interpolate_user_date(saisie, df, base)
+    with pytest.raises(Exception):
+        interpolate_user_date(base.strftime("%d/%m/%Y"), df, base, table=table)
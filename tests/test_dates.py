@@ -0,0 +1,63 @@
+import threading
+
+import pandas as pd
+
+import src.dates as dates
+from src.dates import parse_dates, vider_cache_dates
+
+
+def test_parse_dates_formats_et_valeurs_invalides():
+    vider_cache_dates()
+    resultat = parse_dates(pd.Series(["17/10/2025", "01/02/2030", None, "pas une date", "17/10/2025"]))
+    assert resultat.tolist()[:2] == [pd.Timestamp(2025, 10, 17), pd.Timestamp(2030, 2, 1)]
+    assert resultat.isna().tolist() == [False, False, True, True, False]
+    assert resultat.iloc[4] == resultat.iloc[0]
+
+
+def test_vider_cache_dates():
+    parse_dates(["03/04/2031"])
+    assert "03/04/2031" in dates._cache_dates
+    vider_cache_dates()
+    assert dates._cache_dates == {}
+
+
+def test_parse_dates_concurrent_avec_vidages(monkeypatch):
+    # Mémo minuscule : il est vidé en permanence pendant que les autres threads le lisent
+    monkeypatch.setattr(dates, "_TAILLE_CACHE", 50)
+    jours = pd.date_range("2026-01-01", periods=400)
+    valeurs = jours.strftime("%d/%m/%Y").tolist()
+    erreurs = []
+
+    def travailler(decalage):
+        try:
+            for i in range(20):
+                lot = valeurs[(decalage + i * 37) % 300:][:100]
+                attendu = pd.to_datetime(lot, format="%d/%m/%Y")
+                assert (parse_dates(lot).to_numpy() == attendu.to_numpy()).all()
+        except Exception as e:  # remonté dans le thread principal
+            erreurs.append(e)
+
+    threads = [threading.Thread(target=travailler, args=(k * 11,)) for k in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert erreurs == []
+    assert len(dates._cache_dates) <= 150
+
+
+def test_calc_maturites_comme_calc_maturite():
+    from datetime import date
+
+    from src.dates import calc_maturite, calc_maturites
+
+    base = date(2025, 10, 17)
+    echeances = ["15/08/2070", "15/08/70", "01/01/30", "1/2/30", "17/10/2025", "15-08-70",
+                 "15.08.2035", "10/10/2025", "pas une date"]
+    for lot in (echeances, echeances[1:2] * 3, ["01/01/30", "15/08/70"]):
+        vider_cache_dates()  # chaque lot passe par la détection de format
+        attendu = [calc_maturite(e, base) for e in lot]
+        obtenu = calc_maturites(lot, base)
+        assert [None if pd.isna(v) else v for v in obtenu] == [None if pd.isna(v) else v for v in attendu]
+    vider_cache_dates()
+    assert calc_maturites(["15/08/70"], base).iloc[0] == calc_maturite("15/08/2070", base)
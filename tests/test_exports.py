@@ -0,0 +1,81 @@
+import gzip
+import io
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from flask import Flask
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import process_dataframe
+from src.curve_store import COL_DATE, COLONNES_PILIERS, CurveStore
+from src.exports import exporter, flux_export, reponse_export
+from src.io_bam import read_bam_csv
+
+DF = pd.DataFrame({"maturite_annees": np.linspace(0.1, 30, 7), "Taux_zero_coupon": np.linspace(0.02, 0.04, 7)})
+
+
+def _relire(contenu: bytes, format: str) -> pd.DataFrame:
+    if format in ("csv", "csv.gz"):
+        if format == "csv.gz":
+            contenu = gzip.decompress(contenu)
+        return pd.read_csv(io.BytesIO(contenu), sep=";", decimal=",", encoding="utf-8-sig")
+    if format == "parquet":
+        return pq.read_table(io.BytesIO(contenu)).to_pandas()
+    return pa.ipc.open_stream(contenu).read_all().to_pandas()
+
+
+@pytest.mark.parametrize("format", ["csv", "csv.gz", "parquet", "arrow"])
+def test_aller_retour_par_blocs(format):
+    contenu = b"".join(flux_export(DF, format, lignes_par_bloc=3))
+    pd.testing.assert_frame_equal(_relire(contenu, format), DF)
+    if format == "parquet":
+        assert pq.ParquetFile(io.BytesIO(contenu)).metadata.num_row_groups == 3
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_sans_aucun_bloc_fichier_valide(format):
+    relu = _relire(exporter(iter([]), format), format)
+    assert relu.empty and list(relu.columns) == []
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_tableau_vide_garde_ses_colonnes(format):
+    relu = _relire(exporter(DF.iloc[:0], format), format)
+    assert relu.empty and list(relu.columns) == list(DF.columns)
+
+
+def test_format_inconnu():
+    with pytest.raises(ValueError):
+        flux_export(DF, "xlsx")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CurveStore(str(tmp_path / "store"))
+    for jour in (date(2025, 10, 15), date(2025, 10, 16), date(2025, 10, 17)):
+        df, _, _ = process_dataframe(read_bam_csv(generer_csv_bam(12, jour)))
+        store.ajouter(jour, df)
+    return store
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_historique(store, format):
+    relu = _relire(exporter(store.blocs(dates_par_bloc=2), format), format)
+    assert len(relu) == 36 and list(relu.columns) == [COL_DATE, *COLONNES_PILIERS]
+
+    vide = _relire(exporter(store.blocs("2030-01-01"), format), format)
+    assert vide.empty and list(vide.columns) == [COL_DATE, *COLONNES_PILIERS]
+    assert vide.dtypes.equals(relu.dtypes)
+
+
+def test_reponse_flask_en_flux():
+    app = Flask(__name__)
+    with app.test_request_context():
+        reponse = reponse_export(DF, "taux", "parquet")
+    assert reponse.is_streamed
+    assert reponse.headers["Content-Disposition"] == 'attachment; filename="taux.parquet"'
+    pd.testing.assert_frame_equal(_relire(b"".join(reponse.response), "parquet"), DF)
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import process_dataframe
+from src.Forward import ForwardEngine, exporter_forwards, formater_forwards, taux_forward
+from src.interpolation import CurveInterpolator
+from src.io_bam import read_bam_csv
+
+
+@pytest.fixture(scope="module")
+def courbe():
+    df, df_fw, _ = process_dataframe(read_bam_csv(generer_csv_bam(40)))
+    return df, df_fw
+
+
+@pytest.mark.parametrize("convention", ForwardEngine.CONVENTIONS)
+def test_matrice_comme_paires(courbe, convention):
+    df, _ = courbe
+    moteur = ForwardEngine(df["maturite_annees"], df["Taux_zero_coupon"], convention=convention)
+    debuts, durees = np.array([0.25, 1, 2, 5, 10]), np.array([0.5, 1, 5, 10])
+    grille = moteur.matrice(debuts, durees)
+    assert grille.shape == (5, 4)
+    t1, d = np.meshgrid(debuts, durees, indexing="ij")
+    np.testing.assert_allclose(grille.to_numpy(), moteur.paires(t1, t1 + d), rtol=1e-12)
+
+
+def test_forwards_entre_piliers_comme_taux_forward(courbe):
+    df, df_fw = courbe
+    T, zc = df["maturite_annees"].to_numpy(), df["Taux_zero_coupon"].to_numpy()
+    debuts, fins, attendus = taux_forward(T, zc)
+    moteur = ForwardEngine(T, zc)
+    np.testing.assert_allclose(moteur.paires(debuts, fins), attendus, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(df_fw["Taux Forward (%)"], attendus * 100)
+
+
+def test_convention_actuarielle_coherente_avec_l_actualisation(courbe):
+    df, _ = courbe
+    moteur = ForwardEngine(df["maturite_annees"], df["Taux_zero_coupon"], convention="actuariel")
+    courbe_zc = CurveInterpolator(df["maturite_annees"], df["Taux_zero_coupon"])
+    t1, t2 = np.array([0.5, 1, 3, 5]), np.array([1, 2, 8, 10])
+    f = moteur.paires(t1, t2)
+    np.testing.assert_allclose((1 + f) ** (t2 - t1), courbe_zc.discount(t1) / courbe_zc.discount(t2), rtol=1e-12)
+
+
+def test_notation_de_marche(courbe):
+    df, _ = courbe
+    moteur = ForwardEngine(df["maturite_annees"], df["Taux_zero_coupon"])
+    assert moteur.forward("5y5y") == pytest.approx(moteur.paires([5.0], [10.0])[0], rel=1e-15)
+    assert moteur.forward(" 6M1Y ") == pytest.approx(moteur.paires([0.5], [1.5])[0], rel=1e-15)
+    serie = moteur.forward(["1y1y", "2a5a", "18m6m"])
+    assert list(serie.index) == ["1y1y", "2a5a", "18m6m"]
+    np.testing.assert_allclose(serie, moteur.paires([1, 2, 1.5], [2, 7, 2]), rtol=1e-15)
+    for invalide in ("5y", "5x5y", "y5y5"):
+        with pytest.raises(ValueError):
+            moteur.forward(invalide)
+    with pytest.raises(ValueError):
+        moteur.paires([2.0], [2.0])
+
+
+def test_exports_et_mise_en_forme():
+    df_fw = pd.DataFrame({"De (années)": [0.5, 1.0], "À (années)": [1.0, 2.0], "Taux Forward (%)": [2.12345, 2.5]})
+    csv = exporter_forwards(df_fw, "csv", decimales=2)
+    assert csv.splitlines() == ["De (années);À (années);Taux Forward (%)", "0,50;1,00;2,12", "1,00;2,00;2,50"]
+    assert json.loads(exporter_forwards(df_fw, "json"))[0] == {"De (années)": 0.5, "À (années)": 1.0,
+                                                             "Taux Forward (%)": 2.1235}
+    with pytest.raises(ValueError):
+        exporter_forwards(df_fw, "xml")
+    texte = formater_forwards([0.5], [1.0], [0.021234])
+    assert texte.iloc[0].tolist() == ["0.50", "1.00", "2.12"]
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from src.bootstrap import bootstrap_zc_array
+from src.Forward import taux_forward
+from src.incremental import IncrementalCurve
+
+
+def _verifier(courbe):
+    """Les résultats incrémentaux sont ceux d'un recalcul complet."""
+    T = courbe.maturites
+    taux = courbe.to_frame()["Taux_decimal"].to_numpy()
+    zc = bootstrap_zc_array(T, taux)
+    np.testing.assert_allclose(courbe.taux_zc, zc, rtol=0, atol=1e-14)
+    for obtenu, attendu in zip(courbe.forwards(), taux_forward(T, zc)):
+        np.testing.assert_allclose(obtenu, attendu, rtol=0, atol=1e-14)
+
+
+def test_suppression_du_dernier_pilier():
+    courbe = IncrementalCurve([0.5, 1, 2, 5], [.02, .025, .03, .035])
+    courbe.forwards()
+    courbe.supprimer(5)
+
+    debuts, fins, forwards = courbe.forwards()
+    assert fins.tolist() == [1, 2] and forwards.size == 2
+    _verifier(courbe)
+    assert courbe.interpolateur(1.5) == pytest.approx(np.interp(1.5, courbe.maturites, courbe.taux_zc))
+
+
+def test_suppressions_jusqu_a_un_pilier():
+    courbe = IncrementalCurve([0.5, 1, 2, 5], [.02, .025, .03, .035])
+    for maturite in (5, 2, 1):
+        courbe.supprimer(maturite)
+        _verifier(courbe)
+    assert [a.size for a in courbe.forwards()] == [0, 0, 0]
+
+
+def test_suite_de_modifications():
+    rng = np.random.default_rng(3)
+    T = np.sort(rng.uniform(0.1, 30, 40))
+    courbe = IncrementalCurve(T, 0.02 + 0.001 * T + rng.normal(0, 1e-4, T.size))
+    _verifier(courbe)
+
+    courbe.mettre_a_jour(T[10], 0.031)
+    _verifier(courbe)
+    courbe.inserer(12.3456, 0.033)
+    courbe.inserer(35.0, 0.05)  # au-delà du dernier pilier
+    _verifier(courbe)
+    courbe.supprimer(35.0)
+    courbe.supprimer(T[0])
+    _verifier(courbe)
+    courbe.supprimer(T[-1])
+    courbe.mettre_a_jour(T[20], 0.04)
+    _verifier(courbe)
+
+
+def test_pilier_inconnu():
+    courbe = IncrementalCurve([1, 2], [.02, .025])
+    with pytest.raises(KeyError):
+        courbe.supprimer(3)
+    with pytest.raises(ValueError):
+        courbe.inserer(0, 0.01)
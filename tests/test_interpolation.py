@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+from scipy.interpolate import PchipInterpolator, interp1d
+
+from src.interpolation import CurveInterpolator, interpolate_lineaire_matrice, interpolate_rate
+
+X = np.array([0.08, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 15.0, 20.0, 30.0])
+Y = np.array([0.0221, 0.0224, 0.0229, 0.0236, 0.0249, 0.0258, 0.0275, 0.0289, 0.0305, 0.0318, 0.0321, 0.0317])
+T = np.r_[np.linspace(0.01, 35, 2001), X]
+
+
+def test_lineaire_comme_interp1d():
+    attendu = interp1d(X, Y, kind="linear", fill_value="extrapolate")(T)
+    np.testing.assert_allclose(CurveInterpolator(X, Y)(T), attendu, rtol=1e-12, atol=1e-15)
+
+
+def test_cubique_monotone_comme_pchip():
+    attendu = PchipInterpolator(X, Y)(T)
+    np.testing.assert_allclose(CurveInterpolator(X, Y, "monotone_cubic")(T), attendu, rtol=1e-10, atol=1e-14)
+    # Deux nœuds seulement : segment de droite, comme pchip
+    np.testing.assert_allclose(CurveInterpolator(X[:2], Y[:2], "monotone_cubic")(T),
+                               PchipInterpolator(X[:2], Y[:2])(T), rtol=1e-12)
+
+
+def test_noeuds_non_tries_et_doublons():
+    ordre = np.random.default_rng(0).permutation(X.size)
+    x, y = np.r_[X[ordre], 5.0], np.r_[Y[ordre], 0.028]  # le dernier doublon l'emporte
+    courbe = CurveInterpolator(x, y)
+    assert courbe(5.0) == pytest.approx(0.028)
+    assert courbe(10.0) == pytest.approx(0.0305)
+
+
+@pytest.mark.parametrize("methode", CurveInterpolator.METHODES)
+def test_taux_et_actualisation_coherents(methode):
+    courbe = CurveInterpolator(X, Y, methode)
+    np.testing.assert_allclose(courbe(X), Y, rtol=1e-12)
+    t = T[T > 0]
+    np.testing.assert_allclose(courbe.discount(t), (1 + courbe(t)) ** -t, rtol=1e-12)
+
+
+def test_log_df_lineaire_en_log_actualisation():
+    courbe = CurveInterpolator(X, Y, "log_df")
+    g = X * np.log1p(Y)
+    milieux = (X[1:] + X[:-1]) / 2
+    np.testing.assert_allclose(-np.log(courbe.discount(milieux)), (g[1:] + g[:-1]) / 2, rtol=1e-12)
+    # Entre 0 et le premier nœud, le taux est constant (nœud DF(0) = 1)
+    np.testing.assert_allclose(courbe([0.0, 0.01, 0.05]), Y[0], rtol=1e-12)
+    assert courbe.discount(0.0) == 1.0
+
+
+@pytest.mark.parametrize("methode", CurveInterpolator.METHODES)
+def test_sans_extrapolation(methode):
+    courbe = CurveInterpolator(X, Y, methode, extrapolate=False)
+    np.testing.assert_allclose(courbe([X[0], X[-1]]), [Y[0], Y[-1]], rtol=1e-12)
+    for hors in (X[0] - 1e-6, X[-1] + 1e-6, [1.0, 31.0]):
+        with pytest.raises(ValueError):
+            courbe(hors)
+    with pytest.raises(ValueError):
+        interpolate_rate(X, Y, np.array([40.0]), method=methode, extrapolate=False)
+
+
+def test_entrees_invalides():
+    with pytest.raises(ValueError):
+        CurveInterpolator(X, Y, "spline")
+    with pytest.raises(ValueError):
+        CurveInterpolator([1.0, 1.0], [0.02, 0.03])
+    with pytest.raises(ValueError):
+        CurveInterpolator(X, Y[:-1])
+
+
+def test_interpolate_rate_methodes_scipy():
+    np.testing.assert_allclose(interpolate_rate(X, Y, T, method="cubic"),
+                               interp1d(X, Y, kind="cubic", fill_value="extrapolate")(T))
+
+
+def test_matrice_comme_courbe_par_courbe():
+    Ys = np.vstack([Y, Y + 0.001, Y[::-1]])
+    matrice = interpolate_lineaire_matrice(X, Ys, T)
+    for ligne, y in zip(matrice, Ys):
+        np.testing.assert_allclose(ligne, CurveInterpolator(X, y)(T), rtol=1e-12, atol=1e-15)
@@ -0,0 +1,52 @@
+import io
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from src.io_bam import iter_bam_csv, read_bam_csv, taux_en_decimal
+
+CSV_CRLF = generer_csv_bam(25)
+
+
+@pytest.mark.parametrize("fin_de_ligne", [b"\r\n", b"\n", b"\r"], ids=["crlf", "lf", "cr"])
+def test_fins_de_ligne(fin_de_ligne):
+    contenu = CSV_CRLF.replace(b"\r\n", fin_de_ligne)
+    df = read_bam_csv(contenu)
+
+    assert len(df) == 25
+    assert list(df.columns[:3]) == ["Echeance", "Transaction", "Taux moyen pondéré"]
+    assert pd.api.types.is_float_dtype(df["Taux moyen pondéré"])
+    assert not df["Echeance"].str.contains("\r").any()
+    assert df.equals(read_bam_csv(CSV_CRLF))
+
+
+def test_bom_cp1252_et_sources():
+    contenu = b"\xef\xbb\xbf" + CSV_CRLF
+    attendu = read_bam_csv(CSV_CRLF)
+    assert read_bam_csv(contenu).equals(attendu)
+    assert read_bam_csv(io.BytesIO(CSV_CRLF)).equals(attendu)
+    assert read_bam_csv(CSV_CRLF.decode("utf-8")).equals(attendu)
+
+    windows = CSV_CRLF.decode("utf-8").encode("cp1252")
+    assert read_bam_csv(windows)["Taux moyen pondéré"].equals(attendu["Taux moyen pondéré"])
+
+
+def test_taux_en_decimal():
+    df = read_bam_csv(CSV_CRLF)
+    texte = pd.Series(["2,5 %", "3,125%"])
+    assert taux_en_decimal(texte).tolist() == [0.025, 0.03125]
+    assert taux_en_decimal(df["Taux moyen pondéré"]).between(0.01, 0.06).all()
+
+
+def test_colonnes_manquantes():
+    with pytest.raises(ValueError, match="Colonnes requises"):
+        read_bam_csv(b"titre\r\nsous-titre\r\nA;B;C\r\n1;2;3\r\n")
+
+
+def test_iter_bam_csv_blocs(tmp_path):
+    chemin = tmp_path / "archive.csv"
+    chemin.write_bytes(CSV_CRLF + generer_csv_bam(10, seed=1))
+    blocs = list(iter_bam_csv(chemin, chunksize=8))
+    assert [b for b, _ in blocs] == [0, 0, 0, 0, 1, 1]
+    assert sum(len(df) for _, df in blocs) == 35
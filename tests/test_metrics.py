@@ -0,0 +1,88 @@
+import logging
+import re
+
+import pytest
+from flask import Flask
+
+from src import metrics
+from src.metrics import Registre, compter, etape, instrumenter
+
+# Ligne d'échantillon au format texte Prometheus : nom{label="valeur",...} nombre
+ECHANTILLON = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="([^"\\]|\\.)*",?)*\})? '
+                         r'(-?[0-9.e+-]+|\+Inf|NaN)$')
+
+
+def _verifier_format(texte: str):
+    assert texte.endswith("\n")
+    decrits = {}
+    for ligne in texte.splitlines():
+        if ligne.startswith("# HELP "):
+            continue
+        if ligne.startswith("# TYPE "):
+            _, _, nom, type_ = ligne.split(" ")
+            assert nom not in decrits and type_ in ("counter", "histogram")
+            decrits[nom] = type_
+            continue
+        assert ECHANTILLON.match(ligne), ligne
+        nom = re.match(r"[^{ ]+", ligne).group()
+        base = re.sub(r"_(bucket|sum|count)$", "", nom)
+        assert nom in decrits or decrits.get(base) == "histogram", ligne
+
+
+def test_exposition_compteurs_et_histogrammes():
+    registre = Registre(buckets=(0.1, 1.0))
+    registre.incrementer("requetes_total", 1, "Requêtes", route="/", status=200)
+    registre.incrementer("requetes_total", 2, route="/", status=200)
+    registre.incrementer("requetes_total", 1, route='/a"b\\c\nd', status=500)
+    for valeur in (0.05, 0.5, 3.0):
+        registre.observer("duree_seconds", valeur, "Durée", stage="dates")
+
+    texte = registre.exposer()
+    _verifier_format(texte)
+    assert registre.valeur("requetes_total", route="/", status=200) == 3
+    assert 'requetes_total{route="/",status="200"} 3' in texte
+    assert r'route="/a\"b\\c\nd"' in texte
+    assert texte.count("# TYPE requetes_total counter") == 1
+    assert 'duree_seconds_bucket{stage="dates",le="0.1"} 1' in texte
+    assert 'duree_seconds_bucket{stage="dates",le="1"} 2' in texte
+    assert 'duree_seconds_bucket{stage="dates",le="+Inf"} 3' in texte
+    assert 'duree_seconds_sum{stage="dates"} 3.550000' in texte
+    assert 'duree_seconds_count{stage="dates"} 3' in texte
+
+    registre.reinitialiser()
+    assert registre.exposer() == "\n"
+
+
+@pytest.fixture
+def application(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRE", Registre())
+    app = Flask(__name__)
+
+    @app.route("/calcul/<int:n>")
+    def calcul(n):
+        with etape("bootstrap"):
+            compter("calculs_total", n, "Calculs")
+        return "ok"
+
+    return instrumenter(app, seuil_lent=0.0)
+
+
+def test_route_metrics(application, caplog):
+    client = application.test_client()
+    with caplog.at_level(logging.WARNING, logger="src.metrics"):
+        for n in (1, 2):
+            assert client.get(f"/calcul/{n}").status_code == 200
+        assert client.get("/absente").status_code == 404
+
+    r = client.get("/metrics")
+    assert r.status_code == 200 and r.mimetype == "text/plain"
+    texte = r.get_data(as_text=True)
+    _verifier_format(texte)
+    assert 'yield_curve_http_requests_total{method="GET",route="/calcul/<int:n>",status="200"} 2' in texte
+    assert 'yield_curve_http_requests_total{method="GET",route="inconnue",status="404"} 1' in texte
+    assert 'yield_curve_stage_seconds_count{stage="bootstrap"} 2' in texte
+    assert "calculs_total 3" in texte
+    assert 'route="/metrics"' not in texte  # la route d'exposition ne se mesure pas elle-même
+
+    lentes = [r.getMessage() for r in caplog.records if "Requête lente" in r.getMessage()]
+    assert len(lentes) == 3 and "bootstrap=" in lentes[0]
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.nelson_siegel import COL_DATE, CourbeNSS, fit_historique, fit_nss, jacobien_nss, taux_nss
+
+T = np.r_[0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 3, 4, 5, 6, 7, 8, 10, 12, 15, 20, 25, 30]
+NSS = np.array([0.045, -0.02, 0.015, -0.01, 1.2, 9.0])
+NS = np.array([0.04, -0.015, 0.02, 2.0])
+
+
+@pytest.mark.parametrize("params", [NSS, NS, np.array([0.05, -0.01, -0.02, 0.03, 0.8, 4.0])],
+                         ids=["nss", "ns", "nss-bosse"])
+def test_jacobien_comme_differences_finies(params):
+    t = np.r_[1e-3, T, 40.0]
+    jac = jacobien_nss(t, params)
+    assert jac.shape == (t.size, params.size)
+    for k in range(params.size):
+        h = 1e-6 * max(1.0, abs(params[k]))
+        haut, bas = params.copy(), params.copy()
+        haut[k] += h
+        bas[k] -= h
+        np.testing.assert_allclose(jac[:, k], (taux_nss(t, haut) - taux_nss(t, bas)) / (2 * h),
+                                   rtol=1e-6, atol=1e-10)
+
+
+@pytest.mark.parametrize("modele, params", [("nss", NSS), ("ns", NS)])
+def test_retrouve_les_parametres_d_une_courbe_synthetique(modele, params):
+    courbe = fit_nss(T, taux_nss(T, params), modele)
+    assert courbe.succes and courbe.modele == modele
+    np.testing.assert_allclose(courbe.params, params, rtol=1e-5, atol=1e-8)
+    assert courbe.rmse_pb < 1e-4 and courbe.max_pb < 1e-4
+    assert courbe.residus.shape == T.shape
+    np.testing.assert_allclose(courbe.discount(T), (1 + courbe(T)) ** -T)
+
+
+def test_entrees_invalides():
+    with pytest.raises(ValueError):
+        fit_nss(T[:5], taux_nss(T[:5], NSS))
+    with pytest.raises(ValueError):
+        CourbeNSS(NS, "nss")
+    with pytest.raises(ValueError):
+        CourbeNSS(NS, "spline")
+
+
+def _historique(n_dates=8):
+    # Paramètres qui dérivent lentement d'une date à l'autre, nombre de piliers variable
+    courbes = {}
+    for k in range(n_dates):
+        params = NSS + np.array([0.0005, 0.0003, -0.0004, 0.0002, 0.02, -0.05]) * k
+        t = T[k % 3:]
+        courbes[pd.Timestamp("2025-10-01") + pd.Timedelta(days=k)] = pd.DataFrame(
+            {"maturite_annees": t, "Taux_zero_coupon": taux_nss(t, params)})
+    return courbes
+
+
+def test_historique_departs_a_chaud_en_parallele():
+    courbes = _historique()
+    sur_place = fit_historique(courbes, max_workers=1)
+    paralleles = fit_historique(courbes, max_workers=3)
+
+    assert list(sur_place.index) == sorted(courbes)
+    assert sur_place["succes"].all() and (sur_place["rmse_pb"] < 1e-3).all()
+    assert sur_place["n_piliers"].tolist() == [len(c) for _, c in sorted(courbes.items())]
+    colonnes = ["beta0", "beta1", "beta2", "beta3", "tau1", "tau2"]
+    np.testing.assert_allclose(paralleles[colonnes], sur_place[colonnes], rtol=1e-4, atol=1e-7)
+    for k, (_, ligne) in enumerate(sur_place.iterrows()):
+        attendu = NSS + np.array([0.0005, 0.0003, -0.0004, 0.0002, 0.02, -0.05]) * k
+        np.testing.assert_allclose(ligne[colonnes].to_numpy(dtype=float), attendu, rtol=1e-4, atol=1e-7)
+
+    # Le départ à chaud réduit le nombre d'évaluations par rapport à un départ à froid
+    froid = sum(fit_nss(c["maturite_annees"], c["Taux_zero_coupon"]).iterations for c in courbes.values())
+    assert sur_place["iterations"].sum() <= froid
+
+
+def test_historique_format_long_et_courbe_trop_courte():
+    courbes = _historique(3)
+    long = pd.concat([c.assign(**{COL_DATE: d}) for d, c in courbes.items()], ignore_index=True)
+    courte = pd.DataFrame({COL_DATE: pd.Timestamp("2025-10-10"), "maturite_annees": [1.0, 2.0],
+                           "Taux_zero_coupon": [0.02, 0.021]})
+    resultat = fit_historique(pd.concat([long, courte]), max_workers=1)
+    assert resultat["succes"].tolist() == [True, True, True, False]
+    assert "piliers" in resultat["erreur"].iloc[-1]
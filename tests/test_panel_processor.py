@@ -0,0 +1,63 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.panel_processor import COL_DATE, process_panel
+from services.taux_processor import process_dataframe
+from src.io_bam import read_bam_csv
+
+COLONNES = ["Echeance", "maturite_annees", "Taux_decimal", "Taux_actuariel", "Taux_zero_coupon"]
+
+
+@pytest.fixture(scope="module")
+def historique():
+    # Panel irrégulier : nombre et échéances des piliers différents à chaque date
+    jours = [date(2025, 9, 1) + timedelta(days=k) for k in range(7)]
+    return {j: read_bam_csv(generer_csv_bam(10 + 7 * k, j, seed=k)) for k, j in enumerate(jours)}
+
+
+def _verifier(historique, df, df_fw):
+    assert df[COL_DATE].tolist() == sorted(df[COL_DATE].tolist())
+    assert set(df[COL_DATE]) == set(historique)
+    for date_pub, brut in historique.items():
+        attendu, attendu_fw, base = process_dataframe(brut.copy())
+        courbe = df[df[COL_DATE] == date_pub].reset_index(drop=True)
+        assert len(courbe) == len(attendu)
+        assert (courbe["Date base"] == base).all()
+        np.testing.assert_array_equal(courbe["maturite_jours"].to_numpy(dtype=float),
+                                      attendu["maturite_jours"].to_numpy(dtype=float))
+        pd.testing.assert_frame_equal(courbe[COLONNES], attendu[COLONNES], check_dtype=False, rtol=1e-12)
+
+        fw = df_fw[df_fw[COL_DATE] == date_pub].drop(columns=COL_DATE).reset_index(drop=True)
+        pd.testing.assert_frame_equal(fw, attendu_fw, rtol=1e-12)
+
+
+def test_identique_a_process_dataframe_sur_place(historique):
+    _verifier(historique, *process_panel(historique, max_workers=1))
+
+
+def test_identique_en_plusieurs_lots_et_processus(historique):
+    _verifier(historique, *process_panel(historique, max_workers=2, courbes_par_lot=2))
+
+
+def test_lots_sur_place_et_format_long(historique):
+    long = pd.concat([brut.assign(**{COL_DATE: d}) for d, brut in historique.items()], ignore_index=True)
+    long = long.sample(frac=1, random_state=0)  # ordre des lignes quelconque
+    _verifier(historique, *process_panel(long, max_workers=1, courbes_par_lot=3))
+
+
+def test_panel_vide():
+    for vide in ({}, pd.DataFrame(columns=[COL_DATE, "Echeance", "Taux moyen pondéré"])):
+        df, df_fw = process_panel(vide)
+        assert df.empty and df_fw.empty
+        assert {COL_DATE, "Taux_zero_coupon"} <= set(df.columns)
+
+
+def test_colonnes_manquantes():
+    with pytest.raises(ValueError, match="2025-01-02"):
+        process_panel({"2025-01-02": pd.DataFrame({"Echeance": ["01/02/2026"]})})
+    with pytest.raises(ValueError):
+        process_panel(pd.DataFrame({"Echeance": ["01/02/2026"], "Taux moyen pondéré": ["2,5 %"]}))
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pca import ACPCourbes, CovarianceEnLigne
+
+TENORS = (1, 2, 5, 10, 20)
+
+
+def _historique(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2024-01-01", periods=n)
+    niveau = np.cumsum(rng.normal(0, 5e-4, n))[:, None]
+    pente = np.cumsum(rng.normal(0, 2e-4, n))[:, None] * np.linspace(-1, 1, len(TENORS))
+    bruit = rng.normal(0, 5e-5, (n, len(TENORS)))
+    return dates, 0.03 + niveau + pente + bruit
+
+
+def test_covariance_en_ligne_comme_np_cov():
+    X = np.random.default_rng(1).normal(size=(200, 4))
+    stats = CovarianceEnLigne(4)
+    for debut, fin in ((0, 1), (1, 50), (50, 51), (51, 200)):
+        stats.ajouter(X[debut:fin])
+    stats.ajouter(np.full((2, 4), np.nan))  # lignes incomplètes ignorées
+    assert stats.n == 200
+    np.testing.assert_allclose(stats.moyenne, X.mean(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(stats.covariance, np.cov(X, rowvar=False), rtol=1e-10, atol=1e-20)
+
+
+@pytest.mark.parametrize("variations", [True, False])
+def test_acp_par_lots_comme_acp_complete(variations):
+    dates, X = _historique()
+    acp = ACPCourbes(TENORS, variations=variations)
+    for debut, fin in ((0, 1), (1, 30), (30, 31), (31, 120)):
+        acp.ajouter_grille(dates[debut:fin], X[debut:fin])
+
+    observations = np.diff(X, axis=0) if variations else X
+    np.testing.assert_allclose(acp.stats.covariance, np.cov(observations, rowvar=False), rtol=1e-9, atol=1e-22)
+    assert acp.derniere_date == dates[-1]
+
+    charges = acp.charges
+    assert list(charges.columns) == ["niveau", "pente", "courbure"]
+    np.testing.assert_allclose(charges.T @ charges, np.eye(3), atol=1e-12)
+    assert (charges["niveau"] > 0).all()
+    assert charges["pente"].iloc[-1] > charges["pente"].iloc[0]
+    assert acp.variance_expliquee.is_monotonic_decreasing and acp.variance_expliquee.sum() <= 1 + 1e-12
+
+    dernier = acp.scores()
+    assert list(dernier.index) == [dates[-1]]
+    np.testing.assert_allclose(dernier.to_numpy()[0],
+                               (observations[-1] - observations.mean(axis=0)) @ charges.to_numpy(), rtol=1e-9)
+
+
+def test_sauvegarder_charger(tmp_path):
+    dates, X = _historique()
+    acp = ACPCourbes(TENORS)
+    acp.ajouter_grille(dates[:80], X[:80])
+    chemin = str(tmp_path / "acp.json")
+    acp.sauvegarder(chemin)
+    relu = ACPCourbes.charger(chemin)
+
+    assert relu.stats.n == acp.stats.n and relu.derniere_date == acp.derniere_date
+    pd.testing.assert_frame_equal(relu.charges, acp.charges)
+    pd.testing.assert_frame_equal(relu.scores(), acp.scores())
+
+    # La suite de l'historique donne le même état, relu ou non
+    for a in (acp, relu):
+        a.ajouter_grille(dates[80:], X[80:])
+    np.testing.assert_allclose(relu.stats.m2, acp.stats.m2, rtol=1e-12)
+    np.testing.assert_allclose(relu.derniere_observation, acp.derniere_observation)
+
+    vide = ACPCourbes(TENORS)
+    vide.sauvegarder(chemin)
+    assert ACPCourbes.charger(chemin).derniere_date is None
+
+
+def test_erreurs():
+    dates, X = _historique(10)
+    acp = ACPCourbes(TENORS)
+    with pytest.raises(ValueError, match="Aucune observation"):
+        acp.scores()
+    acp.ajouter_grille(dates[:1], X[:1])  # une date : aucune variation encore
+    with pytest.raises(ValueError, match="Aucune observation"):
+        acp.scores()
+    with pytest.raises(ValueError):
+        acp.charges
+    with pytest.raises(ValueError):
+        acp.ajouter_grille(dates[:1], X[:1])  # date déjà ajoutée
+    with pytest.raises(ValueError):
+        acp.ajouter_grille(dates[3:1:-1], X[1:3])  # dates décroissantes
+    with pytest.raises(ValueError):
+        acp.ajouter_grille(dates[1:3], X[1:3, :3])
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import src.plotting as plotting
+from src.curve_store import CurveStore
+from src.plotting import create_history_chart, lttb
+
+
+def _serie(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.arange(n, dtype=float)
+    y = np.cumsum(rng.normal(size=n))
+    return x, y
+
+
+@pytest.mark.parametrize("n_points", [3, 10, 250, 1000])
+def test_lttb_garde_les_extremites_et_le_nombre_de_points(n_points):
+    x, y = _serie()
+    indices = lttb(x, y, n_points)
+    assert indices.size == n_points
+    assert indices[0] == 0 and indices[-1] == x.size - 1
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_conserve_les_pics():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[[137, 512, 880]] = [5.0, -7.0, 3.0]
+    indices = lttb(x, y, 50)
+    assert {137, 512, 880} <= set(indices.tolist())
+
+
+def test_lttb_serie_courte_inchangee():
+    x, y = _serie(20)
+    np.testing.assert_array_equal(lttb(x, y, 20), np.arange(20))
+    np.testing.assert_array_equal(lttb(x, y, 100), np.arange(20))
+    np.testing.assert_array_equal(lttb(x, y, 2), np.arange(20))
+
+
+def test_historique_sous_echantillonne_et_mis_en_cache(monkeypatch):
+    tailles = []
+    lttb_origine = plotting.lttb
+    monkeypatch.setattr(plotting, "lttb", lambda x, y, n: tailles.append(n) or lttb_origine(x, y, n))
+    x, y = _serie(3000)
+    historique = pd.DataFrame({"ZC 2 ans": y / 100, "ZC 10 ans": y[::-1] / 100},
+                              index=pd.bdate_range("2010-01-01", periods=3000))
+    historique.iloc[10:20, 0] = np.nan
+
+    html = create_history_chart(historique, max_points=300)
+    assert "plotly" in html.lower() and "ZC 10 ans" in html
+    assert tailles == [300, 300]
+    assert create_history_chart(historique, max_points=300) is html  # servie depuis le cache
+    assert tailles == [300, 300]
+
+
+def test_route_historique(tmp_path, monkeypatch):
+    import app_YC_flask.app as application
+
+    client = application.app.test_client()
+    monkeypatch.delenv("CURVE_STORE_DIR", raising=False)
+    assert client.get("/historique").status_code == 404
+
+    store = CurveStore(str(tmp_path / "store"))
+    T = np.array([0.5, 1, 2, 5, 10, 20])
+    for k in range(30):
+        store.ajouter(date(2025, 1, 1) + timedelta(days=k),
+                      pd.DataFrame({"maturite_annees": T, "Taux_decimal": 0.02 + 0.001 * T,
+                                    "Taux_actuariel": 0.02 + 0.001 * T, "Taux_zero_coupon": 0.02 + 0.001 * T + k * 1e-5}))
+    monkeypatch.setenv("CURVE_STORE_DIR", store.dossier)
+    r = client.get("/historique?tenors=2,10&debut=2025-01-05")
+    assert r.status_code == 200 and r.mimetype == "text/html"
+    assert "Taux_zero_coupon 10 ans" in r.get_data(as_text=True)
+    assert client.get("/historique?tenors=deux").status_code == 400
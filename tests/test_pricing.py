@@ -0,0 +1,73 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.interpolation import CurveInterpolator
+from src.pricing import echeanciers, flux_portefeuille, price_portfolio
+
+Z = 0.03
+PLATE = CurveInterpolator([0.1, 40.0], [Z, Z])
+
+
+def _portefeuille(echeances, coupons, frequences=None):
+    df = pd.DataFrame({"Nominal": 100.0, "Taux_coupon": coupons, "Echeance": pd.to_datetime(echeances)})
+    if frequences is not None:
+        df["Frequence"] = frequences
+    return df
+
+
+def test_obligation_au_pair_sur_courbe_plate():
+    # Périodes annuelles de 365 jours (sans 29 février) : actualisation actuarielle exacte
+    obligations = _portefeuille(["2031-03-01"], [Z])
+    prix = price_portfolio(obligations, PLATE, date(2029, 3, 1))
+    np.testing.assert_allclose(prix["Prix_dirty"], 100.0, rtol=1e-12)
+    np.testing.assert_allclose(prix["Prix_clean (%)"], 100.0, rtol=1e-12)
+    assert (prix["Coupon_couru"] == 0).all()
+    # Avec une année de 366 jours (29/02/2032), l'écart au pair reste de l'ordre du point de base
+    long = price_portfolio(_portefeuille(["2034-03-01"], [Z]), PLATE, date(2029, 3, 1))
+    assert long["Prix_dirty"].iloc[0] == pytest.approx(100.0, abs=0.01)
+
+    # En cours de période, le prix plein capitalise au taux de la courbe depuis le dernier coupon
+    valo = date(2029, 7, 10)
+    ecoule = (valo - date(2029, 3, 1)).days
+    prix = price_portfolio(obligations, PLATE, valo)
+    np.testing.assert_allclose(prix["Prix_dirty"], 100.0 * (1 + Z) ** (ecoule / 365), rtol=1e-12)
+    np.testing.assert_allclose(prix["Coupon_couru"], 100.0 * Z * ecoule / 365, rtol=1e-12)
+
+
+def test_coupon_superieur_au_taux_au_dessus_du_pair():
+    prix = price_portfolio(_portefeuille(["2031-03-01"] * 3, [0.02, Z, 0.04]), PLATE, date(2029, 3, 1))
+    assert prix["Prix_clean"].is_monotonic_increasing
+    assert prix["Prix_clean"].iloc[0] < 100 < prix["Prix_clean"].iloc[2]
+
+
+def test_dates_de_fin_de_mois_ramenees_au_dernier_jour():
+    dates, masque, precedent = echeanciers(pd.to_datetime(["2026-08-31", "2028-08-29"]), [12, 2],
+                                           date(2025, 12, 15))
+    fin_de_mois = dates[0][masque[0]].astype(str).tolist()
+    assert fin_de_mois == ["2026-08-31", "2026-07-31", "2026-06-30", "2026-05-31", "2026-04-30",
+                           "2026-03-31", "2026-02-28", "2026-01-31", "2025-12-31"]
+    assert str(precedent[0]) == "2025-11-30"
+    assert dates[1][masque[1]].astype(str).tolist() == ["2028-08-29", "2028-02-29", "2027-08-29",
+                                                        "2027-02-28", "2026-08-29", "2026-02-28"]
+    assert str(precedent[1]) == "2025-08-29"
+
+
+@pytest.mark.parametrize("frequence", [1, 2, 4, 12])
+def test_coupon_couru_nul_a_une_date_de_coupon(frequence):
+    obligations = _portefeuille(["2030-06-30"], [0.04], [frequence])
+    valo = date(2027, 6, 30)  # date de coupon pour toutes les fréquences
+    flux, jours, couru = flux_portefeuille(obligations, valo)
+    assert couru[0] == 0
+    assert (jours[flux > 0] > 0).all()  # le coupon du jour est détaché, pas compté
+    assert flux.sum() == pytest.approx(100 + 3 * 4.0)
+    assert (flux > 0).sum() == 3 * frequence
+
+
+def test_entrees_invalides():
+    with pytest.raises(ValueError):
+        echeanciers(["2030-01-01"], [5], date(2025, 1, 1))
+    with pytest.raises(ValueError):
+        echeanciers(["2024-01-01"], [1], date(2025, 1, 1))
@@ -0,0 +1,107 @@
+import io
+from datetime import date
+
+import jinja2
+import numpy as np
+import pytest
+
+import src.io_bam as io_bam
+from benchmarks.synthetic import generer_csv_bam
+from src.io_bam import read_bam_csv
+from src.session_cache import SessionCurveCache
+
+JOUR = date(2025, 10, 17)
+CSV = generer_csv_bam(20, JOUR)
+
+
+@pytest.fixture
+def application(monkeypatch):
+    import app as application
+
+    monkeypatch.setattr(application, "COURBES", SessionCurveCache())
+    monkeypatch.setattr(io_bam, "import_bam_curve", lambda date_pub: read_bam_csv(CSV))
+    monkeypatch.setattr(application.app, "jinja_loader", jinja2.DictLoader(
+        {"index.html": "{{ message }}|{{ df_forwards|length if df_forwards is not none else '-' }}"}))
+    return application
+
+
+def test_courbe_bam_deposee_avec_ses_objets_lies(application):
+    client = application.app.test_client()
+    r = client.post("/api/taux", json={"date_courbe": JOUR.isoformat(), "maturites": [1, 5],
+                                       "forwards": [[1, 2]], "dates": ["2030-01-15"]})
+    assert r.status_code == 200
+    corps = r.get_json()
+    assert len(corps["maturites"]["zc"]) == 2 and len(corps["forwards"]["taux"]) == 1
+
+    entree = application.COURBES.lire(f"bam:{JOUR.isoformat()}")
+    assert entree["date_base"].isoformat() == corps["date_base"]
+    assert len(entree["df_forwards"]) > 0
+
+
+def test_import_apres_requete_api_sur_la_meme_courbe(application):
+    # La courbe BAM est d'abord calculée par l'API, puis un utilisateur importe le même CSV :
+    # il retrouve l'entrée partagée, qui doit porter les forwards et la date de base.
+    api = application.app.test_client()
+    assert api.post("/api/taux", json={"date_courbe": JOUR.isoformat(), "maturites": [1]}).status_code == 200
+
+    client = application.app.test_client()
+    r = client.post("/", data={"upload": (io.BytesIO(CSV), "courbe.csv")}, content_type="multipart/form-data")
+    assert r.status_code == 200 and r.get_data(as_text=True).startswith("✅")
+    assert application.COURBES.stats()["entrees"] == 1
+
+    assert client.get("/").status_code == 200
+    assert client.get("/download_fw").status_code == 200
+    assert client.get("/download").status_code == 200
+
+
+def test_reponse_en_cache_et_etag(application):
+    client = application.app.test_client()
+    requete = {"date_courbe": JOUR.isoformat(), "maturites": [0.5, 1, 2]}
+    premiere = client.post("/api/taux", json=requete)
+    seconde = client.post("/api/taux", json=requete)
+    assert seconde.get_data() == premiere.get_data()
+
+    etag = premiere.headers["ETag"]
+    assert client.post("/api/taux", json=requete, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_erreurs(application):
+    client = application.app.test_client()
+    assert client.post("/api/taux", data="pas du json").status_code == 400
+    assert client.post("/api/taux", json={"maturites": [1]}).status_code == 404
+    r = client.post("/api/taux", json={"date_courbe": JOUR.isoformat(), "dates": ["1990-01-01"]})
+    assert r.status_code == 400
+
+
+def test_telechargement_des_forwards_en_json(application):
+    client = application.app.test_client()
+    client.post("/", data={"upload": (io.BytesIO(CSV), "courbe.csv")}, content_type="multipart/form-data")
+    r = client.get("/download_fw?format=json")
+    assert r.status_code == 200 and r.mimetype == "application/json"
+    assert r.headers["Content-Disposition"] == 'attachment; filename="taux_forwards.json"'
+    lignes = r.get_json()
+    assert len(lignes) == len(application.calculer_courbe(read_bam_csv(CSV))[1]["df_forwards"])
+    assert set(lignes[0]) == {"De (années)", "À (années)", "Taux Forward (%)"}
+    assert client.get("/download_fw?format=xml").status_code == 400
+
+
+def test_forwards_coherents_avec_les_facteurs_d_actualisation(application):
+    client = application.app.test_client()
+    maturites = [0.5, 1, 2, 5, 10]
+    couples = [[0.5, 1], [1, 2], [2, 5], [5, 10], [0.5, 10]]
+    corps = client.post("/api/taux", json={"date_courbe": JOUR.isoformat(), "maturites": maturites,
+                                          "forwards": couples}).get_json()
+    zc = np.array(corps["maturites"]["zc"])
+    discount = dict(zip(maturites, corps["maturites"]["discount"]))
+    np.testing.assert_allclose(list(discount.values()), (1 + zc) ** -np.array(maturites), rtol=1e-12)
+    for (debut, fin), taux in zip(couples, corps["forwards"]["taux"]):
+        assert (1 + taux) ** (fin - debut) == pytest.approx(discount[debut] / discount[fin], rel=1e-12)
+
+
+def test_interpolation_d_une_date_par_la_table_journaliere(application):
+    client = application.app.test_client()
+    client.post("/", data={"upload": (io.BytesIO(CSV), "courbe.csv")}, content_type="multipart/form-data")
+    r = client.get("/?date_interp=15/01/2030")
+    assert r.status_code == 200 and "Interpolation" not in r.get_data(as_text=True)
+    (entree,) = application.COURBES._entrees.values()
+    assert len(entree.derive("table_journaliere", lambda: None)) > 365
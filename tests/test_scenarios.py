@@ -0,0 +1,48 @@
+import io
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import process_dataframe
+from src.bootstrap import bootstrap_zc_array
+from src.io_bam import read_bam_csv
+from src.scenarios import appliquer_scenarios, choc_parallele, choc_twist
+
+
+@pytest.fixture(scope="module")
+def courbe():
+    df, _, _ = process_dataframe(read_bam_csv(io.BytesIO(generer_csv_bam(40))))
+    return df
+
+
+def test_vecteur_seul(courbe):
+    choc = np.full(len(courbe), 0.001)
+    zc, forwards = appliquer_scenarios(courbe, choc)
+
+    assert zc.shape == (1, len(courbe)) and list(zc.index) == [0]
+    attendu = bootstrap_zc_array(courbe["maturite_annees"], courbe["Taux_decimal"] + 0.001)
+    np.testing.assert_allclose(zc.iloc[0].to_numpy(), attendu, atol=1e-12)
+    assert forwards.shape[0] == 1
+
+
+def test_ligne_d_une_matrice_de_chocs(courbe):
+    chocs = choc_parallele(courbe["maturite_annees"], [-50, 25])
+    zc_ligne, _ = appliquer_scenarios(courbe, chocs.iloc[1])
+    zc_matrice, _ = appliquer_scenarios(courbe, chocs)
+
+    assert list(zc_ligne.index) == [chocs.index[1]]
+    np.testing.assert_allclose(zc_ligne.to_numpy(), zc_matrice.iloc[[1]].to_numpy())
+
+
+def test_matrice_et_lots(courbe):
+    chocs = choc_twist(courbe["maturite_annees"], np.linspace(-100, 100, 7))
+    zc, forwards = appliquer_scenarios(courbe, chocs, scenarios_par_lot=3)
+
+    assert zc.index.equals(chocs.index)
+    T = courbe["maturite_annees"].to_numpy()
+    for i in range(len(chocs)):
+        attendu = bootstrap_zc_array(T, courbe["Taux_decimal"].to_numpy() + chocs.iloc[i].to_numpy())
+        np.testing.assert_allclose(zc.iloc[i].to_numpy(), attendu, atol=1e-12)
+    with pytest.raises(ValueError, match="une colonne par pilier"):
+        appliquer_scenarios(courbe, np.zeros(3))
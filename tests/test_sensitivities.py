@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generer_csv_bam
+from services.taux_processor import courbe_zc, process_dataframe
+from src.io_bam import read_bam_csv
+from src.pricing import price_portfolio
+from src.sensitivities import KEY_RATES, matrice_chocs, poids_key_rates, sensibilites
+
+
+@pytest.fixture(scope="module")
+def courbe():
+    return process_dataframe(read_bam_csv(generer_csv_bam(60)))
+
+
+@pytest.fixture(scope="module")
+def obligations(courbe):
+    _, _, base = courbe
+    echeances = pd.to_datetime(base) + pd.to_timedelta([200, 800, 1900, 3700, 7300, 10200], unit="D")
+    return pd.DataFrame({"Nominal": [100.0, 1e6, 100.0, 100.0, 1e3, 100.0],
+                         "Taux_coupon": [0.02, 0.025, 0.03, 0.035, 0.04, 0.0],
+                         "Echeance": echeances, "Frequence": [1, 1, 2, 1, 4, 1]})
+
+
+def test_poids_key_rates_somment_a_un():
+    maturites = np.r_[0.01, np.linspace(0.1, 40, 500), KEY_RATES]
+    poids = poids_key_rates(maturites)
+    assert poids.shape == (len(KEY_RATES), maturites.size)
+    assert (poids >= 0).all()
+    np.testing.assert_allclose(poids.sum(axis=0), 1.0, rtol=1e-12)
+    # Triangle : 1 sur sa maturité clé, 0 sur les autres
+    np.testing.assert_allclose(poids_key_rates(KEY_RATES), np.eye(len(KEY_RATES)))
+
+    chocs = matrice_chocs(maturites, bp=2)
+    np.testing.assert_allclose(chocs[3::2].sum(axis=0), chocs[1], rtol=1e-12)
+    np.testing.assert_allclose(chocs[4::2], -chocs[3::2])
+
+
+def test_dv01_key_rate_somment_au_dv01_parallele(courbe, obligations):
+    df, _, base = courbe
+    sens, krd = sensibilites(obligations, df, base)
+    assert list(krd.columns) == list(KEY_RATES)
+    assert (sens["DV01"] > 0).all()
+    np.testing.assert_allclose(krd.sum(axis=1), sens["DV01"], rtol=1e-4)
+
+
+def test_prix_et_convexite(courbe, obligations):
+    df, _, base = courbe
+    sens, _ = sensibilites(obligations, df, base, scenarios_par_lot=5)
+    prix = price_portfolio(obligations, courbe_zc(df), base)
+    np.testing.assert_allclose(sens["Prix_dirty"], prix["Prix_dirty"], rtol=1e-12)
+
+    # Obligations classiques : convexité positive, croissante avec la maturité (même nominal)
+    assert (sens["Convexite"] > 0).all()
+    nominal_100 = sens[obligations["Nominal"] == 100.0]
+    assert nominal_100["Convexite"].is_monotonic_increasing
+    assert nominal_100["Duration_modifiee"].is_monotonic_increasing
+
+    # Approximation de Taylor : DV01 et convexité reproduisent le prix pour un choc de 25 pb
+    choque, _ = sensibilites(obligations, df.assign(Taux_decimal=df["Taux_decimal"] + 0.0025), base)
+    dy = 0.0025
+    estime = sens["Prix_dirty"] * (1 - sens["Duration_modifiee"] * dy + 0.5 * sens["Convexite"] * dy ** 2)
+    np.testing.assert_allclose(choque["Prix_dirty"], estime, rtol=1e-4)
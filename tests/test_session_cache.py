@@ -0,0 +1,61 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.session_cache import SessionCurveCache, empreinte
+
+
+def _courbe(decalage=0.0):
+    T = np.array([0.5, 1, 2, 5, 10.0])
+    return pd.DataFrame({"maturite_annees": T, "Taux_zero_coupon": 0.02 + 0.001 * T + decalage})
+
+
+def test_meme_courbe_partagee_et_completee():
+    cache = SessionCurveCache()
+    df_fw = pd.DataFrame({"De (années)": [0.5], "À (années)": [1.0], "Taux Forward (%)": [2.1]})
+
+    premiere = cache.deposer("bam:2025-10-17", _courbe())
+    seconde = cache.deposer("session", _courbe(), df_forwards=df_fw, date_base="2025-10-17")
+
+    assert seconde is premiere and premiere.version == empreinte(_courbe())
+    assert seconde["df_forwards"] is df_fw and seconde["date_base"] == "2025-10-17"
+    # Les objets déjà présents ne sont pas remplacés, la taille tient compte des ajouts
+    cache.deposer("autre", _courbe(), date_base="autre chose")
+    assert cache.lire("autre")["date_base"] == "2025-10-17"
+    assert cache.stats()["octets"] == premiere.taille > _courbe().memory_usage(deep=True).sum()
+
+
+def test_eviction_sous_le_budget():
+    taille = SessionCurveCache().deposer("s", _courbe()).taille
+    cache = SessionCurveCache(max_octets=2 * taille)
+    for k in range(4):
+        cache.deposer(f"s{k}", _courbe(k / 100))
+    assert cache.stats()["entrees"] == 2
+    assert cache.lire("s0") is None and cache.lire("s3") is not None
+    cache.oublier("s3")
+    assert cache.lire("s3") is None
+
+
+def test_objets_derives_construits_une_seule_fois():
+    entree = SessionCurveCache().deposer("s", _courbe())
+    constructions = []
+
+    def fabrique():
+        constructions.append(1)
+        time.sleep(0.01)
+        return object()
+
+    resultats = []
+    threads = [threading.Thread(target=lambda: resultats.append((entree.derive("x", fabrique),
+                                                                   entree.interpolateur)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(constructions) == 1
+    assert len({id(d) for d, _ in resultats}) == 1 and len({id(i) for _, i in resultats}) == 1
+    # Fabrique qui s'appuie sur un autre objet dérivé de la même entrée
+    assert entree.derive("y", lambda: entree.interpolateur(1.0)) == entree.interpolateur(1.0)
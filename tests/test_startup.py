@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _modules_charges(code: str) -> set:
+    sortie = subprocess.run([sys.executable, "-c", f"{code}\nimport sys; print(' '.join(sys.modules))"],
+                            cwd=RACINE, capture_output=True, text=True, check=True).stdout
+    return set(sortie.split())
+
+
+def test_import_sans_modules_lourds():
+    for code in ("import src.plotting", "import services.rate_query", "import src.io_bam"):
+        charges = _modules_charges(code)
+        assert not {"plotly", "scipy", "requests"} & charges, code
+
+
+def test_plotly_charge_a_la_premiere_figure():
+    charges = _modules_charges(
+        "import pandas as pd\n"
+        "from src.plotting import create_yield_curve_chart\n"
+        "html = create_yield_curve_chart(pd.DataFrame({'maturite_annees': [1.0, 2.0], 'Taux_zero_coupon': [.02, .03]}))\n"
+        "assert 'plotly' in html.lower()"
+    )
+    assert "plotly" in charges
+
+
+def test_prechargement_une_fois_par_date_puis_libere(monkeypatch):
+    import app_YC_flask.app as application
+
+    appels, fin = [], threading.Event()
+
+    def faux_import(date_obj):
+        appels.append(date_obj)
+        fin.wait(5)
+        if date_obj.day == 2:
+            raise ValueError("BAM indisponible")
+        return pd.DataFrame()
+
+    monkeypatch.setattr(application, "import_bam_curve", faux_import)
+    jours = [date(2025, 10, 1), date(2025, 10, 2)]
+    for d in jours * 3:
+        application.precharger_bam(d)
+    assert application._prechargement == set(jours)
+    fin.set()
+
+    limite = time.monotonic() + 5
+    while application._prechargement and time.monotonic() < limite:
+        time.sleep(0.01)
+    # Succès comme échec libèrent la date : le dictionnaire ne grandit pas d'un jour à l'autre
+    assert application._prechargement == set()
+    assert sorted(appels) == jours